@@ -1,101 +1,76 @@
+from services.startup import startup_timer
 import os
-import re
-from flask import Flask, render_template
-from flask_caching import Cache
-from config import Config
-from models.comment import db as comment_db
+from flask import Flask, render_template, request
+
+with startup_timer.phase("config"):
+    from config import Config
+
+with startup_timer.phase("import_database"):
+    from models.comment import db as comment_db, enable_sqlite_pragmas, ensure_schema
+
+from services.formatter import format_article
+from services.assets import asset_url, serve_asset
 
 # 创建 Flask 应用
 app = Flask(__name__)
 app.config.from_object(Config)
 
 # 初始化缓存
-cache = Cache()
-cache.init_app(app)
-# 将缓存设置为 app 属性，便于通过 current_app.cache 访问
-app.cache = cache
+with startup_timer.phase("cache"):
+    from flask_caching import Cache
+    cache = Cache()
+    cache.init_app(app)
+    # 将缓存设置为 app 属性，便于通过 current_app.cache 访问
+    app.cache = cache
 
 # 初始化评论数据库
-comment_db.init_app(app)
-# 将数据库设置为 app 属性
-app.db = comment_db
-
-
-# 自定义过滤器：格式化文章内容
-def format_article_text(text):
-    """格式化文章内容，添加适当的换行和分段"""
-    if not text:
-        return ""
-
-    # 移除 markdown 语法
-    text = re.sub(r'!\[.*?\]\(.*?\)', '', text)  # 移除图片
-    text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)  # 转换 markdown 链接为纯文本
-
-    # 清理多余的空白字符
-    text = re.sub(r'\n{3,}', '\n\n', text)  # 多个换行压缩为两个
-    text = re.sub(r'[ \t]+', ' ', text)  # 多个空格压缩为一个
-
-    # 在特定标点后添加换行
-    text = re.sub(r'([。！？])([^\n])', r'\1\n\2', text)  # 句号后换行
-    text = re.sub(r'([：;；])\s*', r'\1 ', text)  # 冒号后保留一个空格
-
-    # 分段处理 - 按照关键词分段
-    section_keywords = ['案情回顾', '案件特点', '诈骗手法', '反诈提醒', '警方提示', '防范建议', '温馨提示', '相关链接']
-    for keyword in section_keywords:
-        text = re.sub(r'([^\n])(' + keyword + ')', r'\1\n\n**\2**', text)
-
-    # 处理粗体标记
-    text = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', text)
-
-    # 将换行转换为段落
-    paragraphs = text.split('\n\n')
-    formatted = []
-    for para in paragraphs:
-        para = para.strip()
-        if para:
-            # 如果段落太长，尝试在适当位置分割
-            if len(para) > 300 and '**' not in para:
-                sentences = re.split(r'([。！？])', para)
-                current = ''
-                for i in range(0, len(sentences) - 1, 2):
-                    if sentences[i]:
-                        sentence = sentences[i] + (sentences[i + 1] if i + 1 < len(sentences) else '')
-                        if current:
-                            formatted.append(f'<p>{current}</p>')
-                            current = sentence
-                        else:
-                            current = sentence
-                        if len(current) > 200:
-                            formatted.append(f'<p>{current}</p>')
-                            current = ''
-                if current:
-                    formatted.append(f'<p>{current}</p>')
-            else:
-                formatted.append(f'<p>{para}</p>')
-
-    return '\n'.join(formatted)
+with startup_timer.phase("database"):
+    comment_db.init_app(app)
+    # 将数据库设置为 app 属性
+    app.db = comment_db
+    with app.app_context():
+        enable_sqlite_pragmas(
+            comment_db.engine,
+            wal=Config.SQLITE_WAL,
+            busy_timeout=Config.SQLITE_BUSY_TIMEOUT,
+            synchronous=Config.SQLITE_SYNCHRONOUS,
+        )
 
 
 # 注册过滤器
-app.jinja_env.filters['format_article'] = format_article_text
+app.jinja_env.filters['format_article'] = format_article
+app.jinja_env.globals['asset_url'] = asset_url
+
+# 带内容哈希的静态资源：预压缩版本 + 永久缓存
+app.add_url_rule("/static/dist/<path:filename>", "asset", serve_asset)
 
-# 创建数据库表（只在本地环境）
+# 创建数据库表：每个进程只执行一次
 if not os.getenv("VERCEL"):
-    # 本地环境：确保 database 目录存在并创建表
+    # 本地环境：确保 database 目录存在
     database_dir = os.path.join(os.path.dirname(__file__), "database")
     os.makedirs(database_dir, exist_ok=True)
-    with app.app_context():
-        comment_db.create_all()
-else:
-    # Vercel 环境：在请求处理时按需创建表
+
+if Config.DB_SCHEMA_BOOTSTRAP == "startup":
+    with startup_timer.phase("schema"), app.app_context():
+        ensure_schema()
+elif Config.DB_SCHEMA_BOOTSTRAP == "lazy":
+    # 首个需要数据库的请求时建表（静态文件、健康检查和飞书事件回调不触发）
     @app.before_request
     def create_tables():
-        comment_db.create_all()
+        if request.endpoint not in (
+            "static", "serve_static", "asset", "api_health", "api.health_check", "api.feishu_events"
+        ):
+            ensure_schema()
 
 # 注册蓝图
-from routes import views_bp, api_bp
-app.register_blueprint(views_bp)
-app.register_blueprint(api_bp)
+with startup_timer.phase("blueprints"):
+    from routes import views_bp, api_bp
+    app.register_blueprint(views_bp)
+    app.register_blueprint(api_bp)
+
+# 首个请求时加载磁盘快照（在 fork 之后，见 warm_start），之后的请求不再等待
+from services.cache import warm_start
+app.before_request(warm_start)
 
 
 # Vercel 环境：显式处理静态文件
@@ -111,11 +86,17 @@ if os.getenv("VERCEL"):
             return jsonify({"error": f"Static file not found: {str(e)}"}), 404
 
 # 验证配置
-try:
-    Config.validate_config()
-except ValueError as e:
-    print(f"Configuration Error: {e}")
-    print("Please check your .env file.")
+with startup_timer.phase("validate_config"):
+    try:
+        Config.validate_config()
+    except ValueError as e:
+        print(f"Configuration Error: {e}")
+        print("Please check your .env file.")
+
+# 冷启动耗时报告
+startup_timer.finish()
+if Config.STARTUP_REPORT:
+    print(startup_timer.format())
 
 
 @app.errorhandler(404)
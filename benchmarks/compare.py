@@ -0,0 +1,56 @@
+import argparse
+import json
+import sys
+
+
+def compare(base: dict, current: dict, threshold: float = 0.15) -> list[dict]:
+    """逐项比较两次结果的中位数
+
+    change 为变慢（或吞吐下降）的比例，正数表示退化；超过 threshold 的项标记为 regression。
+    """
+    rows = []
+    for name, result in current["results"].items():
+        previous = base["results"].get(name)
+        if not previous or not previous["median"] or not result["median"]:
+            continue
+        ratio = result["median"] / previous["median"]
+        change = ratio - 1 if result["better"] == "lower" else 1 / ratio - 1
+        rows.append({
+            "name": name,
+            "unit": result["unit"],
+            "base": previous["median"],
+            "current": result["median"],
+            "change": change,
+            "regression": change > threshold,
+        })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="比较两次基准测试结果，有退化时返回非零退出码")
+    parser.add_argument("base", help="基准结果 JSON（如上一个提交）")
+    parser.add_argument("current", help="当前结果 JSON")
+    parser.add_argument("--threshold", type=float, default=0.15, help="判定为退化的变化比例")
+    args = parser.parse_args(argv)
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    if base["meta"]["params"] != current["meta"]["params"]:
+        print("警告：两次运行的参数不同，结果不可直接比较", file=sys.stderr)
+
+    rows = compare(base, current, args.threshold)
+    print(f"{'benchmark':36s} {'base':>14s} {'current':>14s} {'change':>8s}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['name']:36s} {row['base']:>14.3f} {row['current']:>14.3f} "
+            f"{row['change']:>+7.1%}{flag}"
+        )
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
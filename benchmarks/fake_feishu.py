@@ -0,0 +1,257 @@
+import json
+import random
+import threading
+import time
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+DEFAULT_FIELD_MAPPING = {
+    "title": "标题",
+    "date": "日期",
+    "summary": "摘要",
+    "source": "账号",
+    "address": "地址",
+}
+
+# 生成文本用的素材：包含分析器词典中的诈骗类型、反诈技术和地点写法
+_SCAM_TYPES = ["刷单", "杀猪盘", "虚假投资", "冒充公检法", "贷款诈骗", "客服诈骗", "网络博彩", "兼职诈骗"]
+_TECHS = ["预警", "劝阻", "拦截", "止付", "冻结", "研判", "溯源"]
+_PLACES = ["朝阳区", "海淀区", "浦东新区", "天河区", "南山区", "武侯区", "江北区"]
+_SOURCES = ["平安北京", "平安上海", "平安广州", "平安深圳", "平安成都", "Ping An Chongqing"]
+_SENTENCES = [
+    "近日{place}发生一起{scam}案件，受害人被骗金额较大。",
+    "民警及时{tech}，成功挽回部分损失。",
+    "骗子以高额返利为诱饵，诱导受害人下载虚假APP。",
+    "特点：先小额返利取得信任，再诱导大额充值。",
+    "警方提醒，陌生来电要求转账的都是诈骗。",
+    "案发后，警方通过资金流向{tech}，锁定犯罪嫌疑人。",
+]
+
+
+class FakeBitable:
+    """本地模拟的飞书多维表格接口，用于基准测试
+
+    提供 tenant_access_token、records（分页 + field_names）、records/search（按最后更新时间筛选）
+    和单条记录接口。日期与真实的日期字段一样返回毫秒时间戳。记录按种子确定性生成，摘要长度约为 text_size 个字，每页最多 max_page_size 条；
+    每个记录接口请求先等待 latency 秒，并按 error_rate 的概率返回 500（带 Retry-After）。
+    """
+
+    def __init__(
+        self,
+        records: int = 1000,
+        text_size: int = 300,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        retry_after: float = 0,
+        max_page_size: int = 500,
+        seed: int = 0,
+        base_id: str = "bench_base",
+        table_id: str = "bench_table",
+        modified_field: str = "最后更新时间",
+        field_mapping: dict | None = None,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.max_page_size = max_page_size
+        self.base_id = base_id
+        self.table_id = table_id
+        self.modified_field = modified_field
+        self.field_mapping = field_mapping or DEFAULT_FIELD_MAPPING
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._error_random = random.Random(seed)  # 错误序列与记录数、修改次数无关
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+
+        # 初始记录都是 30 天前修改的，不会落入增量同步的筛选窗口
+        modified_at = int((time.time() - 30 * 86400) * 1000)
+        self.records: dict[str, dict] = {}
+        for index in range(records):
+            record_id = f"rec{index:07d}"
+            self.records[record_id] = self._make_record(record_id, index, text_size, modified_at)
+
+    def _text(self, size: int) -> str:
+        parts, length = [], 0
+        while length < size:
+            sentence = self._random.choice(_SENTENCES).format(
+                place=self._random.choice(_PLACES),
+                scam=self._random.choice(_SCAM_TYPES),
+                tech=self._random.choice(_TECHS),
+            )
+            parts.append(sentence)
+            length += len(sentence)
+        return "".join(parts)[:size]
+
+    def _make_record(self, record_id: str, index: int, text_size: int, modified_at: int) -> dict:
+        mapping = self.field_mapping
+        day = date(2024, 1, 1) + timedelta(days=index % 365)
+        scam = self._random.choice(_SCAM_TYPES)
+        return {
+            "record_id": record_id,
+            "fields": {
+                mapping["title"]: f"警惕{scam}：{self._random.choice(_PLACES)}一市民被骗",
+                mapping["date"]: int(datetime.combine(day, datetime.min.time()).timestamp() * 1000),
+                mapping["summary"]: self._text(text_size),
+                mapping["source"]: self._random.choice(_SOURCES),
+                mapping["address"]: {"link": f"https://mp.weixin.qq.com/s/{record_id}", "text": "原文"},
+                self.modified_field: modified_at,
+            },
+            "last_modified_time": modified_at,
+        }
+
+    def touch(self, count: int) -> list[str]:
+        """随机修改 count 条记录的标题和更新时间，模拟表格中的编辑"""
+        now = int(time.time() * 1000)
+        with self._lock:
+            record_ids = self._random.sample(sorted(self.records), min(count, len(self.records)))
+            for record_id in record_ids:
+                record = self.records[record_id]
+                record["fields"][self.field_mapping["title"]] += "（更新）"
+                record["fields"][self.modified_field] = now
+                record["last_modified_time"] = now
+        return record_ids
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests = self.errors = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeBitable":
+        """在后台线程中启动服务（随机端口）"""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(self))
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeBitable":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # 以下为接口实现，返回响应 JSON
+
+    def _fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            if self.error_rate and self._error_random.random() < self.error_rate:
+                self.errors += 1
+                return True
+        return False
+
+    @staticmethod
+    def _project(record: dict, field_names: list[str] | None) -> dict:
+        if not field_names:
+            return record
+        fields = {name: value for name, value in record["fields"].items() if name in field_names}
+        return {**record, "fields": fields}
+
+    def _page(self, records: list[dict], page_size: int, page_token: str | None, field_names) -> dict:
+        start = int(page_token or 0)
+        end = start + page_size
+        has_more = end < len(records)
+        return {
+            "code": 0,
+            "data": {
+                "items": [self._project(record, field_names) for record in records[start:end]],
+                "has_more": has_more,
+                "page_token": str(end) if has_more else None,
+                "total": len(records),
+            },
+        }
+
+    def list_records(self, params: dict) -> dict:
+        field_names = json.loads(params["field_names"]) if params.get("field_names") else None
+        with self._lock:
+            records = list(self.records.values())
+        return self._page(records, min(int(params.get("page_size", 20)), self.max_page_size), params.get("page_token"), field_names)
+
+    def search_records(self, params: dict, payload: dict) -> dict:
+        since = 0
+        for condition in (payload.get("filter") or {}).get("conditions", []):
+            if condition.get("field_name") == self.modified_field:
+                since = int(condition["value"][-1])
+        with self._lock:
+            records = [record for record in self.records.values() if record["last_modified_time"] > since]
+        records.sort(key=lambda record: record["last_modified_time"])
+        return self._page(
+            records, min(int(params.get("page_size", 20)), self.max_page_size), params.get("page_token"), payload.get("field_names")
+        )
+
+    def get_record(self, record_id: str) -> dict:
+        with self._lock:
+            record = self.records.get(record_id)
+        if record is None:
+            return {"code": 1254043, "msg": "RecordIdNotFound"}
+        return {"code": 0, "data": {"record": record}}
+
+
+def _handler(bitable: FakeBitable):
+    records_path = f"/open-apis/bitable/v1/apps/{bitable.base_id}/tables/{bitable.table_id}/records"
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive，与真实接口一样复用连接
+        disable_nagle_algorithm = True  # 响应头和响应体分开写出，避免 Nagle 与延迟确认叠加出 40ms 等待
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: dict, headers: dict | None = None):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _read_json(self) -> dict:
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length)) if length else {}
+
+        def _dispatch(self, method: str):
+            url = urlparse(self.path)
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            payload = self._read_json() if method == "POST" else {}
+
+            if url.path == "/open-apis/auth/v3/tenant_access_token/internal":
+                return self._send(200, {"code": 0, "tenant_access_token": "fake-token", "expire": 7200})
+            if not url.path.startswith(records_path):
+                return self._send(404, {"code": 404, "msg": "not found"})
+
+            if bitable.latency:
+                time.sleep(bitable.latency)
+            if bitable._fail():
+                return self._send(500, {"code": 500, "msg": "internal error"}, {"Retry-After": str(bitable.retry_after)})
+
+            rest = url.path[len(records_path):]
+            if method == "GET" and not rest:
+                return self._send(200, bitable.list_records(params))
+            if method == "POST" and rest == "/search":
+                return self._send(200, bitable.search_records(params, payload))
+            if method == "GET" and rest.startswith("/"):
+                return self._send(200, bitable.get_record(rest[1:]))
+            return self._send(404, {"code": 404, "msg": "not found"})
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+    return Handler
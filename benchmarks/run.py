@@ -0,0 +1,409 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+from benchmarks.fake_feishu import FakeBitable
+
+
+# 结果文件格式版本，字段变化时递增
+FORMAT_VERSION = 1
+
+# 按查询类型分组的搜索请求
+SEARCH_QUERIES = {
+    "single_char": ["q=骗", "q=警", "q=案"],
+    "bigram": ["q=刷单", "q=民警", "q=返利"],
+    "phrase": ["q=冒充公检法", "q=虚假投资", "q=成功挽回部分损失"],
+    "ascii": ["q=ping", "q=app", "q=an+c"],
+    "no_match": ["q=不存在的关键词", "q=zzzz"],
+    "facet": ["scam_type=刷单", "source=平安北京", "scam_type=杀猪盘&source=平安上海"],
+    "query_and_facet": ["q=民警&scam_type=刷单", "q=返利&source=平安深圳"],
+    "facet_counts": ["q=民警&facets=1", "scam_type=刷单&facets=1"],
+}
+
+
+def summarize(samples: list[float], unit: str, better: str = "lower", **extra) -> dict:
+    """汇总一组样本：中位数用于比较，同时保留最小值、p95 和均值"""
+    ordered = sorted(samples)
+    result = {
+        "unit": unit,
+        "better": better,
+        "n": len(ordered),
+        "median": statistics.median(ordered),
+        "min": ordered[0],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "mean": statistics.fmean(ordered),
+    }
+    if extra:
+        result["extra"] = extra
+    return result
+
+
+def _timed(func) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def _git(*args) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def bench_sync(server: FakeBitable, args) -> dict:
+    """同步耗时：全量同步、无变更的增量同步、少量记录变更的增量同步"""
+    from services.sync import SyncEngine
+
+    results = {}
+    engine = SyncEngine()
+    snapshot = None
+    samples = []
+    server.reset_stats()
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        result = engine.sync(None)
+        samples.append(time.perf_counter() - started)
+        snapshot = result.to_snapshot()
+    results["sync.full"] = summarize(
+        samples, "s", records=len(snapshot["articles"]),
+        requests=server.requests // args.repeat, errors=server.errors // args.repeat,
+    )
+
+    samples = []
+    server.reset_stats()
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        result = engine.sync(snapshot)
+        samples.append(time.perf_counter() - started)
+    results["sync.delta_unchanged"] = summarize(samples, "s", requests=server.requests // args.repeat)
+
+    samples = []
+    changed = max(1, min(args.changed_records, len(server.records)))
+    server.reset_stats()
+    for _ in range(args.repeat):
+        server.touch(changed)
+        started = time.perf_counter()
+        result = engine.sync(snapshot)
+        samples.append(time.perf_counter() - started)
+        snapshot = result.to_snapshot(snapshot)
+    results["sync.delta_changed"] = summarize(
+        samples, "s", changed=changed, requests=server.requests // args.repeat
+    )
+    return results
+
+
+def bench_analyze(server: FakeBitable, args) -> dict:
+    """Article._analyze_content 吞吐量（篇/秒、字/秒）"""
+    from config import Config
+    from models.article import Article, ArticleAnalysis
+
+    articles = [
+        Article.from_feishu_record(record, Config.FIELD_MAPPING) for record in server.records.values()
+    ]
+    # 分析结果已在构造时计算过一次（同时完成分析器的初始化），这里只计时重复分析
+    articles = [Article(**{**article.to_dict(), "_analysis": ArticleAnalysis()}) for article in articles]
+    chars = sum(len(article.summary) for article in articles)
+
+    samples = []
+    for _ in range(args.repeat):
+        samples.append(_timed(lambda: [article._analyze_content() for article in articles]))
+    return {
+        "analyze.articles_per_sec": summarize(
+            [len(articles) / sample for sample in samples], "articles/s", better="higher"
+        ),
+        "analyze.chars_per_sec": summarize([chars / sample for sample in samples], "chars/s", better="higher"),
+    }
+
+
+def bench_memory(server: FakeBitable, args) -> dict:
+    """每个 worker 持有的一个数据集版本的内存（MB）：文章对象加搜索索引、分面索引和统计
+
+    用 tracemalloc 从解码缓存中的文章开始计量，分别测 Article 对象和列式存储两种方式。
+    """
+    import gc
+    import tracemalloc
+    from config import Config
+    from models.article import Article
+    from services.dataset import Dataset
+    from services.snapshot import decode_articles, encode_articles
+
+    data = encode_articles([
+        Article.from_feishu_record(record, Config.FIELD_MAPPING).to_cache_dict()
+        for record in server.records.values()
+    ])
+
+    def traced() -> float:
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] / 1024 / 1024
+
+    results = {}
+    original = Config.COLUMNAR_STORE
+    try:
+        for columnar in (False, True):
+            Config.COLUMNAR_STORE = columnar
+            gc.collect()
+            tracemalloc.start()
+            try:
+                dataset = Dataset.from_snapshot({"version": "bench", "articles": decode_articles(data)})
+                parts = {"articles": traced()}
+                dataset.search_index
+                parts["search_index"] = traced() - sum(parts.values())
+                dataset.facet_index
+                parts["facet_index"] = traced() - sum(parts.values())
+                dataset.stats
+                parts["stats"] = traced() - sum(parts.values())
+            finally:
+                tracemalloc.stop()
+            del dataset
+            name = "memory.dataset_columnar" if columnar else "memory.dataset"
+            results[name] = summarize([sum(parts.values())], "MB", **parts)
+    finally:
+        Config.COLUMNAR_STORE = original
+    return results
+
+
+def _latencies(client, paths: list[str], count: int, headers: dict | None = None) -> list[float]:
+    """依次请求 count 次（轮流使用 paths），返回每次的耗时（毫秒）"""
+    samples = []
+    for index in range(count):
+        path = paths[index % len(paths)]
+        started = time.perf_counter()
+        response = client.get(path, headers=headers)
+        samples.append((time.perf_counter() - started) * 1000)
+        if response.status_code not in (200, 304):
+            raise RuntimeError(f"GET {path} returned {response.status_code}")
+    return samples
+
+
+def bench_pages(app, args) -> dict:
+    """首页渲染、详情页和搜索 API 的延迟；页面分别在禁用和启用页面缓存时测量"""
+    from config import Config
+    from services.cache import get_dataset
+    from services.page_cache import page_cache
+
+    with app.app_context():
+        dataset = get_dataset()
+    article_ids = [article.id for article in dataset.articles][:: max(1, len(dataset) // 100)]
+    detail_paths = [f"/article/{article_id}" for article_id in article_ids]
+
+    results = {}
+    client = app.test_client()
+    original = Config.PAGE_CACHE_ENABLED
+    try:
+        Config.PAGE_CACHE_ENABLED = False
+        results["index.render"] = summarize(_latencies(client, ["/"], args.requests), "ms")
+        results["detail.render"] = summarize(_latencies(client, detail_paths, args.requests), "ms")
+
+        Config.PAGE_CACHE_ENABLED = True
+        with app.app_context():
+            page_cache.clear()
+        _latencies(client, ["/"] + detail_paths, len(detail_paths) + 1)
+        results["index.cached"] = summarize(_latencies(client, ["/"], args.requests), "ms")
+        results["detail.cached"] = summarize(_latencies(client, detail_paths, args.requests), "ms")
+
+        etag = client.get("/").headers.get("ETag")
+        results["index.not_modified"] = summarize(
+            _latencies(client, ["/"], args.requests, headers={"If-None-Match": etag}), "ms"
+        )
+    finally:
+        Config.PAGE_CACHE_ENABLED = original
+
+    for name, queries in SEARCH_QUERIES.items():
+        paths = [f"/api/search?{query}" for query in queries]
+        results[f"search.{name}"] = summarize(_latencies(client, paths, args.requests), "ms")
+    return results
+
+
+def bench_events(app, server: FakeBitable, workdir: str, args) -> dict:
+    """记录变更事件的处理耗时：拉取变更的记录，更新数据集、索引和统计，写入缓存和磁盘快照"""
+    from config import Config
+    from services.cache import apply_record_changes, get_dataset
+
+    original = Config.SNAPSHOT_ENABLED, Config.SNAPSHOT_PATH
+    samples = []
+    try:
+        Config.SNAPSHOT_ENABLED = True
+        Config.SNAPSHOT_PATH = os.path.join(workdir, "articles_snapshot.db")
+        with app.app_context():
+            dataset = get_dataset()
+            dataset.search_index, dataset.facet_index, dataset.stats
+            for _ in range(args.repeat):
+                changed = server.touch(1)
+                started = time.perf_counter()
+                if not apply_record_changes(changed, []):
+                    raise RuntimeError("Record change event was not applied")
+                samples.append((time.perf_counter() - started) * 1000)
+    finally:
+        Config.SNAPSHOT_ENABLED, Config.SNAPSHOT_PATH = original
+    return {"events.record_edited": summarize(samples, "ms")}
+
+
+def _write_comments(app, article_ids: list[str], count: int, threads: int) -> tuple[float, list[float]]:
+    """threads 个线程共写入 count 条评论，返回 (总耗时秒, 每条耗时毫秒)"""
+    samples, failures = [], []
+    lock = threading.Lock()
+
+    def worker(worker_index: int):
+        client = app.test_client()
+        local = []
+        for index in range(worker_index, count, threads):
+            article_id = article_ids[index % len(article_ids)]
+            started = time.perf_counter()
+            response = client.post(
+                f"/api/articles/{article_id}/comments",
+                json={"author": f"bench{worker_index}", "content": f"基准测试评论 {index}"},
+            )
+            local.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 201:
+                with lock:
+                    failures.append(response.status_code)
+        with lock:
+            samples.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if failures:
+        raise RuntimeError(f"{len(failures)} comment writes failed (status {failures[0]})")
+    return elapsed, samples
+
+
+def bench_comments(app, args) -> dict:
+    """评论写入：单线程逐条写入的延迟，以及多线程并发写入的吞吐量"""
+    from services.cache import get_dataset
+
+    with app.app_context():
+        article_ids = [article.id for article in get_dataset().articles][:50]
+
+    results = {}
+    _, samples = _write_comments(app, article_ids, args.comment_writes, 1)
+    results["comments.write"] = summarize(samples, "ms")
+
+    throughput = []
+    for _ in range(args.repeat):
+        elapsed, _ = _write_comments(app, article_ids, args.comment_writes, args.comment_threads)
+        throughput.append(args.comment_writes / elapsed)
+    results["comments.concurrent"] = summarize(throughput, "writes/s", better="higher", threads=args.comment_threads)
+    return results
+
+
+def _configure_environment(server: FakeBitable, workdir: str, args):
+    """在导入应用之前设置环境变量：飞书接口指向模拟服务，数据库放在临时目录"""
+    os.environ.update({
+        "FEISHU_BASE_URL": server.url,
+        "FEISHU_APP_ID": "bench_app",
+        "FEISHU_APP_SECRET": "bench_secret",
+        "BASE_ID": server.base_id,
+        "TABLE_ID": server.table_id,
+        "FEISHU_PAGE_SIZE": str(args.page_size),
+        "FEISHU_MODIFIED_FIELD": server.modified_field,
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'comments.db')}",
+        "SNAPSHOT_ENABLED": "false",
+        "CACHE_TYPE": "services.shared_cache.PinnedSimpleCache",
+        "DB_SCHEMA_BOOTSTRAP": "startup",
+        "STARTUP_REPORT": "false",
+    })
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="性能基准测试（使用本地模拟的飞书多维表格接口）")
+    parser.add_argument("--records", type=int, default=2000, help="表格记录数")
+    parser.add_argument("--text-size", type=int, default=400, help="每条记录摘要的字数")
+    parser.add_argument("--latency", type=float, default=0.0, help="模拟接口每次请求的延迟（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="模拟接口返回 500 的概率")
+    parser.add_argument("--page-size", type=int, default=500, help="同步分页大小")
+    parser.add_argument("--changed-records", type=int, default=20, help="增量同步基准中每轮修改的记录数")
+    parser.add_argument("--repeat", type=int, default=5, help="同步、分析和并发写入的重复次数")
+    parser.add_argument("--requests", type=int, default=200, help="每项页面/搜索基准的请求次数")
+    parser.add_argument("--comment-writes", type=int, default=200, help="每轮写入的评论数")
+    parser.add_argument("--comment-threads", type=int, default=8, help="并发写评论的线程数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子（生成记录和错误）")
+    parser.add_argument("--only", nargs="+", choices=["sync", "events", "analyze", "memory", "pages", "comments"], help="只运行指定基准")
+    parser.add_argument("--output", help="结果 JSON 的写入路径，默认输出到标准输出")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> dict:
+    args = parse_args(argv)
+    selected = set(args.only or ["sync", "events", "analyze", "memory", "pages", "comments"])
+    workdir = tempfile.mkdtemp(prefix="fanzha_bench_")
+
+    server = FakeBitable(
+        records=args.records,
+        text_size=args.text_size,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    ).start()
+    try:
+        _configure_environment(server, workdir, args)
+        # 页面路由里的调试输出不计入结果
+        with contextlib.redirect_stdout(io.StringIO()):
+            from app import app
+
+            results = {}
+            with app.app_context():
+                if "sync" in selected:
+                    results.update(bench_sync(server, args))
+            if "events" in selected:
+                results.update(bench_events(app, server, workdir, args))
+            if "analyze" in selected:
+                results.update(bench_analyze(server, args))
+            if "memory" in selected:
+                results.update(bench_memory(server, args))
+            if "pages" in selected:
+                results.update(bench_pages(app, args))
+            if "comments" in selected:
+                results.update(bench_comments(app, args))
+    finally:
+        server.stop()
+
+    params = {
+        key: value for key, value in vars(args).items() if key not in ("only", "output")
+    }
+    report = {
+        "format_version": FORMAT_VERSION,
+        "meta": {
+            "commit": _git("rev-parse", "HEAD"),
+            "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": params,
+        },
+        "results": results,
+    }
+
+    data = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(data + "\n")
+    else:
+        print(data)
+
+    for name, result in results.items():
+        print(f"{name:40s} {result['median']:>14.3f} {result['unit']}", file=sys.stderr)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+import sys
+from services.assets import DIST_DIR, STATIC_DIR, brotli, build_assets
+
+# 用法：python build_assets.py
+# 生成 static/dist 下带内容哈希的 CSS/JS 及其 gzip、br 版本，随部署发布
+# vercel.json 对支持 br 的请求直接返回 .br 文件，缺少 br 版本会 404，因此未安装 brotli 时构建失败
+if brotli is None:
+    sys.exit("未安装 brotli，无法生成 br 版本：pip install -r requirements.txt")
+
+manifest = build_assets()
+for filename, hashed in manifest.items():
+    print(f"{filename} -> {DIST_DIR}/{hashed}")
+print(f"已生成 {len(manifest)} 个静态资源（{STATIC_DIR}/{DIST_DIR}）")
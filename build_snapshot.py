@@ -0,0 +1,17 @@
+import sys
+from app import app
+from config import Config
+from services.dataset import Dataset
+from services.snapshot import save_snapshot
+from services.sync import SyncEngine
+
+# 用法：python build_snapshot.py [输出路径]
+# 生成的文件可随部署发布，并通过 SNAPSHOT_SEED_PATH 指定，用于冷启动
+with app.app_context():
+    path = sys.argv[1] if len(sys.argv) > 1 else Config.SNAPSHOT_PATH
+    result = SyncEngine().sync(None)
+    snapshot = result.to_snapshot()
+    # 统计一并写入，冷启动时不必重新计算
+    snapshot["stats"] = Dataset.from_snapshot(snapshot).stats.encode()
+    save_snapshot(snapshot, path)
+    print(f"快照已生成：{path}（{len(result.articles)} 篇文章，版本 {result.version}）")
@@ -1,6 +1,7 @@
 from app import app
+from services.cache import clear_articles_cache
 
 with app.app_context():
-    # 清除文章缓存
-    app.cache.delete("all_articles")
+    # 清除文章缓存（使用共享缓存后端时所有 worker 都会重新加载）
+    clear_articles_cache()
     print("缓存已清除，请刷新页面")
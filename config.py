@@ -10,7 +10,23 @@ class Config:
     # 飞书应用配置
     FEISHU_APP_ID = os.getenv("FEISHU_APP_ID")
     FEISHU_APP_SECRET = os.getenv("FEISHU_APP_SECRET")
-    FEISHU_BASE_URL = "https://open.feishu.cn"
+    FEISHU_BASE_URL = os.getenv("FEISHU_BASE_URL", "https://open.feishu.cn")  # 基准测试时指向本地模拟服务
+
+    # 飞书 HTTP 连接池与重试配置
+    FEISHU_POOL_CONNECTIONS = int(os.getenv("FEISHU_POOL_CONNECTIONS", 4))  # 连接池数量（按主机）
+    FEISHU_POOL_SIZE = int(os.getenv("FEISHU_POOL_SIZE", 10))  # 每个连接池的最大连接数
+    FEISHU_TIMEOUT = float(os.getenv("FEISHU_TIMEOUT", 10))  # 单次请求超时（秒）
+    FEISHU_MAX_RETRIES = int(os.getenv("FEISHU_MAX_RETRIES", 3))
+    FEISHU_BACKOFF_BASE = float(os.getenv("FEISHU_BACKOFF_BASE", 0.5))  # 退避基数（秒）
+    FEISHU_BACKOFF_MAX = float(os.getenv("FEISHU_BACKOFF_MAX", 8))  # 单次退避上限（秒）
+    FEISHU_PAGE_SIZE = int(os.getenv("FEISHU_PAGE_SIZE", 500))  # 分页大小，多维表格接口上限为 500
+    FEISHU_TOKEN_REFRESH_MARGIN = int(os.getenv("FEISHU_TOKEN_REFRESH_MARGIN", 300))  # token 提前刷新时间（秒）
+
+    # 事件订阅：Verification Token 与 Encrypt Key（在飞书开放平台"事件订阅"中配置）
+    FEISHU_VERIFICATION_TOKEN = os.getenv("FEISHU_VERIFICATION_TOKEN", "")
+    FEISHU_ENCRYPT_KEY = os.getenv("FEISHU_ENCRYPT_KEY", "")
+    FEISHU_EVENT_MAX_AGE = int(os.getenv("FEISHU_EVENT_MAX_AGE", 300))  # 签名时间戳最大允许偏差（秒）
+    FEISHU_EVENT_LOCK_WAIT = float(os.getenv("FEISHU_EVENT_LOCK_WAIT", 2))  # 等待刷新锁的时间（秒）
 
     # 多维表格配置
     BASE_ID = os.getenv("BASE_ID")
@@ -20,20 +36,93 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
     DEBUG = os.getenv("FLASK_ENV") == "development"
 
+    # 增量同步："最后更新时间"类型的字段名（表格中需有该字段），由飞书按修改时间筛选；
+    # 留空时拉取全部记录的 ID 和记录自带的修改时间，只逐条拉取变更的记录
+    FEISHU_MODIFIED_FIELD = os.getenv("FEISHU_MODIFIED_FIELD", "")
+
     # 缓存配置
-    CACHE_TYPE = os.getenv("CACHE_TYPE", "SimpleCache")
-    CACHE_DEFAULT_TIMEOUT = int(os.getenv("CACHE_DEFAULT_TIMEOUT", 300))  # 5分钟
+    # 默认为进程内缓存（不会淘汰文章快照的 SimpleCache）；多 worker 部署时设为 services.shared_cache.SQLiteCache，
+    # 所有 worker 共用一个 SQLite 缓存文件，只需一个 worker 从飞书同步
+    CACHE_TYPE = os.getenv("CACHE_TYPE", "services.shared_cache.PinnedSimpleCache")
+    if os.getenv("VERCEL"):
+        CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", "/tmp/cache.db")
+    else:
+        CACHE_SQLITE_PATH = os.getenv(
+            "CACHE_SQLITE_PATH",
+            os.path.join(os.path.abspath(os.path.dirname(__file__)), "database", "cache.db"),
+        )
+    CACHE_DEFAULT_TIMEOUT = int(os.getenv("CACHE_DEFAULT_TIMEOUT", 300))  # 5分钟，文章快照软过期时间
+    CACHE_HARD_TIMEOUT = int(os.getenv("CACHE_HARD_TIMEOUT", 3600))  # 硬过期时间，超过后必须等待刷新
+    # 刷新模式：background 软过期后先返回旧快照并在后台刷新；blocking 等待刷新完成
+    CACHE_REFRESH_MODE = os.getenv("CACHE_REFRESH_MODE", "background")
+    CACHE_REFRESH_LOCK_TIMEOUT = int(os.getenv("CACHE_REFRESH_LOCK_TIMEOUT", 120))  # 刷新锁超时（秒）
+    # 事件推送的版本只在缓存中保存变更的记录，连续超过这么多个版本后整体写入一次
+    CACHE_CHANGES_CHAIN_MAX = int(os.getenv("CACHE_CHANGES_CHAIN_MAX", 8))
+
+    # 文章使用列式存储（省内存）
+    COLUMNAR_STORE = os.getenv("COLUMNAR_STORE", "true").lower() == "true"
+
+    # 文章格式化结果缓存条数（LRU）
+    FORMATTER_CACHE_SIZE = int(os.getenv("FORMATTER_CACHE_SIZE", 1024))
+
+    # 分页配置
+    INDEX_PAGE_SIZE = int(os.getenv("INDEX_PAGE_SIZE", 24))  # 首页每页文章数
+    API_MAX_PAGE_SIZE = 100  # /api/articles 单页上限
 
     # 数据库配置 (评论功能)
     # Vercel 环境使用临时目录，本地开发使用 database 目录
     if os.getenv("VERCEL"):
         # Vercel 环境：使用 /tmp 目录
-        SQLALCHEMY_DATABASE_URI = "sqlite:////tmp/comments.db"
+        SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:////tmp/comments.db")
     else:
         # 本地开发环境
         basedir = os.path.abspath(os.path.dirname(__file__))
-        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(basedir, 'database', 'comments.db')}"
+        SQLALCHEMY_DATABASE_URI = os.getenv(
+            "DATABASE_URL", f"sqlite:///{os.path.join(basedir, 'database', 'comments.db')}"
+        )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # 建表/补索引时机：startup 启动时执行；lazy 每个进程首个需要数据库的请求时执行一次；off 不执行
+    DB_SCHEMA_BOOTSTRAP = os.getenv("DB_SCHEMA_BOOTSTRAP", "lazy" if os.getenv("VERCEL") else "startup")
+    STARTUP_REPORT = os.getenv("STARTUP_REPORT", "false").lower() == "true"  # 启动时打印各阶段耗时
+    # 渲染页面缓存：按数据集版本缓存首页和详情页 HTML
+    PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "true").lower() == "true"
+    PAGE_CACHE_MAX_ENTRIES = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", 500))
+    PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+
+    # HTTP 缓存：页面和 API 的 CDN 缓存时间（秒），浏览器每次都带 ETag 验证
+    HTTP_SHARED_MAX_AGE = int(os.getenv("HTTP_SHARED_MAX_AGE", 60))
+    HTTP_STALE_WHILE_REVALIDATE = int(os.getenv("HTTP_STALE_WHILE_REVALIDATE", 300))
+
+    # SQLite 连接参数：WAL 模式下读写互不阻塞，写锁冲突时等待 busy_timeout 毫秒而不是立即报错
+    SQLITE_WAL = os.getenv("SQLITE_WAL", "true").lower() == "true"
+    SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000))
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")  # WAL 下 NORMAL 足够安全
+    COMMENTS_PAGE_SIZE = int(os.getenv("COMMENTS_PAGE_SIZE", 20))  # 每页评论数
+    COMMENT_COUNT_TTL = int(os.getenv("COMMENT_COUNT_TTL", 60))  # 评论数缓存时间（秒）
+    COMMENT_COUNT_CACHE_SIZE = int(os.getenv("COMMENT_COUNT_CACHE_SIZE", 10000))  # 评论数缓存条数（LRU）
+
+    # 文章快照文件（冷启动时直接加载，后台再增量同步）
+    SNAPSHOT_ENABLED = os.getenv("SNAPSHOT_ENABLED", "true").lower() == "true"
+    if os.getenv("VERCEL"):
+        SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "/tmp/articles_snapshot.db")
+    else:
+        SNAPSHOT_PATH = os.getenv(
+            "SNAPSHOT_PATH",
+            os.path.join(os.path.abspath(os.path.dirname(__file__)), "database", "articles_snapshot.db"),
+        )
+    # 随部署一起发布的只读快照（可选，由 build_snapshot.py 生成），SNAPSHOT_PATH 不存在时使用
+    SNAPSHOT_SEED_PATH = os.getenv("SNAPSHOT_SEED_PATH", "")
+
+    # 内容分析词典，可通过环境变量追加（逗号分隔），顺序即匹配优先级
+    SCAM_TYPES = [
+        "刷单", "杀猪盘", "虚假投资", "冒充公检法", "贷款诈骗",
+        "客服诈骗", "中奖诈骗", "虚假征信", "网络博彩", "游戏充值",
+        "裸聊敲诈", "兼职诈骗", "电商退款", "冒充客服",
+    ] + [term for term in os.getenv("EXTRA_SCAM_TYPES", "").split(",") if term]
+    TECH_KEYWORDS = [
+        "预警", "劝阻", "拦截", "封堵", "止付", "冻结",
+        "研判", "溯源", "侦查", "抓捕", "反制",
+    ] + [term for term in os.getenv("EXTRA_TECH_KEYWORDS", "").split(",") if term]
 
     # 飞书字段映射配置
     FIELD_MAPPING = {
@@ -1,9 +1,24 @@
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from typing import Optional
 import re
 
 
+_DATE_PATTERN = re.compile(r"(\d{4})\D{1,2}(\d{1,2})\D{1,2}(\d{1,2})")
+
+
+def normalize_date(value) -> str:
+    """日期归一化为 YYYY-MM-DD，兼容毫秒时间戳和常见中文日期写法"""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000).strftime("%Y-%m-%d")
+
+    match = _DATE_PATTERN.search(value or "")
+    if not match:
+        return ""
+    year, month, day = match.groups()
+    return f"{year}-{int(month):02d}-{int(day):02d}"
+
+
 @dataclass
 class ArticleAnalysis:
     """文章分析结果"""
@@ -13,9 +28,9 @@ class ArticleAnalysis:
     anti_fraud_tech: list[str] = field(default_factory=list)  # 反诈关键技术
 
 
-@dataclass
+@dataclass(frozen=True)
 class Article:
-    """文章数据模型"""
+    """文章数据模型（不可变，可在请求之间安全共享）"""
 
     id: str  # 飞书记录 ID
     title: str  # 标题
@@ -29,57 +44,24 @@ class Article:
 
     def __post_init__(self):
         if self.created_at is None:
-            self.created_at = datetime.now()
+            object.__setattr__(self, "created_at", datetime.now())
+        elif isinstance(self.created_at, str):
+            # 从缓存恢复时为 ISO 格式字符串
+            object.__setattr__(self, "created_at", datetime.fromisoformat(self.created_at))
         if self._analysis is None:
-            self._analysis = self._analyze_content()
+            object.__setattr__(self, "_analysis", self._analyze_content())
 
     def _analyze_content(self) -> ArticleAnalysis:
         """分析文章内容，提取关键信息"""
-        text = self.summary or ""
-        analysis = ArticleAnalysis()
-
-        # 提取诈骗类型
-        scam_types = [
-            "刷单", "杀猪盘", "虚假投资", "冒充公检法", "贷款诈骗",
-            "客服诈骗", "中奖诈骗", "虚假征信", "网络博彩", "游戏充值",
-            "裸聊敲诈", "兼职诈骗", "电商退款", "冒充客服"
-        ]
-        for scam_type in scam_types:
-            if scam_type in text:
-                analysis.scam_type = scam_type
-                break
-
-        # 提取地点
-        location_patterns = [
-            r"(?:在|位于|地点|地址)([^\s，。]{2,6}?)(?:市|区|县|省|镇|乡|村)",
-            r"([\u4e00-\u9fa5]{2,6}?)(?:省|市|区|县|镇|派出所|公安局)",
-        ]
-        for pattern in location_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                analysis.location = matches[0]
-                break
-
-        # 提取案件特点 - 查找关键词句
-        feature_patterns = [
-            r"([^\s]{4,30}?)(?:诈骗|陷阱|套路|手段|方式)",
-            r"特点[：:](.{4,50}?)(?:[\n\r]|。)",
-        ]
-        for pattern in feature_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                analysis.key_features.extend(matches[:3])
-
-        # 提取反诈技术
-        tech_keywords = ["预警", "劝阻", "拦截", "封堵", "止付", "冻结",
-                        "研判", "溯源", "侦查", "抓捕", "反制"]
-        found_techs = []
-        for keyword in tech_keywords:
-            if keyword in text:
-                found_techs.append(keyword)
-        analysis.anti_fraud_tech = found_techs
-
-        return analysis
+        from services.analyzer import get_analyzer
+        return get_analyzer().analyze(self.summary or "")
+
+    @property
+    def display_date(self) -> str:
+        """展示用日期：字符串取前 10 个字符，毫秒时间戳转为 YYYY-MM-DD"""
+        if isinstance(self.date, str):
+            return self.date[:10]
+        return normalize_date(self.date) if self.date else ""
 
     @property
     def preview(self) -> str:
@@ -122,6 +104,21 @@ class Article:
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
 
+    def to_cache_dict(self) -> dict:
+        """转换为缓存字典（附带分析结果，恢复时无需重新分析）"""
+        data = self.to_dict()
+        data["analysis"] = asdict(self._analysis) if self._analysis else None
+        return data
+
+    @classmethod
+    def from_cache_dict(cls, data: dict) -> "Article":
+        """从缓存字典恢复文章对象"""
+        data = dict(data)
+        analysis = data.pop("analysis", None)
+        if analysis is not None:
+            analysis = ArticleAnalysis(**analysis)
+        return cls(**data, _analysis=analysis)
+
     @classmethod
     def from_feishu_record(cls, record: dict, field_mapping: dict) -> "Article":
         """从飞书记录创建文章对象"""
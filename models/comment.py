@@ -1,5 +1,7 @@
+import threading
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 
 db = SQLAlchemy()
 
@@ -8,6 +10,10 @@ class Comment(db.Model):
     """评论数据模型"""
 
     __tablename__ = "comments"
+    __table_args__ = (
+        # 覆盖 "某文章已审核评论按时间倒序分页" 查询，避免临时 B 树排序
+        db.Index("ix_comments_article_status_created", "article_id", "status", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     article_id = db.Column(db.String(100), nullable=False, index=True)
@@ -34,9 +40,96 @@ class Comment(db.Model):
             article_id=article_id, status="approved"
         ).order_by(cls.created_at.desc()).all()
 
+    @classmethod
+    def approved_page_query(cls, article_id: str, before: tuple[datetime, int] | None, limit: int):
+        """分页查询：游标用行值比较，SQLite 直接在 (article_id, status, created_at, id) 索引上做范围查找"""
+        query = cls.query.filter_by(article_id=article_id, status="approved")
+        if before:
+            query = query.filter(db.tuple_(cls.created_at, cls.id) < tuple(before))
+        return query.order_by(cls.created_at.desc(), cls.id.desc()).limit(limit)
+
+    @classmethod
+    def get_approved_page(
+        cls,
+        article_id: str,
+        before: tuple[datetime, int] | None = None,
+        limit: int = 20,
+    ) -> tuple[list["Comment"], tuple[datetime, int] | None]:
+        """按 (created_at, id) 倒序分页获取已审核评论，返回本页评论和下一页游标"""
+        comments = cls.approved_page_query(article_id, before, limit + 1).all()
+        if len(comments) <= limit:
+            return comments, None
+
+        comments = comments[:limit]
+        return comments, (comments[-1].created_at, comments[-1].id)
+
+    @classmethod
+    def version_by_article(cls, article_id: str) -> tuple[int, int | None, datetime | None]:
+        """文章已审核评论的 (数量, 最大 ID, 最新时间)，任意评论增删都会改变"""
+        count, max_id, latest = db.session.query(
+            db.func.count(cls.id), db.func.max(cls.id), db.func.max(cls.created_at)
+        ).filter(cls.article_id == article_id, cls.status == "approved").one()
+        return count, max_id, latest
+
     @classmethod
     def count_by_article(cls, article_id: str) -> int:
         """统计文章评论数"""
         return cls.query.filter_by(
             article_id=article_id, status="approved"
         ).count()
+
+    @classmethod
+    def count_by_articles(cls, article_ids: list[str]) -> dict[str, int]:
+        """批量统计多篇文章的评论数（一次 GROUP BY 查询）"""
+        if not article_ids:
+            return {}
+
+        rows = db.session.query(
+            cls.article_id, db.func.count(cls.id)
+        ).filter(
+            cls.article_id.in_(article_ids), cls.status == "approved"
+        ).group_by(cls.article_id).all()
+
+        counts = {article_id: 0 for article_id in article_ids}
+        counts.update(dict(rows))
+        return counts
+
+
+def init_schema():
+    """创建表，并补建已有表上缺失的索引（create_all 不会给已存在的表加索引）"""
+    db.create_all()
+    for index in Comment.__table__.indexes:
+        index.create(bind=db.engine, checkfirst=True)
+
+
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+
+def ensure_schema():
+    """每个进程只执行一次 init_schema，之后直接返回"""
+    global _schema_ready
+    if _schema_ready:
+        return
+    with _schema_lock:
+        if not _schema_ready:
+            init_schema()
+            _schema_ready = True
+
+
+def enable_sqlite_pragmas(engine, wal: bool = True, busy_timeout: int = 5000, synchronous: str = "NORMAL"):
+    """为 SQLite 引擎的每个新连接设置 WAL、busy_timeout 和 synchronous"""
+    if engine.dialect.name != "sqlite":
+        return
+    synchronous = synchronous.upper()
+    if synchronous not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+        raise ValueError(f"Invalid SQLite synchronous mode: {synchronous}")
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout = {int(busy_timeout)}")
+        if wal:
+            cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute(f"PRAGMA synchronous = {synchronous}")
+        cursor.close()
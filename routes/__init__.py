@@ -4,4 +4,4 @@ from flask import Blueprint
 views_bp = Blueprint("views", __name__)
 api_bp = Blueprint("api", __name__, url_prefix="/api")
 
-from routes import views, api
+from routes import views, api, events
@@ -1,9 +1,18 @@
 from flask import jsonify, request, current_app
 from routes import api_bp
-from services.cache import get_all_articles
+from services.cache import get_all_articles, get_dataset
+from services.dataset import decode_cursor, encode_cursor
+from services.facets import FACET_FIELDS, bitmap_from_positions
+from services.stats import DIMENSIONS as STATS_DIMENSIONS
+from services.formatter import formatter_cache
+from services.page_cache import page_cache
+from services.comment_counts import comment_counts
+from services.startup import startup_timer
+from services.http_cache import cacheable, make_etag, not_modified
 from models.comment import Comment
 from models.comment import db as comment_db
 from config import Config
+from datetime import datetime
 import os
 
 
@@ -18,6 +27,8 @@ def health_check():
             "base_id": bool(Config.BASE_ID),
             "table_id": bool(Config.TABLE_ID),
             "is_vercel": os.getenv("VERCEL") == "1",
+            # 增量同步方式：按"最后更新时间"字段筛选，或按记录自带的修改时间对账
+            "delta_sync": "modified_field" if Config.FEISHU_MODIFIED_FIELD else "record_scan",
         }
 
         # 尝试获取文章数量
@@ -32,6 +43,9 @@ def health_check():
             "status": "ok",
             "config": config_status,
             "articles_count": articles_count,
+            "formatter_cache": formatter_cache.stats(),
+            "page_cache": page_cache.stats(),
+            "startup": startup_timer.report(),
             "error": error_message if 'error_message' in locals() else None
         })
     except Exception as e:
@@ -41,45 +55,209 @@ def health_check():
         }), 500
 
 
+def _article_card(article) -> dict:
+    """文章卡片数据（列表展示需要的分析字段和预览）"""
+    data = article.to_dict()
+    data.update({
+        "display_date": article.display_date,
+        "scam_type": article.scam_type,
+        "location": article.location,
+        "preview": article.preview,
+    })
+    return data
+
+
+@api_bp.route("/articles")
+def list_articles():
+    """文章列表 API（按日期降序，游标分页）"""
+    try:
+        cursor = decode_cursor(request.args.get("cursor"))
+    except ValueError as e:
+        return jsonify({"error": str(e), "articles": []}), 400
+
+    limit = request.args.get("limit", Config.INDEX_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, Config.API_MAX_PAGE_SIZE))
+
+    try:
+        articles, next_cursor = get_dataset().page(
+            cursor=cursor,
+            limit=limit,
+            source=request.args.get("source") or None,
+            date_from=request.args.get("date_from") or None,
+            date_to=request.args.get("date_to") or None,
+        )
+
+        counts = comment_counts.get_many([article.id for article in articles])
+        cards = []
+        for article in articles:
+            card = _article_card(article)
+            card["comment_count"] = counts.get(article.id, 0)
+            cards.append(card)
+
+        return jsonify({
+            "articles": cards,
+            "next_cursor": encode_cursor(next_cursor),
+            "has_more": next_cursor is not None,
+        })
+
+    except Exception as e:
+        current_app.logger.error(f"List articles error: {str(e)}")
+        return jsonify({"error": str(e), "articles": []}), 500
+
+
 @api_bp.route("/search")
 def search_articles():
-    """搜索文章 API"""
+    """搜索文章 API
+
+    q 为关键词；scam_type、location、source 为分面筛选（可重复传多个值），
+    date_from、date_to 为日期区间。传 facets=1 时再返回结果集中各分面取值的数量，
+    普通的关键词搜索只做索引求交，不计算分面。
+    """
     query = request.args.get("q", "").strip()
+    with_counts = request.args.get("facets") in ("1", "true")
+    facets = {
+        name: [value for value in request.args.getlist(name) if value]
+        for name in FACET_FIELDS
+    }
+    date_from = request.args.get("date_from") or None
+    date_to = request.args.get("date_to") or None
+    filtered = any(facets.values()) or date_from or date_to
 
-    if not query:
+    if not query and not filtered:
         return jsonify({"articles": [], "total": 0})
 
     try:
-        articles = get_all_articles()
-        query_lower = query.lower()
+        dataset = get_dataset()
+        etag = make_etag(dataset.version, query, sorted(facets.items()), date_from, date_to, with_counts)
+        cached = not_modified(etag, dataset.updated_at, shared_max_age=Config.HTTP_SHARED_MAX_AGE)
+        if cached:
+            return cached
+
+        # 关键词走倒排索引，分面和日期走位图，组合条件只做位运算
+        facet_index = dataset.facet_index
+        bitmap = None
+        if query:
+            bitmap = bitmap_from_positions(dataset.search_index.positions(query))
+        bitmap = facet_index.filter(bitmap, date_from=date_from, date_to=date_to, **facets)
 
-        # 搜索标题、摘要、账号
         results = [
-            article.to_dict()
-            for article in articles
-            if (
-                query_lower in article.title.lower()
-                or query_lower in article.summary.lower()
-                or query_lower in article.source.lower()
-            )
+            {**article.to_dict(), "display_date": article.display_date} for article in facet_index.articles(bitmap)
         ]
+        data = {"articles": results, "total": len(results)}
+        if with_counts:
+            data["facets"] = facet_index.counts(bitmap)
 
-        return jsonify({"articles": results, "total": len(results)})
+        return cacheable(
+            jsonify(data),
+            etag, dataset.updated_at, shared_max_age=Config.HTTP_SHARED_MAX_AGE,
+        )
 
     except Exception as e:
         current_app.logger.error(f"Search error: {str(e)}")
         return jsonify({"error": str(e), "articles": [], "total": 0}), 500
 
 
+@api_bp.route("/stats")
+def get_stats():
+    """仪表盘统计 API
+
+    group 为分组维度（scam_type、location、source、anti_fraud_tech），interval 为 all、day 或 week；
+    可再用一个维度做筛选，如 ?group=location&interval=week&scam_type=刷单。
+    """
+    group = request.args.get("group") or None
+    interval = request.args.get("interval", "all")
+    filters = [(name, request.args[name]) for name in STATS_DIMENSIONS if request.args.get(name)]
+    if len(filters) > 1:
+        return jsonify({"error": "最多只能按一个维度筛选"}), 400
+    filter_name, filter_value = filters[0] if filters else (None, None)
+
+    try:
+        dataset = get_dataset()
+        etag = make_etag(dataset.version, group, interval, filter_name, filter_value)
+        cached = not_modified(etag, dataset.updated_at, shared_max_age=Config.HTTP_SHARED_MAX_AGE)
+        if cached:
+            return cached
+
+        stats = dataset.stats
+        data = stats.query(group, interval, filter_name, filter_value)
+        return cacheable(
+            jsonify({
+                "version": dataset.version,
+                "total": stats.total,
+                "group": group,
+                "interval": interval,
+                "filter": {filter_name: filter_value} if filter_name else {},
+                "data": data,
+            }),
+            etag, dataset.updated_at, shared_max_age=Config.HTTP_SHARED_MAX_AGE,
+        )
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Stats error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+@api_bp.route("/comments/counts")
+def get_comment_counts():
+    """批量获取文章评论数，ids 为逗号分隔的文章 ID"""
+    article_ids = [
+        article_id.strip()
+        for article_id in request.args.get("ids", "").split(",")
+        if article_id.strip()
+    ]
+    if len(article_ids) > Config.API_MAX_PAGE_SIZE:
+        return jsonify({"error": f"一次最多查询{Config.API_MAX_PAGE_SIZE}篇文章", "counts": {}}), 400
+
+    try:
+        return jsonify({"counts": comment_counts.get_many(article_ids)})
+    except Exception as e:
+        current_app.logger.error(f"Get comment counts error: {str(e)}")
+        return jsonify({"error": str(e), "counts": {}}), 500
+
+
+def _decode_comment_cursor(cursor: str | None) -> tuple[datetime, int] | None:
+    """评论分页游标：(created_at ISO 字符串, 评论 ID)"""
+    key = decode_cursor(cursor)
+    if key is None:
+        return None
+    try:
+        return datetime.fromisoformat(key[0]), int(key[1])
+    except ValueError as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
 @api_bp.route("/articles/<article_id>/comments", methods=["GET"])
 def get_comments(article_id):
-    """获取文章评论"""
+    """获取文章评论（按时间倒序，游标分页）"""
     try:
-        comments = Comment.get_approved_by_article(article_id)
-        return jsonify({
+        before = _decode_comment_cursor(request.args.get("cursor"))
+    except ValueError as e:
+        return jsonify({"error": str(e), "comments": [], "total": 0}), 400
+
+    limit = request.args.get("limit", Config.COMMENTS_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, Config.API_MAX_PAGE_SIZE))
+
+    try:
+        # 评论版本（数量、最大 ID）不变时返回 304；新评论需立即可见，不交给 CDN 缓存
+        total, max_id, latest = Comment.version_by_article(article_id)
+        etag = make_etag(article_id, total, max_id, before, limit)
+        cached = not_modified(etag, latest)
+        if cached:
+            return cached
+
+        comments, next_key = Comment.get_approved_page(article_id, before=before, limit=limit)
+        next_cursor = None
+        if next_key:
+            next_cursor = encode_cursor((next_key[0].isoformat(), str(next_key[1])))
+
+        return cacheable(jsonify({
             "comments": [comment.to_dict() for comment in comments],
-            "total": len(comments)
-        })
+            "total": total,
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+        }), etag, latest)
     except Exception as e:
         current_app.logger.error(f"Get comments error: {str(e)}")
         return jsonify({"error": str(e), "comments": [], "total": 0}), 500
@@ -103,19 +281,22 @@ def create_comment(article_id):
         if len(content) > 1000:
             return jsonify({"error": "评论内容不能超过1000个字符"}), 400
 
-        comment = Comment(
-            article_id=article_id,
-            author=author,
-            content=content,
-            status="approved"  # 默认直接审核通过，可后续改为手动审核
-        )
+        fields = {
+            "article_id": article_id,
+            "author": author,
+            "content": content,
+            "status": "approved",  # 默认直接审核通过，可后续改为手动审核
+        }
 
+        comment = Comment(**fields)
         comment_db.session.add(comment)
         comment_db.session.commit()
+        comment_dict = comment.to_dict()
+        comment_counts.invalidate(article_id)
 
         return jsonify({
             "message": "评论成功",
-            "comment": comment.to_dict()
+            "comment": comment_dict
         }), 201
 
     except Exception as e:
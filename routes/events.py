@@ -0,0 +1,52 @@
+from flask import jsonify, request, current_app
+from routes import api_bp
+from services.cache import apply_record_changes
+from services.feishu_events import RECORD_CHANGED_EVENT, EventError, parse_event, record_changes
+from config import Config
+
+
+# 已处理事件的去重时间（飞书在未收到 200 时会重推同一事件）
+EVENT_DEDUP_TIMEOUT = 6 * 3600
+
+
+@api_bp.route("/feishu/events", methods=["POST"])
+def feishu_events():
+    """飞书事件订阅回调：记录变更时只更新受影响的记录"""
+    # 未配置 Verification Token 和 Encrypt Key 时无法校验来源，不开放回调
+    if not Config.FEISHU_VERIFICATION_TOKEN and not Config.FEISHU_ENCRYPT_KEY:
+        return jsonify({"error": "Not found"}), 404
+
+    try:
+        payload = parse_event(
+            request.get_data(),
+            request.headers,
+            verification_token=Config.FEISHU_VERIFICATION_TOKEN,
+            encrypt_key=Config.FEISHU_ENCRYPT_KEY,
+            max_age=Config.FEISHU_EVENT_MAX_AGE,
+        )
+    except EventError as e:
+        current_app.logger.warning(f"Rejected Feishu event: {str(e)}")
+        return jsonify({"error": str(e)}), 401
+
+    # 配置请求地址时的验证请求
+    if payload.get("type") == "url_verification":
+        return jsonify({"challenge": payload.get("challenge")})
+
+    header = payload.get("header", {})
+    if header.get("event_type") != RECORD_CHANGED_EVENT:
+        return jsonify({"code": 0})
+
+    event_id = header.get("event_id")
+    if event_id and not current_app.cache.add(f"feishu_event:{event_id}", True, timeout=EVENT_DEDUP_TIMEOUT):
+        return jsonify({"code": 0, "duplicate": True})
+
+    changed, deleted = record_changes(payload.get("event", {}), Config.BASE_ID, Config.TABLE_ID)
+    applied = False
+    if changed or deleted:
+        try:
+            applied = apply_record_changes(changed, deleted)
+        except Exception as e:
+            # 仍返回 200，避免飞书反复重推；下次增量同步会补上
+            current_app.logger.error(f"Apply Feishu event error: {str(e)}")
+
+    return jsonify({"code": 0, "applied": applied})
@@ -1,22 +1,57 @@
-from flask import render_template, current_app
+from flask import render_template, current_app, request
 from routes import views_bp
-from services.cache import get_all_articles, get_article
+from services.cache import get_dataset
+from services.dataset import decode_cursor, encode_cursor
+from services.comment_counts import comment_counts
+from services.http_cache import cacheable, make_etag, not_modified
+from services.page_cache import page_cache
+from config import Config
+
+
+def _render_cached(version: str | None, parts: tuple, template: str, **context) -> str:
+    """渲染模板，结果按数据集版本缓存"""
+    if not Config.PAGE_CACHE_ENABLED:
+        return render_template(template, **context)
+    return page_cache.get_or_render(version, parts, lambda: render_template(template, **context))
 
 
 @views_bp.route("/")
 def index():
     """首页 - 文章列表"""
     try:
-        articles = get_all_articles()
-        print(f"[DEBUG] Index: Found {len(articles)} articles")
-        if articles:
-            print(f"[DEBUG] First article: {articles[0].title}")
-        return render_template("index.html", articles=articles)
+        # 服务端只渲染一页，后续页由前端滚动加载
+        try:
+            cursor = decode_cursor(request.args.get("cursor"))
+        except ValueError:
+            cursor = None
+
+        dataset = get_dataset()
+        articles, next_cursor = dataset.page(cursor=cursor, limit=Config.INDEX_PAGE_SIZE)
+        current_app.logger.debug(f"Index: {len(dataset)} articles, {len(articles)} on this page")
+        # 本页所有卡片的评论数，一次查询
+        try:
+            counts = comment_counts.get_many([article.id for article in articles])
+        except Exception as e:
+            current_app.logger.error(f"Comment counts error: {str(e)}")
+            counts = {}
+
+        # 数据集版本和本页评论数都没变时直接返回 304，不再渲染
+        etag = make_etag(dataset.version, sorted(counts.items()))
+        cached = not_modified(etag, shared_max_age=Config.HTTP_SHARED_MAX_AGE)
+        if cached:
+            return cached
+
+        html = _render_cached(
+            dataset.version,
+            ("index", encode_cursor(cursor), sorted(counts.items())),
+            "index.html",
+            articles=articles,
+            next_cursor=encode_cursor(next_cursor),
+            comment_counts=counts,
+        )
+        return cacheable(html, etag, shared_max_age=Config.HTTP_SHARED_MAX_AGE)
     except Exception as e:
-        print(f"[DEBUG] Index error: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        current_app.logger.error(f"Index page error: {str(e)}")
+        current_app.logger.exception(f"Index page error: {str(e)}")
         return render_template("index.html", articles=[], error=str(e))
 
 
@@ -24,10 +59,21 @@ def index():
 def article_detail(article_id):
     """文章详情页"""
     try:
-        article = get_article(article_id)
+        dataset = get_dataset()
+        article = dataset.get(article_id)
         if not article:
             return render_template("detail.html", article=None, error="文章不存在")
-        return render_template("detail.html", article=article)
+
+        etag = make_etag(dataset.version, article_id)
+        cached = not_modified(etag, dataset.updated_at, shared_max_age=Config.HTTP_SHARED_MAX_AGE)
+        if cached:
+            return cached
+
+        html = _render_cached(dataset.version, ("detail", article_id), "detail.html", article=article)
+        return cacheable(
+            html,
+            etag, dataset.updated_at, shared_max_age=Config.HTTP_SHARED_MAX_AGE,
+        )
     except Exception as e:
         current_app.logger.error(f"Article detail error: {str(e)}")
         return render_template("detail.html", article=None, error=str(e))
@@ -0,0 +1,253 @@
+from array import array
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from models.article import Article, ArticleAnalysis
+
+
+# 中文为主的字段放在 str 缓冲区（每字 2 字节），ID、日期、链接等放在 UTF-8 字节缓冲区（每字 1 字节）
+TEXT_FIELDS = ("title", "summary", "content")
+BYTES_FIELDS = ("id", "date", "address")
+_TITLE, _SUMMARY, _CONTENT = range(len(TEXT_FIELDS))
+_ID, _DATE, _ADDRESS = range(len(BYTES_FIELDS))
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_NO_TIME = -(2 ** 63)  # created_at 为空
+
+
+class _Interner:
+    """取值去重：相同的值只保存一份，按编号引用"""
+
+    def __init__(self):
+        self.values: list = []
+        self._codes: dict = {}
+
+    def code(self, value) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def _feature_spans(summary: str, features: list[str]) -> list[int] | None:
+    """核心特点都是从摘要中提取的片段，记录为摘要内的 (起, 止) 偏移；找不到时返回 None"""
+    spans = []
+    for feature in features:
+        start = summary.find(feature)
+        if start < 0:
+            return None
+        spans.extend((start, start + len(feature)))
+    return spans
+
+
+class ArticleStore:
+    """列式文章存储
+
+    文本字段拼接在共享缓冲区中，按偏移量切片读取，省去每个字段一个对象的开销；
+    账号、诈骗类型、地点、反诈技术等重复度高的取值编码为整数，存放在 array 中；
+    核心特点保存为摘要内的偏移量，created_at 以微秒整数保存，毫秒时间戳形式的日期单独保存。
+    对外通过 ArticleView（只有两个槽位）提供与 Article 相同的属性。
+    """
+
+    def __init__(self, articles=()):
+        text_parts: list[str] = []
+        bytes_parts: list[bytes] = []
+        text_offsets = array("I", [0])
+        bytes_offsets = array("I", [0])
+        text_position = bytes_position = 0
+        has_content = bytearray()
+        created_at = array("q")
+        sources, scam_types, locations, techs = _Interner(), _Interner(), _Interner(), _Interner()
+        source_codes, scam_type_codes = array("I"), array("I")
+        location_codes, tech_codes = array("I"), array("I")
+        feature_spans = array("I")
+        feature_offsets = array("I", [0])
+        feature_overrides: dict[int, list[str]] = {}
+        date_overrides: dict[int, int | float] = {}
+
+        for index, article in enumerate(articles):
+            analysis = article._analysis or ArticleAnalysis()
+            for text in (article.title, article.summary, article.content):
+                text = text or ""
+                text_parts.append(text)
+                text_position += len(text)
+                text_offsets.append(text_position)
+            date = article.date
+            if date is not None and not isinstance(date, str):
+                # 飞书日期字段返回毫秒时间戳，原样保存，不进入字节缓冲区
+                date_overrides[index] = date
+                date = ""
+            for text in (article.id, date, article.address):
+                data = (text or "").encode("utf-8")
+                bytes_parts.append(data)
+                bytes_position += len(data)
+                bytes_offsets.append(bytes_position)
+
+            has_content.append(article.content is not None)
+            created_at.append(
+                (article.created_at - _EPOCH) // _MICROSECOND if article.created_at else _NO_TIME
+            )
+            source_codes.append(sources.code(article.source or ""))
+            scam_type_codes.append(scam_types.code(analysis.scam_type))
+            location_codes.append(locations.code(analysis.location))
+            tech_codes.append(techs.code(tuple(analysis.anti_fraud_tech)))
+
+            spans = _feature_spans(article.summary or "", analysis.key_features)
+            if spans is None:
+                feature_overrides[index] = list(analysis.key_features)
+            else:
+                feature_spans.extend(spans)
+            feature_offsets.append(len(feature_spans))
+
+        self._text = "".join(text_parts)
+        self._bytes = b"".join(bytes_parts)
+        self._text_offsets = text_offsets
+        self._bytes_offsets = bytes_offsets
+        self._has_content = bytes(has_content)
+        self._created_at = created_at
+        self._sources = sources.values
+        self._scam_types = scam_types.values
+        self._locations = locations.values
+        self._techs = techs.values
+        self._source_codes = source_codes
+        self._scam_type_codes = scam_type_codes
+        self._location_codes = location_codes
+        self._tech_codes = tech_codes
+        self._feature_spans = feature_spans
+        self._feature_offsets = feature_offsets
+        self._feature_overrides = feature_overrides
+        self._date_overrides = date_overrides
+        self.views: tuple["ArticleView", ...] = tuple(
+            ArticleView(self, index) for index in range(len(created_at))
+        )
+
+    @classmethod
+    def from_cache_dicts(cls, items: list[dict]) -> "ArticleStore":
+        """从缓存字典构建，逐篇转换，不保留中间的 Article 对象"""
+        return cls(Article.from_cache_dict(data) for data in items)
+
+    def __len__(self) -> int:
+        return len(self.views)
+
+    def __getitem__(self, index: int) -> "ArticleView":
+        return self.views[index]
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def text(self, index: int, field: int) -> str:
+        start = index * len(TEXT_FIELDS) + field
+        return self._text[self._text_offsets[start]:self._text_offsets[start + 1]]
+
+    def bytes_text(self, index: int, field: int) -> str:
+        start = index * len(BYTES_FIELDS) + field
+        return self._bytes[self._bytes_offsets[start]:self._bytes_offsets[start + 1]].decode("utf-8")
+
+    def key_features(self, index: int) -> list[str]:
+        override = self._feature_overrides.get(index)
+        if override is not None:
+            return list(override)
+        spans = self._feature_spans[self._feature_offsets[index]:self._feature_offsets[index + 1]]
+        if not spans:
+            return []
+        summary = self.text(index, _SUMMARY)
+        return [summary[spans[i]:spans[i + 1]] for i in range(0, len(spans), 2)]
+
+
+def _text_property(field: int, doc: str):
+    def getter(self) -> str:
+        return self._store.text(self._index, field)
+    return property(getter, doc=doc)
+
+
+def _bytes_property(field: int, doc: str):
+    def getter(self) -> str:
+        return self._store.bytes_text(self._index, field)
+    return property(getter, doc=doc)
+
+
+class ArticleView:
+    """列式存储中一篇文章的只读视图，属性与 Article 一致"""
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: ArticleStore, index: int):
+        self._store = store
+        self._index = index
+
+    id = _bytes_property(_ID, "飞书记录 ID")
+    title = _text_property(_TITLE, "标题")
+    summary = _text_property(_SUMMARY, "摘要")
+    address = _bytes_property(_ADDRESS, "原文地址 URL")
+
+    @property
+    def date(self) -> str | int:
+        """日期（飞书日期字段为毫秒时间戳）"""
+        value = self._store._date_overrides.get(self._index)
+        if value is not None:
+            return value
+        return self._store.bytes_text(self._index, _DATE)
+
+    @property
+    def source(self) -> str:
+        """账号/信息来源"""
+        return self._store._sources[self._store._source_codes[self._index]]
+
+    @property
+    def content(self) -> str | None:
+        """完整内容（如有）"""
+        if not self._store._has_content[self._index]:
+            return None
+        return self._store.text(self._index, _CONTENT)
+
+    @property
+    def created_at(self) -> datetime | None:
+        """缓存时间"""
+        value = self._store._created_at[self._index]
+        if value == _NO_TIME:
+            return None
+        return _EPOCH + value * _MICROSECOND
+
+    @property
+    def scam_type(self) -> str:
+        """诈骗类型"""
+        return self._store._scam_types[self._store._scam_type_codes[self._index]]
+
+    @property
+    def location(self) -> str:
+        """案件地点"""
+        return self._store._locations[self._store._location_codes[self._index]]
+
+    @property
+    def key_features(self) -> list[str]:
+        """案件核心特点"""
+        return self._store.key_features(self._index)
+
+    @property
+    def anti_fraud_tech(self) -> list[str]:
+        """反诈关键技术"""
+        return list(self._store._techs[self._store._tech_codes[self._index]])
+
+    @property
+    def _analysis(self) -> ArticleAnalysis:
+        return ArticleAnalysis(
+            scam_type=self.scam_type,
+            location=self.location,
+            key_features=self.key_features,
+            anti_fraud_tech=self.anti_fraud_tech,
+        )
+
+    # 以下方法与 Article 共用实现
+    preview = Article.preview
+    display_date = Article.display_date
+    to_dict = Article.to_dict
+
+    def to_cache_dict(self) -> dict:
+        """转换为缓存字典（附带分析结果）"""
+        data = self.to_dict()
+        data["analysis"] = asdict(self._analysis)
+        return data
+
+    def __repr__(self) -> str:
+        return f"ArticleView(id={self.id!r}, title={self.title!r})"
@@ -0,0 +1,152 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+from flask import abort, current_app, request, send_file, url_for
+
+try:
+    import brotli
+except ImportError:  # 只在构建时需要；build_assets.py 要求必须安装，运行时直接读取已生成的文件
+    brotli = None
+
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+
+# 参与构建的静态资源类型
+ASSET_EXTENSIONS = (".css", ".js")
+
+# 带内容哈希的文件名永不变化，可以永久缓存
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# 按优先级排列的预压缩格式：(Content-Encoding, 文件后缀)
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:10]
+
+
+def _hashed_name(filename: str, digest: str) -> str:
+    root, ext = os.path.splitext(filename)
+    return f"{root}.{digest}{ext}"
+
+
+def _source_files(static_dir: str) -> list[str]:
+    files = []
+    for directory, dirnames, filenames in os.walk(static_dir):
+        dirnames[:] = [name for name in dirnames if name != DIST_DIR]
+        for name in filenames:
+            if name.endswith(ASSET_EXTENSIONS):
+                path = os.path.join(directory, name)
+                files.append(os.path.relpath(path, static_dir).replace(os.sep, "/"))
+    return sorted(files)
+
+
+def build_assets(static_dir: str = STATIC_DIR) -> dict[str, str]:
+    """生成带内容哈希的静态资源及其 gzip/brotli 版本，返回文件名映射
+
+    输出到 static/dist，manifest.json 记录 原文件名 -> 哈希文件名。
+    """
+    out_dir = os.path.join(static_dir, DIST_DIR)
+    manifest = {}
+    for filename in _source_files(static_dir):
+        with open(os.path.join(static_dir, filename), "rb") as f:
+            content = f.read()
+        hashed = _hashed_name(filename, hashlib.sha256(content).hexdigest()[:10])
+        manifest[filename] = hashed
+
+        target = os.path.join(out_dir, hashed)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as f:
+            f.write(content)
+        # mtime=0 保证同样的内容生成同样的压缩文件
+        with open(target + ".gz", "wb") as f:
+            f.write(gzip.compress(content, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(target + ".br", "wb") as f:
+                f.write(brotli.compress(content, quality=11))
+
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    return manifest
+
+
+class AssetManifest:
+    """读取构建结果，提供原文件名到哈希文件名的映射
+
+    源文件修改后未重新构建时，对应条目会被忽略（哈希对不上），回退到原始静态文件。
+    """
+
+    def __init__(self, static_dir: str = STATIC_DIR):
+        self.static_dir = static_dir
+        self._mapping: dict[str, str] | None = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, str]:
+        path = os.path.join(self.static_dir, DIST_DIR, MANIFEST_NAME)
+        try:
+            with open(path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        mapping = {}
+        for filename, hashed in manifest.items():
+            source = os.path.join(self.static_dir, filename)
+            if not os.path.exists(source) or _hashed_name(filename, _file_hash(source)) != hashed:
+                current_app.logger.warning(f"Asset {filename} changed since last build, serving unhashed")
+                continue
+            if os.path.exists(os.path.join(self.static_dir, DIST_DIR, hashed)):
+                mapping[filename] = hashed
+        return mapping
+
+    @property
+    def mapping(self) -> dict[str, str]:
+        if self._mapping is None:
+            with self._lock:
+                if self._mapping is None:
+                    self._mapping = self._load()
+        return self._mapping
+
+    def reload(self):
+        with self._lock:
+            self._mapping = None
+
+
+manifest = AssetManifest()
+
+
+def asset_url(filename: str) -> str:
+    """模板函数：有构建结果时返回带哈希的地址，否则返回原始静态文件地址"""
+    hashed = manifest.mapping.get(filename)
+    if hashed:
+        return url_for("static", filename=f"{DIST_DIR}/{hashed}")
+    return url_for("static", filename=filename)
+
+
+def serve_asset(filename: str):
+    """返回带哈希的静态资源，按 Accept-Encoding 选择预压缩版本"""
+    dist_dir = os.path.join(manifest.static_dir, DIST_DIR)
+    path = os.path.realpath(os.path.join(dist_dir, filename))
+    if not path.startswith(os.path.realpath(dist_dir) + os.sep) or not os.path.isfile(path):
+        abort(404)
+
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    encoding = None
+    accepted = request.accept_encodings
+    for name, suffix in ENCODINGS:
+        if accepted[name] and os.path.isfile(path + suffix):
+            path, encoding = path + suffix, name
+            break
+
+    response = send_file(path, mimetype=mimetype, conditional=True, etag=True)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return response
@@ -1,52 +1,525 @@
+import os
+import threading
+import time
+import uuid
 from flask import current_app
 from models.article import Article
-from services.feishu_client import FeishuClient
+from services.dataset import Dataset
+from services.search_index import SearchIndex
+from services.snapshot import (
+    decode_articles, decode_changes, encode_articles, encode_changes, load_snapshot,
+    patch_snapshot, save_snapshot, save_snapshot_stats, touch_snapshot,
+)
+from services.sync import RecordChanges, SyncEngine, SyncResult
 from config import Config
 
 
-def get_all_articles() -> list[Article]:
-    """获取所有文章（带缓存）"""
+# 进程内对象层：当前版本的数据集，版本不变时直接复用
+_dataset: Dataset | None = None
+_dataset_lock = threading.Lock()
+
+# 磁盘快照恢复锁，避免冷启动时多个线程重复读取
+_restore_lock = threading.Lock()
+
+# 刷新锁：进程内用线程锁，跨 worker 用缓存中的锁键
+_refresh_lock = threading.Lock()
+REFRESH_LOCK_KEY = "all_articles_refresh_lock"
+_refresh_token: str | None = None  # 本进程持有的锁键取值，释放时核对
+_warm_pid: int | None = None  # 已执行 warm_start 的进程
+_derive_thread: threading.Thread | None = None  # 最近一次构建统计和索引的后台线程
+
+# 缓存布局：快照键只保存元数据（版本、游标、同步时间），每次请求读取的数据很小；
+# 文章列表按版本存放在单独的键中（二进制编码），同一版本只写一次，
+# 各 worker 只在版本变化时读取一次。
+# 事件推送发布的版本只保存相对上一版本的变更，快照键的 chain 记录版本链：
+# 第一个版本是完整的文章列表，之后每个版本是一次局部变更
+SNAPSHOT_KEY = "all_articles"
+
+
+def _articles_key(version: str) -> str:
+    return f"{SNAPSHOT_KEY}:{version}"
+
+
+def _chain(snapshot: dict) -> list[str]:
+    return snapshot.get("chain") or [snapshot["version"]]
+
+
+def _stats_key(version: str) -> str:
+    """该版本的仪表盘统计（DashboardStats.encode），由发布该版本的 worker 写入"""
+    return f"dashboard_stats:{version}"
+
+
+def _snapshot_age(snapshot: dict | None) -> float:
+    if not snapshot:
+        return float("inf")
+    return time.time() - snapshot.get("synced_at", 0)
+
+
+def _with_articles(snapshot: dict | None) -> dict | None:
+    """补全快照中的文章列表（沿版本链应用局部变更），缓存中已没有该版本的数据时返回 None"""
+    if snapshot is None or "articles" in snapshot:
+        return snapshot
+    cache = current_app.cache
+    blobs = [cache.get(_articles_key(version)) for version in _chain(snapshot)]
+    if any(data is None for data in blobs):
+        return None
+    try:
+        articles = decode_articles(blobs[0])
+        if len(blobs) > 1:
+            # 修改的文章保留原位置，新增的追加在末尾，与 Dataset.patched 的顺序一致
+            merged = {data["id"]: data for data in articles}
+            for data in blobs[1:]:
+                _, upserted, deleted = decode_changes(data)
+                merged.update((item["id"], item) for item in upserted)
+                for record_id in deleted:
+                    merged.pop(record_id, None)
+            articles = list(merged.values())
+        return {**snapshot, "articles": articles}
+    except (ValueError, KeyError, IndexError) as e:
+        current_app.logger.warning(f"Failed to decode cached articles: {str(e)}")
+        return None
+
+
+def _missing_versions(snapshot: dict, dataset: Dataset | None) -> list[str]:
+    """构建快照版本的数据集需要读取的版本：本进程已有链上的版本时只需之后的局部变更"""
+    chain = _chain(snapshot)
+    if dataset is not None and dataset.version in chain:
+        return chain[chain.index(dataset.version) + 1:]
+    return chain
+
+
+def _get_snapshot() -> dict | None:
+    """读取缓存中的快照，缓存中已没有构建该版本所需的数据时返回 None"""
     cache = current_app.cache
+    snapshot = cache.get(SNAPSHOT_KEY)
+    if snapshot is None or "articles" in snapshot:
+        return snapshot
+    if all(cache.has(_articles_key(version)) for version in _missing_versions(snapshot, _dataset)):
+        return snapshot
+    return None
+
+
+def _store_snapshot(snapshot: dict):
+    """写入缓存（不过期，新鲜度由 synced_at 判断），并删除被替换的版本链上的数据
+
+    文章整体编码写入，版本链从该版本重新开始。
+    """
+    cache = current_app.cache
+    current = cache.get(SNAPSHOT_KEY)
+    version = snapshot["version"]
+    key = _articles_key(version)
+    if not current or _chain(current) != [version] or not cache.has(key):
+        cache.set(key, encode_articles(snapshot["articles"]), timeout=0)
+    if snapshot.get("stats") and not cache.has(_stats_key(version)):
+        cache.set(_stats_key(version), snapshot["stats"], timeout=0)
+    cache.set(
+        SNAPSHOT_KEY, {k: v for k, v in snapshot.items() if k not in ("articles", "stats", "chain")}, timeout=0
+    )
+    # 已读到旧快照键的其他 worker 取不到文章时会重新读取快照键
+    for old in _chain(current) if current else []:
+        if old != version:
+            cache.delete(_articles_key(old))
+            cache.delete(_stats_key(old))
+
 
-    # 尝试从缓存获取
-    cached_articles = cache.get("all_articles")
-    if cached_articles:
-        return [Article(**article) for article in cached_articles]
+def _from_snapshot(snapshot: dict) -> Dataset:
+    """获取快照对应的数据集，同一版本只构造一次"""
+    global _dataset
+    dataset = _dataset
+    if dataset is not None and dataset.version == snapshot["version"]:
+        return dataset
 
-    # 从飞书获取数据
+    with _dataset_lock:
+        if _dataset is None or _dataset.version != snapshot["version"]:
+            dataset = _follow_chain(snapshot) if "articles" not in snapshot else _build(snapshot)
+            if dataset is None:
+                # 该版本已被替换，沿用本进程已有的数据集，下次请求再读取新版本
+                return _dataset or Dataset(None, [])
+            _dataset = dataset
+        return _dataset
+
+
+def _build(snapshot: dict) -> Dataset:
+    """由完整的快照构建数据集"""
+    if not snapshot.get("stats"):
+        # 发布该版本的 worker 已算好统计，直接加载
+        stats = current_app.cache.get(_stats_key(snapshot["version"]))
+        if stats:
+            snapshot = {**snapshot, "stats": stats}
+    return Dataset.from_snapshot(snapshot)
+
+
+def _follow_chain(snapshot: dict) -> Dataset | None:
+    """沿版本链得到快照版本的数据集（调用方需持有 _dataset_lock）
+
+    本进程已有链上的某个版本时只依次应用之后的局部变更（索引和统计随之更新）；
+    否则从链首的完整版本及其统计开始。缓存中缺少需要的数据时返回 None。
+    """
+    cache = current_app.cache
+    chain = _chain(snapshot)
+    missing = _missing_versions(snapshot, _dataset)
+    updated_at = snapshot.get("updated_at", snapshot.get("synced_at"))
     try:
-        client = FeishuClient()
-        records = client.get_all_records()
+        if missing == chain:
+            data = cache.get(_articles_key(chain[0]))
+            if data is None:
+                return None
+            dataset = _build({**snapshot, "version": chain[0], "articles": decode_articles(data)})
+            missing = chain[1:]
+        else:
+            dataset = _dataset
+        for version in missing:
+            data = cache.get(_articles_key(version))
+            if data is None:
+                return None
+            _, upserted, deleted = decode_changes(data)
+            articles = [Article.from_cache_dict(item) for item in upserted]
+            dataset = dataset.patched(version, articles, deleted, updated_at)
+    except (ValueError, KeyError, IndexError) as e:
+        current_app.logger.warning(f"Failed to decode cached articles: {str(e)}")
+        return None
+    return dataset
+
 
-        # 转换为文章对象
-        articles = [
-            Article.from_feishu_record(record, Config.FIELD_MAPPING)
-            for record in records
-        ]
+def _acquire_refresh(cache) -> bool:
+    """尝试获取刷新权，保证同一时间只有一个 worker 在同步"""
+    global _refresh_token
+    if not _refresh_lock.acquire(blocking=False):
+        return False
+    token = f"{os.getpid()}:{uuid.uuid4().hex}"
+    if not cache.add(REFRESH_LOCK_KEY, token, timeout=Config.CACHE_REFRESH_LOCK_TIMEOUT):
+        _refresh_lock.release()
+        return False
+    _refresh_token = token
+    return True
 
-        # 缓存数据
-        cache_data = [article.to_dict() for article in articles]
-        cache.set("all_articles", cache_data, timeout=Config.CACHE_DEFAULT_TIMEOUT)
 
-        return articles
+def _release_refresh(cache):
+    """释放刷新权：锁键仍属于自己时才删除
 
+    同步超过 CACHE_REFRESH_LOCK_TIMEOUT 时锁键已过期，可能已被其他 worker 重新获取，不能删掉别人的锁。
+    """
+    global _refresh_token
+    try:
+        if cache.get(REFRESH_LOCK_KEY) == _refresh_token:
+            cache.delete(REFRESH_LOCK_KEY)
+    finally:
+        _refresh_token = None
+        _refresh_lock.release()
+
+
+def _persist_snapshot(snapshot: dict, previous: dict | None):
+    """写入磁盘快照；版本未变时只更新同步游标"""
+    try:
+        if previous and previous["version"] == snapshot["version"]:
+            try:
+                touch_snapshot(snapshot)
+                return
+            except Exception:
+                pass
+        save_snapshot(snapshot)
     except Exception as e:
-        current_app.logger.error(f"Failed to fetch articles: {str(e)}")
-        return []
+        current_app.logger.warning(f"Failed to save snapshot: {str(e)}")
 
 
-def get_article(article_id: str) -> Article | None:
-    """获取单篇文章"""
-    articles = get_all_articles()
+def _sync(snapshot: dict | None) -> Dataset:
+    """从飞书同步数据并写回缓存（调用方需持有刷新权）"""
+    # 增量同步需要上一版本的完整文章列表
+    snapshot = _with_articles(snapshot)
+    result = SyncEngine().sync(snapshot)
+    return _publish(result, result.to_snapshot(snapshot), snapshot)
 
-    for article in articles:
-        if article.id == article_id:
-            return article
 
-    return None
+def _publish(result: SyncResult, new_snapshot: dict, snapshot: dict | None) -> Dataset:
+    """构建新版本的数据集并写回缓存和磁盘快照；统计和派生索引在后台构建（见 _publish_derived）"""
+    # 版本不变则沿用已有数据集
+    previous = _dataset
+    dataset = _from_snapshot(new_snapshot)
+
+    # 统计按同步变更增量更新（基于的快照必须是上一个数据集的版本），只涉及变更的文章
+    if previous is not None and previous is not dataset and snapshot and previous.version == snapshot["version"]:
+        dataset.derive_stats(previous, result.upserted, result.deleted)
+
+    _store_snapshot(new_snapshot)
+    if Config.SNAPSHOT_ENABLED:
+        _persist_snapshot(new_snapshot, snapshot)
+    _trigger_publish_derived(dataset)
+    return dataset
+
+
+def _publish_derived(dataset: Dataset, snapshot_path: str | None = None):
+    """发布该版本的统计，再建立搜索和分面索引；snapshot_path 不为空时统计同时写入磁盘快照
+
+    2 万篇文章时全量计算统计约 7 秒、建立搜索索引约 4 秒，不放在请求中执行。
+    统计写入缓存和磁盘快照后，其他 worker 和冷启动直接加载；
+    事件推送发布的版本没有写入统计，下次定时同步（版本未变）时在这里补写。
+    """
+    cache = current_app.cache
+    version = dataset.version
+    if not cache.has(_stats_key(version)):
+        data = dataset.stats.encode()
+        current = cache.get(SNAPSHOT_KEY)
+        # 期间已发布新版本时不再写入缓存，避免留下无人删除的键
+        if current and version in _chain(current):
+            cache.set(_stats_key(version), data, timeout=0)
+        if snapshot_path:
+            save_snapshot_stats(version, data, snapshot_path)
+    dataset.search_index
+    dataset.facet_index
+
+
+def _background_publish_derived(app, dataset: Dataset, snapshot_path: str | None):
+    with app.app_context():
+        try:
+            _publish_derived(dataset, snapshot_path)
+        except Exception as e:
+            current_app.logger.warning(f"Failed to publish stats: {str(e)}")
+
+
+def _trigger_publish_derived(dataset: Dataset):
+    """在后台线程中构建统计和索引，请求不等待"""
+    global _derive_thread
+    app = current_app._get_current_object()
+    snapshot_path = Config.SNAPSHOT_PATH if Config.SNAPSHOT_ENABLED else None
+    _derive_thread = threading.Thread(
+        target=_background_publish_derived, args=(app, dataset, snapshot_path), daemon=True
+    )
+    _derive_thread.start()
+
+
+def _publish_changes(changes: RecordChanges, snapshot: dict, dataset: Dataset) -> Dataset:
+    """发布事件推送的局部变更：数据集、索引和统计只更新变更的记录，缓存和磁盘快照也只写入变更的记录
+
+    新版本追加到版本链上，其他 worker 已有链上的版本时同样只应用变更；
+    版本链超过 CACHE_CHANGES_CHAIN_MAX 时整体写入一次。
+    同步时间和游标不变，不影响定时增量同步的节奏。
+    """
+    global _dataset
+    updated_at = time.time()
+    new = dataset.patched(
+        changes.version,
+        [Article.from_cache_dict(data) for data in changes.upserted],
+        changes.deleted,
+        updated_at,
+    )
+    meta = {k: v for k, v in snapshot.items() if k not in ("articles", "stats", "chain")}
+    meta.update(version=changes.version, updated_at=updated_at)
+    chain = _chain(snapshot) + [changes.version]
+
+    if len(chain) > Config.CACHE_CHANGES_CHAIN_MAX:
+        full = {**meta, "articles": [article.to_cache_dict() for article in new.articles]}
+        with _dataset_lock:
+            _store_snapshot(full)
+            _dataset = new
+        if Config.SNAPSHOT_ENABLED:
+            _persist_snapshot(full, None)
+        _trigger_publish_derived(new)
+    else:
+        cache = current_app.cache
+        with _dataset_lock:
+            cache.set(
+                _articles_key(changes.version),
+                encode_changes(snapshot["version"], changes.upserted, changes.deleted),
+                timeout=0,
+            )
+            cache.set(SNAPSHOT_KEY, {**meta, "chain": chain}, timeout=0)
+            _dataset = new
+        if Config.SNAPSHOT_ENABLED:
+            _persist_changes(meta, snapshot["version"], changes, new)
+    return new
+
+
+def _persist_changes(snapshot: dict, base: str, changes: RecordChanges, dataset: Dataset):
+    """磁盘快照只改动变更的记录；快照文件不是上一版本时整体写入
+
+    统计不随事件写入（每次编码约 0.2 秒），下次定时同步时补写（见 _publish_derived）。
+    """
+    try:
+        patch_snapshot(snapshot, base, changes.upserted, changes.deleted)
+    except Exception:
+        full = {**snapshot, "articles": [article.to_cache_dict() for article in dataset.articles]}
+        _persist_snapshot(full, None)
+
+
+def _background_refresh(app, snapshot: dict):
+    with app.app_context():
+        try:
+            _sync(snapshot)
+        except Exception as e:
+            current_app.logger.error(f"Background refresh failed: {str(e)}")
+        finally:
+            _release_refresh(app.cache)
+
+
+def _trigger_background_refresh(snapshot: dict):
+    """在后台线程中刷新，已有刷新在进行时直接返回"""
+    if not _acquire_refresh(current_app.cache):
+        return
+    app = current_app._get_current_object()
+    threading.Thread(
+        target=_background_refresh, args=(app, snapshot), daemon=True
+    ).start()
+
+
+def _blocking_refresh(snapshot: dict | None) -> Dataset:
+    """同步刷新；其他 worker 正在刷新时等待其结果，而不是重复拉取"""
+    cache = current_app.cache
+
+    while True:
+        if _acquire_refresh(cache):
+            try:
+                # 拿到刷新权后再确认一次，可能刚刚有人刷新完
+                latest = _get_snapshot()
+                if _snapshot_age(latest) < Config.CACHE_DEFAULT_TIMEOUT:
+                    return _from_snapshot(latest)
+
+                return _sync(latest or snapshot)
+
+            except Exception as e:
+                current_app.logger.error(f"Failed to fetch articles: {str(e)}")
+                snapshot = _get_snapshot() or snapshot
+                if snapshot:
+                    return _from_snapshot(snapshot)
+                return Dataset(None, [])
+
+            finally:
+                _release_refresh(cache)
+
+        # 刷新进行中：未硬过期的旧快照直接返回
+        if _snapshot_age(snapshot) < Config.CACHE_HARD_TIMEOUT:
+            return _from_snapshot(snapshot)
+
+        # 否则等待新快照写入（刷新锁超时后会重新竞争刷新权）
+        time.sleep(0.1)
+        latest = _get_snapshot()
+        if latest and (not snapshot or latest["synced_at"] != snapshot["synced_at"]):
+            return _from_snapshot(latest)
+
+
+def _restore_snapshot() -> dict | None:
+    """从磁盘快照恢复：立即可用，过期的话同时在后台增量同步"""
+    with _restore_lock:
+        snapshot = _get_snapshot()
+        if snapshot:
+            return snapshot
+
+        snapshot = load_snapshot()
+        if not snapshot:
+            return None
+
+        # 磁盘快照最多视为刚刚软过期：后台同步完成前始终直接返回，不会因硬过期而阻塞
+        snapshot["synced_at"] = max(
+            snapshot["synced_at"], time.time() - Config.CACHE_DEFAULT_TIMEOUT - 1
+        )
+        _store_snapshot(snapshot)
+
+    if _snapshot_age(snapshot) >= Config.CACHE_DEFAULT_TIMEOUT:
+        _trigger_background_refresh(snapshot)
+    return snapshot
+
+
+def warm_start():
+    """加载磁盘快照并构建数据集，每个进程只执行一次
+
+    在进程的首个请求时调用而不是导入时：gunicorn --preload 在导入后才 fork worker，
+    导入阶段启动的后台同步线程不会复制到子进程，它持有的刷新锁在子进程中永远不会释放。
+    """
+    global _warm_pid
+    if _warm_pid == os.getpid():
+        return
+    with _restore_lock:
+        if _warm_pid == os.getpid():
+            return
+        _warm_pid = os.getpid()
+    if not Config.SNAPSHOT_ENABLED:
+        return
+    try:
+        snapshot = _restore_snapshot()
+        if snapshot:
+            _from_snapshot(snapshot)
+    except Exception as e:
+        current_app.logger.warning(f"Failed to restore snapshot: {str(e)}")
+
+
+def apply_record_changes(changed: list[str], deleted: list[str]) -> bool:
+    """事件推送：只拉取变更的记录并发布新版本，返回是否已应用
+
+    与定时同步共用刷新锁；等待超时则放弃，由下次增量同步补上。
+    """
+    cache = current_app.cache
+    deadline = time.time() + Config.FEISHU_EVENT_LOCK_WAIT
+    while not _acquire_refresh(cache):
+        if time.time() >= deadline:
+            return False
+        time.sleep(0.05)
+
+    try:
+        snapshot = _get_snapshot()
+        if snapshot is None and Config.SNAPSHOT_ENABLED:
+            snapshot = _restore_snapshot()
+        if not snapshot:
+            # 还没有数据，首次请求时会全量同步
+            return False
+        dataset = _from_snapshot(snapshot)
+        if dataset.version != snapshot["version"]:
+            return False
+
+        def existing(record_id: str) -> dict | None:
+            article = dataset.get(record_id)
+            return article.to_cache_dict() if article is not None else None
+
+        changes = SyncEngine().fetch_record_changes(dataset.version, existing, changed, deleted)
+        if changes.changed:
+            _publish_changes(changes, snapshot, dataset)
+        return True
+    finally:
+        _release_refresh(cache)
+
+
+def get_dataset() -> Dataset:
+    """获取当前文章数据集（带缓存）
+
+    快照长期保存在缓存中：未超过软过期时间（CACHE_DEFAULT_TIMEOUT）直接返回；
+    超过后在 background 模式下先返回旧快照，由一个 worker 在后台增量同步；
+    超过硬过期时间（CACHE_HARD_TIMEOUT）或 blocking 模式下，等待同步完成。
+    缓存为空时先尝试从磁盘快照恢复。
+    """
+    snapshot = _get_snapshot()
+    if snapshot is None and Config.SNAPSHOT_ENABLED:
+        snapshot = _restore_snapshot()
+    age = _snapshot_age(snapshot)
+
+    if age < Config.CACHE_DEFAULT_TIMEOUT:
+        return _from_snapshot(snapshot)
+
+    if Config.CACHE_REFRESH_MODE == "background" and age < Config.CACHE_HARD_TIMEOUT:
+        _trigger_background_refresh(snapshot)
+        return _from_snapshot(snapshot)
+
+    return _blocking_refresh(snapshot)
+
+
+def get_all_articles() -> list[Article]:
+    """获取所有文章（带缓存）"""
+    return list(get_dataset().articles)
+
+
+def get_search_index() -> SearchIndex:
+    """获取当前数据集版本对应的搜索索引"""
+    return get_dataset().search_index
+
+
+def get_article(article_id: str) -> Article | None:
+    """获取单篇文章"""
+    return get_dataset().get(article_id)
 
 
 def clear_articles_cache():
-    """清除文章缓存"""
+    """清除文章缓存（共享缓存后端下对所有 worker 生效）"""
     cache = current_app.cache
-    cache.delete("all_articles")
+    snapshot = cache.get(SNAPSHOT_KEY)
+    if snapshot:
+        for version in _chain(snapshot):
+            cache.delete(_articles_key(version))
+            cache.delete(_stats_key(version))
+    cache.delete(SNAPSHOT_KEY)
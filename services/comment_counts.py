@@ -0,0 +1,58 @@
+import threading
+import time
+from collections import OrderedDict
+from models.comment import Comment
+from config import Config
+
+
+class CommentCountCache:
+    """文章评论数的进程内缓存
+
+    未命中的文章合并成一次 GROUP BY 查询；本进程新增评论时立即失效对应文章，
+    其他 worker 写入的评论最多延迟 COMMENT_COUNT_TTL 秒可见。
+    文章 ID 来自请求参数，按 LRU 最多保留 maxsize 条，避免被任意 ID 撑大。
+    """
+
+    def __init__(self, ttl: int = 60, maxsize: int = 10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._counts: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, article_ids: list[str]) -> dict[str, int]:
+        """获取多篇文章的评论数"""
+        now = time.time()
+        counts = {}
+        missing = []
+        with self._lock:
+            for article_id in dict.fromkeys(article_ids):
+                cached = self._counts.get(article_id)
+                if cached and now - cached[1] < self.ttl:
+                    self._counts.move_to_end(article_id)
+                    counts[article_id] = cached[0]
+                else:
+                    missing.append(article_id)
+
+        if missing:
+            fetched = Comment.count_by_articles(missing)
+            with self._lock:
+                for article_id, count in fetched.items():
+                    self._counts[article_id] = (count, now)
+                    self._counts.move_to_end(article_id)
+                while len(self._counts) > self.maxsize:
+                    self._counts.popitem(last=False)
+            counts.update(fetched)
+
+        return counts
+
+    def invalidate(self, article_id: str):
+        """文章有新评论时失效"""
+        with self._lock:
+            self._counts.pop(article_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+
+
+comment_counts = CommentCountCache(Config.COMMENT_COUNT_TTL, Config.COMMENT_COUNT_CACHE_SIZE)
@@ -0,0 +1,345 @@
+import base64
+import json
+import threading
+from bisect import bisect_left, bisect_right
+from models.article import Article, normalize_date
+from services.search_index import SearchIndex
+from services.facets import FacetIndex
+from services.stats import DashboardStats
+from services.article_store import ArticleStore
+from config import Config
+
+
+# 排序键：(归一化日期, 记录 ID)
+SortKey = tuple[str, str]
+
+# 局部更新留下的空位（已删除文章的位置）超过这一比例时整体重建
+COMPACT_RATIO = 0.25
+
+
+def sort_key(article: Article) -> SortKey:
+    return normalize_date(article.date), article.id
+
+
+def encode_cursor(key: SortKey | None) -> str | None:
+    """分页游标编码为 URL 安全的字符串"""
+    if key is None:
+        return None
+    raw = json.dumps(list(key), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> SortKey | None:
+    """解析分页游标，格式不正确时抛出 ValueError"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        date, article_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    return str(date), str(article_id)
+
+
+class _Timeline:
+    """按 (日期, ID) 升序排列的文章序列，用于游标分页"""
+
+    def __init__(self, articles: list[Article]):
+        self.keys: list[SortKey] = [sort_key(article) for article in articles]
+        self.articles: tuple[Article, ...] = tuple(articles)
+
+    def patched(self, changes) -> "_Timeline":
+        """按 [(旧文章或 None, 新文章或 None)] 依次移除、插入，得到新的时间线"""
+        keys, articles = list(self.keys), list(self.articles)
+        for old, new in changes:
+            if old is not None:
+                index = bisect_left(keys, sort_key(old))
+                if index < len(keys) and keys[index] == sort_key(old):
+                    del keys[index], articles[index]
+            if new is not None:
+                key = sort_key(new)
+                index = bisect_left(keys, key)
+                keys.insert(index, key)
+                articles.insert(index, new)
+        timeline = _Timeline([])
+        timeline.keys, timeline.articles = keys, tuple(articles)
+        return timeline
+
+    def page(
+        self,
+        cursor: SortKey | None = None,
+        limit: int = 20,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ) -> tuple[list[Article], SortKey | None]:
+        """按日期降序取一页，返回本页文章和下一页游标"""
+        low = bisect_left(self.keys, (date_from, "")) if date_from else 0
+        high = len(self.keys)
+        if date_to:
+            high = bisect_right(self.keys, (date_to, "\uffff"))
+        if cursor:
+            high = min(high, bisect_left(self.keys, tuple(cursor)))
+
+        start = max(low, high - limit)
+        next_cursor = self.keys[start] if start > low else None
+        return list(reversed(self.articles[start:high])), next_cursor
+
+
+def _regroup(groups: dict, key, changes, positions: dict[str, int]) -> dict:
+    """按变更更新分组索引：只改动涉及的组，组内保持文章位置顺序"""
+    groups = dict(groups)
+    # 先移除旧文章，插入时组内只剩位置有效的文章
+    for _, old, _ in changes:
+        if old is not None:
+            group = key(old)
+            members = tuple(article for article in groups[group] if article is not old)
+            if members:
+                groups[group] = members
+            else:
+                del groups[group]
+    for position, _, new in changes:
+        if new is not None:
+            group = key(new)
+            members = list(groups.get(group, ()))
+            members.insert(bisect_left(members, position, key=lambda article: positions[article.id]), new)
+            groups[group] = tuple(members)
+    return groups
+
+
+class Dataset:
+    """某一版本的文章数据集
+
+    保存已经分析过的不可变 Article 对象，同一进程内按版本共享，
+    缓存命中时不再重复构造对象和分析内容。派生的索引按需构建，每个版本只构建一次。
+    """
+
+    def __init__(self, version: str | None, articles: list[Article], updated_at: float | None = None):
+        self.version = version
+        self.updated_at = updated_at  # 版本最后一次变化的时间（Unix 时间戳）
+        self.articles: tuple[Article, ...] = tuple(articles)
+        self._search_index: SearchIndex | None = None
+        self._facet_index: FacetIndex | None = None
+        self._stats: DashboardStats | None = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()  # 统计在后台计算时不阻塞索引的构建
+
+        # 主键索引和二级索引（按来源、按归一化日期），每个版本构建一次
+        self._by_id: dict[str, Article] = {}
+        by_source: dict[str, list[Article]] = {}
+        by_date: dict[str, list[Article]] = {}
+        for article in self.articles:
+            self._by_id[article.id] = article
+            by_source.setdefault(article.source, []).append(article)
+            by_date.setdefault(normalize_date(article.date), []).append(article)
+        self._by_source = {key: tuple(value) for key, value in by_source.items()}
+        self._by_date = {key: tuple(value) for key, value in by_date.items()}
+
+        # 按 (日期, ID) 排序的时间线，整体一条，每个来源各一条
+        ordered = sorted(self.articles, key=sort_key)
+        self._timeline = _Timeline(ordered)
+        # 搜索索引和分面位图使用的文章位置；局部更新后删除的位置为 None
+        self._slots: tuple[Article | None, ...] = self.articles
+        self._slot_positions: dict[str, int] | None = None
+        source_ordered: dict[str, list[Article]] = {}
+        for article in ordered:
+            source_ordered.setdefault(article.source, []).append(article)
+        self._source_timelines = {
+            source: _Timeline(articles) for source, articles in source_ordered.items()
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict) -> "Dataset":
+        """从缓存快照恢复（分析结果随快照保存）
+
+        COLUMNAR_STORE 开启时文章保存在列式存储中，数据集持有的是轻量视图对象。
+        快照带有同一版本的统计（DashboardStats.encode）时直接加载，不再全量计算。
+        """
+        if Config.COLUMNAR_STORE:
+            articles = ArticleStore.from_cache_dicts(snapshot["articles"]).views
+        else:
+            articles = [Article.from_cache_dict(data) for data in snapshot["articles"]]
+        dataset = cls(
+            snapshot["version"],
+            articles,
+            updated_at=snapshot.get("updated_at", snapshot.get("synced_at")),
+        )
+        if snapshot.get("stats"):
+            try:
+                dataset._stats = DashboardStats.decode(snapshot["stats"])
+            except (ValueError, KeyError, TypeError):
+                pass
+        return dataset
+
+    def patched(
+        self,
+        version: str,
+        upserted: list[Article],
+        deleted: list[str],
+        updated_at: float | None = None,
+    ) -> "Dataset":
+        """应用局部变更（事件推送）得到新版本的数据集，当前数据集不变
+
+        修改的文章保留原位置，新增的追加在末尾，删除的位置留空，其他文章的位置都不变：
+        已构建的搜索索引、分面索引和统计只更新变更的文章，主键、来源、日期索引和时间线
+        也只改动涉及的部分，耗时与变更数成正比。空位超过 COMPACT_RATIO 时整体重建。
+        """
+        deleted = dict.fromkeys(deleted)
+        upserted = {article.id: article for article in upserted if article.id not in deleted}
+        slots = list(self._slots)
+        positions = dict(self._positions())
+        changes = []  # [(位置, 旧文章或 None, 新文章或 None)]，每个记录 ID 最多一项
+        for article in upserted.values():
+            position = positions.get(article.id)
+            if position is None:
+                position = positions[article.id] = len(slots)
+                slots.append(None)
+            changes.append((position, slots[position], article))
+            slots[position] = article
+        for record_id in deleted:
+            position = positions.pop(record_id, None)
+            if position is not None:
+                changes.append((position, slots[position], None))
+                slots[position] = None
+        touched = [(new or old).id for _, old, new in changes]
+
+        live = [article for article in slots if article is not None]
+        if len(slots) - len(live) > len(slots) * COMPACT_RATIO:
+            dataset = Dataset(version, live, updated_at)
+            dataset.derive_stats(self, touched, [])
+            return dataset
+
+        dataset = Dataset.__new__(Dataset)
+        dataset.version = version
+        dataset.updated_at = updated_at
+        dataset.articles = tuple(live)
+        dataset._slots = tuple(slots)
+        dataset._slot_positions = positions
+        dataset._stats = None
+        dataset._lock = threading.Lock()
+        dataset._stats_lock = threading.Lock()
+        dataset._search_index = dataset._facet_index = None
+        if self._search_index is not None:
+            dataset._search_index = self._search_index.patched(slots, changes, version)
+        if self._facet_index is not None:
+            dataset._facet_index = self._facet_index.patched(slots, changes, version)
+
+        dataset._by_id = dict(self._by_id)
+        for _, old, new in changes:
+            if old is not None:
+                del dataset._by_id[old.id]
+            if new is not None:
+                dataset._by_id[new.id] = new
+        dataset._by_source = _regroup(self._by_source, lambda article: article.source, changes, positions)
+        dataset._by_date = _regroup(self._by_date, lambda article: normalize_date(article.date), changes, positions)
+
+        dataset._timeline = self._timeline.patched([(old, new) for _, old, new in changes])
+        source_changes: dict[str, list] = {}
+        for _, old, new in changes:
+            if old is not None and new is not None and old.source == new.source:
+                source_changes.setdefault(new.source, []).append((old, new))
+                continue
+            if old is not None:
+                source_changes.setdefault(old.source, []).append((old, None))
+            if new is not None:
+                source_changes.setdefault(new.source, []).append((None, new))
+        dataset._source_timelines = dict(self._source_timelines)
+        for source, pairs in source_changes.items():
+            timeline = self._source_timelines.get(source, _Timeline([])).patched(pairs)
+            if timeline.articles:
+                dataset._source_timelines[source] = timeline
+            else:
+                dataset._source_timelines.pop(source, None)
+
+        dataset.derive_stats(self, touched, [])
+        return dataset
+
+    def _positions(self) -> dict[str, int]:
+        """记录 ID -> 位置，第一次局部更新时构建，之后随 patched 传递"""
+        if self._slot_positions is None:
+            self._slot_positions = {
+                article.id: position for position, article in enumerate(self._slots) if article is not None
+            }
+        return self._slot_positions
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def get(self, article_id: str) -> Article | None:
+        """按记录 ID 查找文章"""
+        return self._by_id.get(article_id)
+
+    def by_source(self, source: str) -> tuple[Article, ...]:
+        """按信息来源查找文章"""
+        return self._by_source.get(source, ())
+
+    def by_date(self, date: str) -> tuple[Article, ...]:
+        """按日期（YYYY-MM-DD，或可归一化的日期字符串）查找文章"""
+        return self._by_date.get(normalize_date(date), ())
+
+    def page(
+        self,
+        cursor: SortKey | None = None,
+        limit: int = 20,
+        source: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ) -> tuple[list[Article], SortKey | None]:
+        """按日期降序分页（键集分页，游标为上一页最后一篇的 (日期, ID)）"""
+        if source:
+            timeline = self._source_timelines.get(source)
+            if timeline is None:
+                return [], None
+        else:
+            timeline = self._timeline
+
+        return timeline.page(
+            cursor,
+            limit,
+            normalize_date(date_from) if date_from else None,
+            normalize_date(date_to) if date_to else None,
+        )
+
+    @property
+    def sources(self) -> list[str]:
+        return list(self._by_source)
+
+    @property
+    def dates(self) -> list[str]:
+        """所有归一化日期（降序）"""
+        return sorted((date for date in self._by_date if date), reverse=True)
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """搜索倒排索引"""
+        if self._search_index is None:
+            with self._lock:
+                if self._search_index is None:
+                    self._search_index = SearchIndex(self._slots, self.version)
+        return self._search_index
+
+    @property
+    def facet_index(self) -> FacetIndex:
+        """分面位图索引（与搜索索引使用相同的文章位置）"""
+        if self._facet_index is None:
+            with self._lock:
+                if self._facet_index is None:
+                    self._facet_index = FacetIndex(self._slots, self.version)
+        return self._facet_index
+
+    @property
+    def stats(self) -> DashboardStats:
+        """仪表盘聚合统计；没有从上一版本增量得到时才全量计算"""
+        if self._stats is None:
+            with self._stats_lock:
+                if self._stats is None:
+                    self._stats = DashboardStats(self.articles)
+        return self._stats
+
+    def derive_stats(self, previous: "Dataset", upserted: list[str], deleted: list[str]):
+        """由上一版本的统计加上同步变更得到本版本的统计"""
+        if self._stats is not None or previous._stats is None:
+            return
+        stats = previous._stats.apply_changes(previous._by_id, self._by_id, upserted, deleted)
+        with self._stats_lock:
+            if self._stats is None:
+                self._stats = stats
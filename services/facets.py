@@ -0,0 +1,158 @@
+from bisect import bisect_left, bisect_right
+from models.article import Article, normalize_date
+
+
+# 支持筛选和计数的分面字段
+FACET_FIELDS = ("scam_type", "location", "source")
+
+
+def bitmap_from_positions(positions) -> int:
+    """文章位置列表转为位图（第 i 位表示第 i 篇文章）"""
+    bitmap = 0
+    for position in positions:
+        bitmap |= 1 << position
+    return bitmap
+
+
+def iter_positions(bitmap: int):
+    """按位置升序遍历位图中的文章"""
+    while bitmap:
+        low = bitmap & -bitmap
+        yield low.bit_length() - 1
+        bitmap ^= low
+
+
+class FacetIndex:
+    """分面位图索引
+
+    数据集版本变化时构建一次：每个分面取值对应一个整数位图，
+    多个条件组合只是位图的与/或运算，计数用 bit_count，不再逐篇扫描。
+    日期按升序保存前缀位图，任意日期区间 = 两个前缀位图之差。
+    列表中为 None 的位置是已删除的文章（见 Dataset.patched），不在任何位图中。
+    """
+
+    def __init__(self, articles: list[Article | None], version: str | None = None):
+        self.version = version
+        self._articles = tuple(articles)
+        self.all = (1 << len(self._articles)) - 1
+        self._facets: dict[str, dict[str, int]] = {name: {} for name in FACET_FIELDS}
+
+        by_date: dict[str, int] = {}
+        for position, article in enumerate(self._articles):
+            bit = 1 << position
+            if article is None:
+                self.all &= ~bit
+                continue
+            for name in FACET_FIELDS:
+                value = getattr(article, name) or ""
+                values = self._facets[name]
+                values[value] = values.get(value, 0) | bit
+            date = normalize_date(article.date)
+            if date:
+                by_date[date] = by_date.get(date, 0) | bit
+
+        # _date_prefix[i] 为前 i 个日期的并集
+        self._dates = sorted(by_date)
+        self._date_prefix = [0]
+        for date in self._dates:
+            self._date_prefix.append(self._date_prefix[-1] | by_date[date])
+
+    def patched(self, articles: list[Article | None], changes, version: str | None = None) -> "FacetIndex":
+        """应用局部变更得到新索引，当前索引不变
+
+        articles 为新的文章位置列表，changes 为 [(位置, 旧文章或 None, 新文章或 None)]。
+        只改动涉及的取值位图，以及变更日期之后的前缀位图。
+        """
+        index = FacetIndex.__new__(FacetIndex)
+        index.version = version
+        index._articles = tuple(articles)
+        index._facets = {name: dict(values) for name, values in self._facets.items()}
+        index._dates = list(self._dates)
+        index._date_prefix = list(self._date_prefix)
+        bitmap = self.all
+
+        for position, old, new in changes:
+            bit = 1 << position
+            if old is not None:
+                bitmap &= ~bit
+                for name in FACET_FIELDS:
+                    values = index._facets[name]
+                    value = getattr(old, name) or ""
+                    values[value] &= ~bit
+                    if not values[value]:
+                        del values[value]
+                index._update_dates(normalize_date(old.date), bit, add=False)
+            if new is not None:
+                bitmap |= bit
+                for name in FACET_FIELDS:
+                    values = index._facets[name]
+                    value = getattr(new, name) or ""
+                    values[value] = values.get(value, 0) | bit
+                index._update_dates(normalize_date(new.date), bit, add=True)
+
+        index.all = bitmap
+        return index
+
+    def _update_dates(self, date: str, bit: int, add: bool):
+        """在该日期及之后的所有前缀位图中加入或移除一篇文章"""
+        if not date:
+            return
+        position = bisect_left(self._dates, date)
+        if position == len(self._dates) or self._dates[position] != date:
+            if not add:
+                return
+            # 新日期：插入一个与前一个前缀相同的前缀位图
+            self._dates.insert(position, date)
+            self._date_prefix.insert(position + 1, self._date_prefix[position])
+        prefix = self._date_prefix
+        for i in range(position + 1, len(prefix)):
+            prefix[i] = prefix[i] | bit if add else prefix[i] & ~bit
+
+    def __len__(self) -> int:
+        return len(self._articles)
+
+    def date_range(self, date_from: str | None = None, date_to: str | None = None) -> int:
+        """日期在 [date_from, date_to] 之间的文章位图（闭区间，可只给一端）"""
+        low = bisect_left(self._dates, normalize_date(date_from)) if date_from else 0
+        high = bisect_right(self._dates, normalize_date(date_to)) if date_to else len(self._dates)
+        if high <= low:
+            return 0
+        return self._date_prefix[high] & ~self._date_prefix[low]
+
+    def filter(
+        self,
+        bitmap: int | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        **facets: list[str] | None,
+    ) -> int:
+        """按分面取值筛选：同一分面内多个取值为或，不同分面之间为与"""
+        result = self.all if bitmap is None else bitmap
+        for name, values in facets.items():
+            if name not in self._facets:
+                raise ValueError(f"Unknown facet: {name}")
+            if not values:
+                continue
+            selected = 0
+            for value in values:
+                selected |= self._facets[name].get(value, 0)
+            result &= selected
+        if date_from or date_to:
+            result &= self.date_range(date_from, date_to)
+        return result
+
+    def counts(self, bitmap: int) -> dict[str, dict[str, int]]:
+        """结果集中各分面取值的文章数（按数量降序，不含 0）"""
+        counts = {}
+        for name, values in self._facets.items():
+            facet_counts = {}
+            for value, value_bitmap in values.items():
+                count = (bitmap & value_bitmap).bit_count()
+                if count and value:
+                    facet_counts[value] = count
+            counts[name] = dict(sorted(facet_counts.items(), key=lambda item: -item[1]))
+        return counts
+
+    def articles(self, bitmap: int) -> list[Article]:
+        """位图中的文章，保持原有顺序"""
+        return [self._articles[position] for position in iter_positions(bitmap)]
@@ -1,9 +1,46 @@
+import json
+import random
+import threading
 import time
 import requests
-from typing import Optional, List
+from requests.adapters import HTTPAdapter
+from typing import Iterator, Optional, List
+from services.token_manager import get_token_manager
 from config import Config
 
 
+# 需要重试的 HTTP 状态码：限流和服务端临时错误
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# token 无效或已过期的业务错误码，收到后丢弃 token 重新获取
+TOKEN_INVALID_CODES = {99991663, 99991668}
+
+# 记录不存在（已被删除）的业务错误码
+RECORD_NOT_FOUND_CODE = 1254043
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """获取进程内共享的 HTTP 会话（连接池 + keep-alive + gzip）"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=Config.FEISHU_POOL_CONNECTIONS,
+                    pool_maxsize=Config.FEISHU_POOL_SIZE,
+                    max_retries=0,  # 重试由 FeishuClient._request 负责
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({"Accept-Encoding": "gzip, deflate"})
+                _session = session
+    return _session
+
+
 class FeishuClient:
     """飞书 API 客户端"""
 
@@ -13,15 +50,83 @@ class FeishuClient:
         self.base_url = Config.FEISHU_BASE_URL
         self.base_id = Config.BASE_ID
         self.table_id = Config.TABLE_ID
+        self.session = get_session()
+        self.max_retries = Config.FEISHU_MAX_RETRIES
         self._tenant_access_token: Optional[str] = None
         self._token_expires_at: float = 0
 
+    def _backoff(self, attempt: int) -> float:
+        """带随机抖动的指数退避时间（full jitter）"""
+        return random.uniform(0, min(Config.FEISHU_BACKOFF_MAX, Config.FEISHU_BACKOFF_BASE * 2 ** attempt))
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """解析 Retry-After 响应头（秒）"""
+        value = response.headers.get("Retry-After")
+        try:
+            return min(float(value), Config.FEISHU_BACKOFF_MAX) if value else None
+        except ValueError:
+            return None
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """发送请求；连接错误、超时、429 和 5xx 按指数退避重试
+
+        只用于幂等请求（获取 token、读取和查询记录）。
+        """
+        kwargs.setdefault("timeout", Config.FEISHU_TIMEOUT)
+
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    return response
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+
+            time.sleep(delay)
+            attempt += 1
+
     def _get_tenant_access_token(self) -> str:
-        """获取 tenant_access_token"""
-        # 检查 token 是否有效
-        if self._tenant_access_token and time.time() < self._token_expires_at:
-            return self._tenant_access_token
+        """获取 tenant_access_token（进程内共享，过期前自动刷新）"""
+        manager = get_token_manager(self.app_id)
+        self._tenant_access_token, self._token_expires_at = manager.get_token(
+            self._request_tenant_access_token
+        )
+        return self._tenant_access_token
+
+    @staticmethod
+    def _token_rejected(response: requests.Response) -> bool:
+        """响应是否表示 token 被拒绝（401 或 token 无效的错误码）"""
+        if response.status_code == 401:
+            return True
+        try:
+            return response.json().get("code") in TOKEN_INVALID_CODES
+        except ValueError:
+            return False
 
+    def _authorized_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """带 tenant_access_token 发送请求
+
+        token 在有效期内被提前作废（如应用密钥重置、其他实例刷新）时，丢弃该 token 并重新获取后重试一次。
+        """
+        headers = kwargs.pop("headers", {})
+        for attempt in range(2):
+            token = self._get_tenant_access_token()
+            response = self._request(method, url, headers={**headers, "Authorization": f"Bearer {token}"}, **kwargs)
+            if attempt or not self._token_rejected(response):
+                return response
+            get_token_manager(self.app_id).invalidate(token)
+        return response
+
+    def _request_tenant_access_token(self) -> tuple[str, int]:
+        """请求新的 tenant_access_token，返回 (token, 有效秒数)"""
         url = f"{self.base_url}/open-apis/auth/v3/tenant_access_token/internal"
         payload = {
             "app_id": self.app_id,
@@ -29,18 +134,15 @@ class FeishuClient:
         }
 
         try:
-            response = requests.post(url, json=payload, timeout=10)
+            response = self._request("POST", url, json=payload)
             response.raise_for_status()
             data = response.json()
 
             if data.get("code") != 0:
                 raise Exception(f"Failed to get token: {data.get('msg')}")
 
-            self._tenant_access_token = data.get("tenant_access_token")
             expire = data.get("expire", 7200)  # 默认2小时
-            self._token_expires_at = time.time() + expire - 60  # 提前1分钟过期
-
-            return self._tenant_access_token
+            return data.get("tenant_access_token"), expire
 
         except requests.RequestException as e:
             raise Exception(f"Failed to request token: {str(e)}")
@@ -49,22 +151,24 @@ class FeishuClient:
         self,
         page_size: int = 100,
         page_token: Optional[str] = None,
+        field_names: Optional[List[str]] = None,
+        automatic_fields: bool = False,
     ) -> dict:
-        """获取多维表格记录"""
-        token = self._get_tenant_access_token()
+        """获取多维表格记录，`field_names` 指定只返回的字段，`automatic_fields` 时附带记录的创建和修改时间"""
         url = f"{self.base_url}/open-apis/bitable/v1/apps/{self.base_id}/tables/{self.table_id}/records"
 
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-        }
+        headers = {"Content-Type": "application/json"}
 
         params = {"page_size": page_size}
         if page_token:
             params["page_token"] = page_token
+        if field_names:
+            params["field_names"] = json.dumps(field_names, ensure_ascii=False)
+        if automatic_fields:
+            params["automatic_fields"] = "true"
 
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = self._authorized_request("GET", url, headers=headers, params=params)
             response.raise_for_status()
             data = response.json()
 
@@ -76,33 +180,137 @@ class FeishuClient:
         except requests.RequestException as e:
             raise Exception(f"Failed to fetch records: {str(e)}")
 
-    def get_all_records(self) -> List[dict]:
-        """获取所有记录（自动分页）"""
-        all_records = []
+    def search_records(
+        self,
+        filter: Optional[dict] = None,
+        sort: Optional[List[dict]] = None,
+        page_size: int = Config.FEISHU_PAGE_SIZE,
+        page_token: Optional[str] = None,
+        automatic_fields: bool = False,
+        field_names: Optional[List[str]] = None,
+    ) -> dict:
+        """按条件查询多维表格记录（records/search 接口）"""
+        url = f"{self.base_url}/open-apis/bitable/v1/apps/{self.base_id}/tables/{self.table_id}/records/search"
+
+        headers = {"Content-Type": "application/json"}
+
+        params = {"page_size": page_size}
+        if page_token:
+            params["page_token"] = page_token
+
+        payload = {"automatic_fields": automatic_fields}
+        if filter:
+            payload["filter"] = filter
+        if sort:
+            payload["sort"] = sort
+        if field_names:
+            payload["field_names"] = field_names
+
+        try:
+            response = self._authorized_request("POST", url, headers=headers, params=params, json=payload)
+            response.raise_for_status()
+            data = response.json()
+
+            if data.get("code") != 0:
+                raise Exception(f"Failed to search records: {data.get('msg')}")
+
+            return data.get("data", {})
+
+        except requests.RequestException as e:
+            raise Exception(f"Failed to search records: {str(e)}")
+
+    def get_records_modified_since(
+        self,
+        field_name: str,
+        since_ms: int,
+        field_names: Optional[List[str]] = None,
+    ) -> List[dict]:
+        """获取指定时间之后修改过的记录（自动分页）
+
+        `field_name` 为表格中"最后更新时间"类型的字段。日期条件按天比较，
+        这里从前一天开始筛选，调用方需要按记录的 last_modified_time 自行去重。
+        """
+        since_ms = max(since_ms - 24 * 3600 * 1000, 0)
+        filter = {
+            "conjunction": "and",
+            "conditions": [{
+                "field_name": field_name,
+                "operator": "isGreater",
+                "value": ["ExactDate", str(since_ms)],
+            }],
+        }
+        sort = [{"field_name": field_name, "desc": False}]
+
+        records = []
+        page_token = None
+        while True:
+            data = self.search_records(
+                filter=filter,
+                sort=sort,
+                page_token=page_token,
+                automatic_fields=True,
+                field_names=field_names,
+            )
+            records.extend(data.get("items") or [])
+
+            page_token = data.get("page_token")
+            if not page_token or not data.get("has_more"):
+                break
+
+        return records
+
+    def get_total(self) -> int:
+        """获取表格记录总数"""
+        data = self.get_records(page_size=1, field_names=self._id_only_fields())
+        return data.get("total", 0)
+
+    @staticmethod
+    def _id_only_fields() -> List[str]:
+        """只需要记录 ID 时请求的字段（取一个短字段，避免下载大文本）"""
+        return [Config.FIELD_MAPPING["date"]]
+
+    def iter_records(
+        self,
+        field_names: Optional[List[str]] = None,
+        page_size: int = Config.FEISHU_PAGE_SIZE,
+        automatic_fields: bool = False,
+    ) -> Iterator[dict]:
+        """逐页获取记录并逐条返回，不保留已处理的原始分页"""
         page_token = None
 
         while True:
-            data = self.get_records(page_size=100, page_token=page_token)
-            all_records.extend(data.get("items", []))
+            data = self.get_records(
+                page_size=page_size, page_token=page_token, field_names=field_names, automatic_fields=automatic_fields
+            )
+            yield from data.get("items") or []
 
             page_token = data.get("page_token")
             if not page_token or not data.get("has_more"):
                 break
 
-        return all_records
+    def iter_record_ids(self) -> Iterator[str]:
+        """获取所有记录 ID（只请求一个短字段）"""
+        for record in self.iter_records(field_names=self._id_only_fields()):
+            yield record.get("record_id", "")
+
+    def iter_record_versions(self) -> Iterator[tuple[str, Optional[int]]]:
+        """获取所有记录的 ID 和最后修改时间（记录自带的 last_modified_time，毫秒），只请求一个短字段"""
+        for record in self.iter_records(field_names=self._id_only_fields(), automatic_fields=True):
+            yield record.get("record_id", ""), record.get("last_modified_time")
+
+    def get_all_records(self, field_names: Optional[List[str]] = None) -> List[dict]:
+        """获取所有记录（自动分页）"""
+        return list(self.iter_records(field_names=field_names))
+
+    def _record_url(self, record_id: str) -> str:
+        return f"{self.base_url}/open-apis/bitable/v1/apps/{self.base_id}/tables/{self.table_id}/records/{record_id}"
 
     def get_record(self, record_id: str) -> Optional[dict]:
         """获取单条记录"""
-        token = self._get_tenant_access_token()
-        url = f"{self.base_url}/open-apis/bitable/v1/apps/{self.base_id}/tables/{self.table_id}/records/{record_id}"
-
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-        }
+        headers = {"Content-Type": "application/json"}
 
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self._authorized_request("GET", self._record_url(record_id), headers=headers)
             response.raise_for_status()
             data = response.json()
 
@@ -113,3 +321,15 @@ class FeishuClient:
 
         except requests.RequestException:
             return None
+
+    def record_deleted(self, record_id: str) -> bool:
+        """确认记录已被删除：只有接口明确返回记录不存在时为 True，请求失败或记录仍存在时为 False"""
+        headers = {"Content-Type": "application/json"}
+
+        try:
+            response = self._authorized_request("GET", self._record_url(record_id), headers=headers)
+            data = response.json()
+        except (requests.RequestException, ValueError):
+            return False
+
+        return isinstance(data, dict) and data.get("code") == RECORD_NOT_FOUND_CODE
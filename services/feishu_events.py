@@ -0,0 +1,181 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+import uuid
+
+
+# 多维表格记录变更事件
+RECORD_CHANGED_EVENT = "drive.file.bitable_record_changed_v1"
+
+RECORD_ADDED = "record_added"
+RECORD_EDITED = "record_edited"
+RECORD_DELETED = "record_deleted"
+
+
+class EventError(ValueError):
+    """事件校验失败"""
+
+
+def _cipher(encrypt_key: str, iv: bytes):
+    # 可选依赖：只有配置了 Encrypt Key 时才需要
+    try:
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    except ImportError as e:
+        raise EventError("FEISHU_ENCRYPT_KEY is set but the cryptography package is not installed") from e
+    key = hashlib.sha256(encrypt_key.encode("utf-8")).digest()
+    return Cipher(algorithms.AES(key), modes.CBC(iv))
+
+
+def decrypt(encrypted: str, encrypt_key: str) -> str:
+    """解密事件体：base64(iv + AES-256-CBC(明文))，密钥为 Encrypt Key 的 SHA-256"""
+    try:
+        data = base64.b64decode(encrypted)
+    except ValueError as e:
+        raise EventError("Invalid encrypted payload") from e
+    if len(data) < 32 or len(data) % 16:
+        raise EventError("Invalid encrypted payload")
+    decryptor = _cipher(encrypt_key, data[:16]).decryptor()
+    plain = decryptor.update(data[16:]) + decryptor.finalize()
+    padding = plain[-1]
+    if not 1 <= padding <= 16:
+        raise EventError("Invalid encrypted payload")
+    return plain[:-padding].decode("utf-8")
+
+
+def encrypt(plain: str, encrypt_key: str) -> str:
+    """加密事件体（供模拟器使用，与 decrypt 对应）"""
+    data = plain.encode("utf-8")
+    padding = 16 - len(data) % 16
+    iv = os.urandom(16)
+    encryptor = _cipher(encrypt_key, iv).encryptor()
+    return base64.b64encode(iv + encryptor.update(data + bytes([padding]) * padding) + encryptor.finalize()).decode()
+
+
+def signature(timestamp: str, nonce: str, encrypt_key: str, body: bytes) -> str:
+    """飞书事件签名：sha256(timestamp + nonce + encrypt_key + body)"""
+    content = (timestamp + nonce + encrypt_key).encode("utf-8") + body
+    return hashlib.sha256(content).hexdigest()
+
+
+def parse_event(
+    body: bytes,
+    headers,
+    verification_token: str = "",
+    encrypt_key: str = "",
+    max_age: int = 300,
+) -> dict:
+    """校验并解析事件请求，返回事件 JSON
+
+    Verification Token 和 Encrypt Key 都未配置时一律拒绝。配置了 Encrypt Key 时事件体必须是加密的，
+    并且必须带签名（校验签名和时间戳后再解密）；只有配置请求地址时的 url_verification 请求不带签名，
+    它只回显 challenge，解密成功即可。配置了 Verification Token 时校验 token。
+    """
+    if not verification_token and not encrypt_key:
+        raise EventError("Event subscription is not configured")
+
+    signed = bool(encrypt_key and headers.get("X-Lark-Signature"))
+    if signed:
+        timestamp = headers.get("X-Lark-Request-Timestamp", "")
+        nonce = headers.get("X-Lark-Request-Nonce", "")
+        expected = signature(timestamp, nonce, encrypt_key, body)
+        if not hmac.compare_digest(headers.get("X-Lark-Signature", ""), expected):
+            raise EventError("Invalid signature")
+        if not timestamp.isdigit() or abs(time.time() - int(timestamp)) > max_age:
+            raise EventError("Request expired")
+
+    try:
+        payload = json.loads(body)
+        if encrypt_key:
+            if not isinstance(payload, dict) or not isinstance(payload.get("encrypt"), str):
+                raise EventError("Event body is not encrypted")
+            payload = json.loads(decrypt(payload["encrypt"], encrypt_key))
+    except EventError:
+        raise
+    except ValueError as e:
+        raise EventError(f"Invalid event body: {str(e)}") from e
+    if not isinstance(payload, dict):
+        raise EventError("Invalid event body")
+    if encrypt_key and not signed and payload.get("type") != "url_verification":
+        raise EventError("Missing signature")
+
+    if verification_token:
+        # url_verification 的 token 在顶层，2.0 事件在 header 中
+        token = payload.get("token") or payload.get("header", {}).get("token")
+        if not isinstance(token, str) or not hmac.compare_digest(token, verification_token):
+            raise EventError("Invalid verification token")
+    return payload
+
+
+def record_changes(event: dict, base_id: str | None = None, table_id: str | None = None) -> tuple[list[str], list[str]]:
+    """从记录变更事件中取出 (新增或修改的记录 ID, 删除的记录 ID)，不是本表的事件返回空"""
+    if base_id and event.get("file_token") != base_id:
+        return [], []
+    if table_id and event.get("table_id") != table_id:
+        return [], []
+
+    changed, deleted = [], []
+    for action in event.get("action_list", []):
+        record_id = action.get("record_id")
+        if not record_id:
+            continue
+        if action.get("action") == RECORD_DELETED:
+            deleted.append(record_id)
+        else:
+            changed.append(record_id)
+    return changed, deleted
+
+
+class EventSimulator:
+    """本地事件模拟器：按飞书的格式生成事件请求（含加密和签名），用于测试和本地调试"""
+
+    def __init__(self, base_id: str, table_id: str, verification_token: str = "", encrypt_key: str = ""):
+        self.base_id = base_id
+        self.table_id = table_id
+        self.verification_token = verification_token
+        self.encrypt_key = encrypt_key
+
+    def _request(self, payload: dict) -> tuple[bytes, dict]:
+        body = json.dumps(payload, ensure_ascii=False)
+        headers = {"Content-Type": "application/json"}
+        if self.encrypt_key:
+            body = json.dumps({"encrypt": encrypt(body, self.encrypt_key)})
+            timestamp, nonce = str(int(time.time())), uuid.uuid4().hex
+            headers.update({
+                "X-Lark-Request-Timestamp": timestamp,
+                "X-Lark-Request-Nonce": nonce,
+                "X-Lark-Signature": signature(timestamp, nonce, self.encrypt_key, body.encode("utf-8")),
+            })
+        return body.encode("utf-8"), headers
+
+    def url_verification(self, challenge: str = "challenge") -> tuple[bytes, dict]:
+        """配置请求地址时飞书发送的验证请求"""
+        return self._request({
+            "challenge": challenge,
+            "token": self.verification_token,
+            "type": "url_verification",
+        })
+
+    def record_changed(self, actions: list[tuple[str, str]], event_id: str | None = None) -> tuple[bytes, dict]:
+        """记录变更事件，actions 为 [(记录 ID, record_added/record_edited/record_deleted)]"""
+        return self._request({
+            "schema": "2.0",
+            "header": {
+                "event_id": event_id or uuid.uuid4().hex,
+                "event_type": RECORD_CHANGED_EVENT,
+                "create_time": str(int(time.time() * 1000)),
+                "token": self.verification_token,
+                "app_id": "",
+                "tenant_key": "",
+            },
+            "event": {
+                "file_token": self.base_id,
+                "file_type": "bitable",
+                "table_id": self.table_id,
+                "action_list": [
+                    {"record_id": record_id, "action": action} for record_id, action in actions
+                ],
+            },
+        })
@@ -0,0 +1,150 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from config import Config
+
+
+# 分段关键词
+SECTION_KEYWORDS = ['案情回顾', '案件特点', '诈骗手法', '反诈提醒', '警方提示', '防范建议', '温馨提示', '相关链接']
+
+# 正则在模块加载时编译一次
+_IMAGE = re.compile(r'!\[.*?\]\(.*?\)')
+_LINK = re.compile(r'\[([^\]]+)\]\([^)]+\)')
+_BLANK_LINES = re.compile(r'\n{3,}')
+_SPACES = re.compile(r'[ \t]+')
+_SENTENCE_END = re.compile(r'([。！？])([^\n])')
+_COLON = re.compile(r'([：;；])\s*')
+# 所有分段关键词合并为一个模式；用后行断言判断前一个字符，效果与逐个关键词替换相同
+_SECTION = re.compile(r'(?<=[^\n])(' + '|'.join(map(re.escape, SECTION_KEYWORDS)) + ')')
+_BOLD = re.compile(r'\*\*([^*]+)\*\*')
+_SENTENCE_SPLIT = re.compile(r'([。！？])')
+
+
+def _mark_sections(text: str) -> str:
+    """在分段关键词前插入空行并加粗
+
+    等价于对每个关键词执行 re.sub(r'([^\n])(关键词)', ...)：原写法会吃掉关键词前一个字符，
+    同一关键词紧挨着重复出现时后一个不会被替换，这里按关键词记录上次替换的结束位置来保持一致。
+    """
+    last_end = {}
+
+    def replace(match):
+        keyword = match.group(1)
+        if last_end.get(keyword) == match.start():
+            return keyword
+        last_end[keyword] = match.end()
+        return f'\n\n**{keyword}**'
+
+    return _SECTION.sub(replace, text)
+
+
+def format_article_text(text):
+    """格式化文章内容，添加适当的换行和分段"""
+    if not text:
+        return ""
+
+    # 移除 markdown 语法
+    text = _IMAGE.sub('', text)  # 移除图片
+    text = _LINK.sub(r'\1', text)  # 转换 markdown 链接为纯文本
+
+    # 清理多余的空白字符
+    text = _BLANK_LINES.sub('\n\n', text)  # 多个换行压缩为两个
+    text = _SPACES.sub(' ', text)  # 多个空格压缩为一个
+
+    # 在特定标点后添加换行
+    text = _SENTENCE_END.sub(r'\1\n\2', text)  # 句号后换行
+    text = _COLON.sub(r'\1 ', text)  # 冒号后保留一个空格
+
+    # 分段处理 - 按照关键词分段
+    text = _mark_sections(text)
+
+    # 处理粗体标记
+    text = _BOLD.sub(r'<strong>\1</strong>', text)
+
+    # 将换行转换为段落
+    paragraphs = text.split('\n\n')
+    formatted = []
+    for para in paragraphs:
+        para = para.strip()
+        if para:
+            # 如果段落太长，尝试在适当位置分割
+            if len(para) > 300 and '**' not in para:
+                sentences = _SENTENCE_SPLIT.split(para)
+                current = ''
+                for i in range(0, len(sentences) - 1, 2):
+                    if sentences[i]:
+                        sentence = sentences[i] + (sentences[i + 1] if i + 1 < len(sentences) else '')
+                        if current:
+                            formatted.append(f'<p>{current}</p>')
+                            current = sentence
+                        else:
+                            current = sentence
+                        if len(current) > 200:
+                            formatted.append(f'<p>{current}</p>')
+                            current = ''
+                if current:
+                    formatted.append(f'<p>{current}</p>')
+            else:
+                formatted.append(f'<p>{para}</p>')
+
+    return '\n'.join(formatted)
+
+
+class FormatterCache:
+    """格式化结果的 LRU 缓存
+
+    以 (文章 ID, 原文摘要) 为键：原文改动后摘要随之变化，不会命中旧结果；
+    键里只存 16 字节摘要，不持有原文，缓存占用只取决于格式化结果。
+    列式存储每次访问都会生成新的字符串对象，其哈希值不能复用，因此每次都要计算一遍摘要。
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def format(self, text, article_id=None) -> str:
+        if not text:
+            return ""
+
+        key = (article_id, hashlib.blake2b(text.encode(), digest_size=16).digest())
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return html
+            self.misses += 1
+
+        html = format_article_text(text)
+
+        with self._lock:
+            self._entries[key] = html
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return html
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        """命中统计"""
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+formatter_cache = FormatterCache(Config.FORMATTER_CACHE_SIZE)
+
+
+def format_article(text, article_id=None) -> str:
+    """Jinja 过滤器：带缓存的文章格式化"""
+    return formatter_cache.format(text, article_id)
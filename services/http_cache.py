@@ -0,0 +1,71 @@
+import hashlib
+from datetime import datetime, timezone
+from flask import request, make_response
+from config import Config
+
+
+def make_etag(*parts) -> str:
+    """根据数据版本等参数生成强 ETag"""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:20]
+
+
+def _to_datetime(value) -> datetime | None:
+    """Unix 时间戳或 UTC naive datetime 转为精确到秒的 aware datetime"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        value = datetime.fromtimestamp(value, timezone.utc)
+    elif value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def _cache_control(response, shared_max_age: int | None):
+    """浏览器每次都向源站（或 CDN）验证；CDN 可在 shared_max_age 内直接复用"""
+    if shared_max_age:
+        response.headers["Cache-Control"] = (
+            f"public, max-age=0, s-maxage={shared_max_age}, "
+            f"stale-while-revalidate={Config.HTTP_STALE_WHILE_REVALIDATE}"
+        )
+    else:
+        response.headers["Cache-Control"] = "public, no-cache"
+
+
+def not_modified(etag: str, last_modified=None, shared_max_age: int | None = None):
+    """客户端缓存仍然有效时返回 304 响应，否则返回 None
+
+    If-None-Match 优先于 If-Modified-Since，与 HTTP 规范一致。
+    在渲染之前调用，命中时不需要生成响应体。
+    """
+    last_modified = _to_datetime(last_modified)
+    if request.if_none_match:
+        matched = request.if_none_match.contains(etag)
+    else:
+        since = request.if_modified_since
+        matched = bool(last_modified and since and last_modified <= since)
+    if not matched:
+        return None
+
+    response = make_response("", 304)
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    _cache_control(response, shared_max_age)
+    return response
+
+
+def cacheable(response, etag: str, last_modified=None, shared_max_age: int | None = None):
+    """给成功响应加上 ETag、Last-Modified 和 Cache-Control"""
+    response = make_response(response)
+    if response.status_code != 200:
+        return response
+    response.set_etag(etag)
+    last_modified = _to_datetime(last_modified)
+    if last_modified:
+        response.last_modified = last_modified
+    _cache_control(response, shared_max_age)
+    return response
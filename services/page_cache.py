@@ -0,0 +1,93 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable
+from config import Config
+
+
+class PageCache:
+    """渲染结果（HTML）缓存
+
+    每个进程单独保存在内存中的 LRU 里，不占用缓存后端：SimpleCache 超过 CACHE_THRESHOLD 时
+    会连同文章快照一起淘汰，页面数量多了会把快照挤掉。键包含数据集版本，
+    版本变化时清空旧版本的全部页面；超过条数或字节上限时淘汰最久未用的。
+    """
+
+    def __init__(self, max_entries: int = 500, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._sizes: dict[str, int] = {}  # 键 -> 字节数
+        self._bytes = 0
+        self._version: str | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(version: str, parts: tuple) -> str:
+        digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:16]
+        return f"page:{version}:{digest}"
+
+    def get_or_render(self, version: str | None, parts: tuple, render: Callable[[], str]) -> str:
+        """按 (版本, parts) 取缓存的 HTML，未命中时调用 render 渲染并写入"""
+        if version is None:
+            return render()
+
+        key = self._key(version, parts)
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return html
+            self.misses += 1
+
+        html = render()
+        self._store(version, key, html)
+        return html
+
+    def _store(self, version: str, key: str, html: str):
+        size = len(html.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if version != self._version:
+                # 新版本：旧版本的页面不会再被访问，直接清掉
+                self._entries.clear()
+                self._sizes.clear()
+                self._bytes = 0
+                self._version = version
+
+            self._bytes += size - self._sizes.get(key, 0)
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                old_key, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(old_key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        """命中统计"""
+        return {
+            "size": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+page_cache = PageCache(
+    max_entries=Config.PAGE_CACHE_MAX_ENTRIES,
+    max_bytes=Config.PAGE_CACHE_MAX_BYTES,
+)
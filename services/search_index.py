@@ -0,0 +1,147 @@
+from array import array
+from bisect import bisect_left
+from models.article import Article
+
+
+# 参与搜索的文章字段
+SEARCH_FIELDS = ("title", "summary", "source")
+
+
+def _bigrams(text: str) -> set[str]:
+    """切分相邻两个字符组成的二元组"""
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _field_texts(article: Article) -> list[str]:
+    return [(getattr(article, name) or "").lower() for name in SEARCH_FIELDS]
+
+
+def _terms(article: Article | None) -> tuple[set[str], set[str]]:
+    """文章的单字和二元组；每个字段单独切分，避免跨字段拼出不存在的二元组"""
+    chars, grams = set(), set()
+    if article is not None:
+        for text in _field_texts(article):
+            chars.update(text)
+            grams.update(_bigrams(text))
+    return chars, grams
+
+
+def _update_posting(table: dict, original: dict, term: str, position: int, add: bool):
+    """在倒排表中加入或移除一个位置；第一次修改某个词时复制它的倒排表，不影响原索引"""
+    posting = table.get(term)
+    if posting is None or posting is original.get(term):
+        posting = table[term] = array("I", posting or ())
+    index = bisect_left(posting, position)
+    present = index < len(posting) and posting[index] == position
+    if add and not present:
+        posting.insert(index, position)
+    elif not add and present:
+        del posting[index]
+        if not posting:
+            del table[term]
+
+
+def _matches(article: Article, query: str) -> bool:
+    """字段中是否包含（已小写的）关键词；原文直接命中时省去一次 lower()"""
+    for name in SEARCH_FIELDS:
+        text = getattr(article, name) or ""
+        if query in text or query in text.lower():
+            return True
+    return False
+
+
+class SearchIndex:
+    """文章字符二元组（bigram）倒排索引
+
+    中文文本没有空格分词，按相邻两个字符切分即可覆盖任意长度不小于 2 的子串查询，
+    单字查询走单字倒排表。倒排表是升序的 array('I')（每个位置 4 字节），查询时才转成集合求交。
+    单字和两个字的查询由倒排表直接确定结果；更长的查询再对候选文章的字段做一次子串校验，
+    保证结果与逐篇 `in` 扫描完全一致，且保持原有文章顺序。索引不另存小写文本。
+    列表中为 None 的位置是已删除的文章（见 Dataset.patched），不进入任何倒排表。
+    """
+
+    def __init__(self, articles: list[Article | None], version: str | None = None):
+        self.version = version
+        self._articles = list(articles)
+        unigrams: dict[str, list[int]] = {}
+        bigrams: dict[str, list[int]] = {}
+
+        for position, article in enumerate(self._articles):
+            if article is None:
+                continue
+            chars, grams = _terms(article)
+            for char in chars:
+                unigrams.setdefault(char, []).append(position)
+            for gram in grams:
+                bigrams.setdefault(gram, []).append(position)
+
+        # 位置按升序追加，转换后即为有序数组
+        self._unigrams = {char: array("I", positions) for char, positions in unigrams.items()}
+        self._bigrams = {gram: array("I", positions) for gram, positions in bigrams.items()}
+
+    def patched(self, articles: list[Article | None], changes, version: str | None = None) -> "SearchIndex":
+        """应用局部变更得到新索引，当前索引不变（其他请求可能正在使用）
+
+        articles 为新的文章位置列表，changes 为 [(位置, 旧文章或 None, 新文章或 None)]。
+        只复制词典本身和涉及的倒排表，耗时与变更的文章数成正比。
+        """
+        index = SearchIndex.__new__(SearchIndex)
+        index.version = version
+        index._articles = list(articles)
+        index._unigrams = dict(self._unigrams)
+        index._bigrams = dict(self._bigrams)
+        for position, old, new in changes:
+            old_chars, old_grams = _terms(old)
+            new_chars, new_grams = _terms(new)
+            for table, original, before, after in (
+                (index._unigrams, self._unigrams, old_chars, new_chars),
+                (index._bigrams, self._bigrams, old_grams, new_grams),
+            ):
+                for term in before - after:
+                    _update_posting(table, original, term, position, add=False)
+                for term in after - before:
+                    _update_posting(table, original, term, position, add=True)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._articles)
+
+    def _candidates(self, query: str):
+        """倒排表求交，得到可能命中的文章位置（升序）"""
+        if len(query) == 1:
+            return self._unigrams.get(query, ())
+
+        postings = []
+        for gram in _bigrams(query):
+            posting = self._bigrams.get(gram)
+            if not posting:
+                return ()
+            postings.append(posting)
+
+        # 从最短的倒排表开始求交，尽早收敛
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return ()
+        return sorted(candidates)
+
+    def positions(self, query: str) -> list[int]:
+        """命中文章在原列表中的位置（升序）"""
+        query = query.lower()
+        if not query:
+            return []
+
+        candidates = self._candidates(query)
+        if len(query) <= 2:
+            return list(candidates)
+        return [
+            position
+            for position in candidates
+            if _matches(self._articles[position], query)
+        ]
+
+    def search(self, query: str) -> list[Article]:
+        """搜索标题、摘要、账号中包含关键词的文章"""
+        return [self._articles[position] for position in self.positions(query)]
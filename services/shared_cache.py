@@ -0,0 +1,173 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from flask_caching.backends.base import BaseCache
+from flask_caching.backends.simplecache import SimpleCache
+
+
+# 序列化格式：首字节标记编码方式
+_RAW = b"r"  # bytes 原样保存（已是紧凑编码的数据，如文章快照）
+_PICKLE = b"p"
+_COMPRESSED = b"z"  # pickle 后 zlib 压缩
+
+# 超过该大小的值压缩后再写入（页面 HTML 等）
+COMPRESS_MIN_SIZE = 1024
+
+
+def dumps(value) -> bytes:
+    if isinstance(value, bytes):
+        return _RAW + value
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(data) >= COMPRESS_MIN_SIZE:
+        return _COMPRESSED + zlib.compress(data, 1)
+    return _PICKLE + data
+
+
+def loads(data: bytes):
+    data = bytes(data)
+    kind, payload = data[:1], data[1:]
+    if kind == _RAW:
+        return payload
+    if kind == _COMPRESSED:
+        payload = zlib.decompress(payload)
+    return pickle.loads(payload)
+
+
+class SQLiteCache(BaseCache):
+    """基于 SQLite 文件的共享缓存后端，同一台机器上的多个 worker 共用一份数据
+
+    不依赖外部服务：设置 CACHE_TYPE=services.shared_cache.SQLiteCache 即可启用，
+    文件位置由 CACHE_SQLITE_PATH 指定。使用 WAL 模式，读写互不阻塞；
+    add 是单条 upsert 语句，可以直接用作跨 worker 的锁。
+    条目超过 threshold 时先清理过期的，再按过期时间从早到晚淘汰，永不过期（timeout=0）的条目不会被淘汰。
+    """
+
+    def __init__(self, path: str, default_timeout: int = 300, threshold: int = 500, busy_timeout: int = 5000):
+        super().__init__(default_timeout=default_timeout)
+        self.path = path
+        self.threshold = threshold
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS ix_cache_expires ON cache (expires)")
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        kwargs.update(
+            path=config["CACHE_SQLITE_PATH"],
+            threshold=config["CACHE_THRESHOLD"],
+        )
+        return cls(*args, **kwargs)
+
+    def _connection(self) -> sqlite3.Connection:
+        """每个线程一个连接；fork 出的子进程重新连接"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout / 1000, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _expires(self, timeout: int | None) -> float:
+        timeout = self._normalize_timeout(timeout)
+        return time.time() + timeout if timeout > 0 else 0
+
+    def _prune(self, connection: sqlite3.Connection):
+        (count,) = connection.execute("SELECT COUNT(*) FROM cache").fetchone()
+        if count <= self.threshold:
+            return
+        now = time.time()
+        connection.execute("DELETE FROM cache WHERE expires > 0 AND expires <= ?", (now,))
+        (count,) = connection.execute("SELECT COUNT(*) FROM cache").fetchone()
+        if count > self.threshold:
+            connection.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache WHERE expires > 0 ORDER BY expires LIMIT ?)",
+                (count - self.threshold,),
+            )
+
+    def get(self, key: str):
+        row = self._connection().execute(
+            "SELECT value FROM cache WHERE key = ? AND (expires = 0 OR expires > ?)", (key, time.time())
+        ).fetchone()
+        return loads(row[0]) if row else None
+
+    def has(self, key: str) -> bool:
+        row = self._connection().execute(
+            "SELECT 1 FROM cache WHERE key = ? AND (expires = 0 OR expires > ?)", (key, time.time())
+        ).fetchone()
+        return row is not None
+
+    def set(self, key: str, value, timeout: int | None = None) -> bool:
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, dumps(value), self._expires(timeout)),
+        )
+        self._prune(connection)
+        return True
+
+    def add(self, key: str, value, timeout: int | None = None) -> bool:
+        """键不存在或已过期时写入，返回是否写入成功（原子操作）"""
+        connection = self._connection()
+        cursor = connection.execute(
+            "INSERT INTO cache (key, value, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires "
+            "WHERE cache.expires > 0 AND cache.expires <= ?",
+            (key, dumps(value), self._expires(timeout), time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, key: str) -> bool:
+        cursor = self._connection().execute("DELETE FROM cache WHERE key = ?", (key,))
+        return cursor.rowcount == 1
+
+    def delete_many(self, *keys):
+        if not keys:
+            return []
+        placeholders = ",".join("?" * len(keys))
+        connection = self._connection()
+        existing = [
+            key for (key,) in connection.execute(f"SELECT key FROM cache WHERE key IN ({placeholders})", keys)
+        ]
+        connection.execute(f"DELETE FROM cache WHERE key IN ({placeholders})", keys)
+        return existing
+
+    def clear(self) -> bool:
+        self._connection().execute("DELETE FROM cache")
+        return True
+
+
+class PinnedSimpleCache(SimpleCache):
+    """进程内缓存，与 SimpleCache 相同，但永不过期（timeout=0）的条目不会被淘汰
+
+    SimpleCache 超过 threshold 时把 expires=0 当作已过期删除，按过期时间淘汰时也最先删除它们，
+    文章快照等长期保存的键反而最先丢失。这里与 SQLiteCache 的淘汰规则保持一致。
+    """
+
+    def _prune(self):
+        if not self._over_threshold():
+            return
+        now = time.time()
+        for key in [key for key, (expires, _) in self._cache.items() if 0 < expires < now]:
+            self._cache.pop(key, None)
+        if self._over_threshold():
+            evictable = sorted(
+                (expires, key) for key, (expires, _) in self._cache.items() if expires > 0
+            )
+            for _, key in evictable:
+                self._cache.pop(key, None)
+                if not self._over_threshold():
+                    break
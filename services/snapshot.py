@@ -0,0 +1,238 @@
+import json
+import os
+import sqlite3
+import tempfile
+import zlib
+from config import Config
+
+
+# 快照文件格式版本，结构变化时递增，旧文件会被忽略
+FORMAT_VERSION = 1
+
+# 读取时的内存映射大小
+MMAP_SIZE = 256 * 1024 * 1024
+
+# 缓存中文章列表的二进制编码：魔数 + zlib(JSON)
+ARTICLES_MAGIC = b"FZA1"
+
+# 缓存中局部变更（事件推送）的二进制编码：魔数 + zlib(JSON)
+CHANGES_MAGIC = b"FZD1"
+
+
+def _connect(path: str, readonly: bool = False) -> sqlite3.Connection:
+    if readonly:
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    else:
+        connection = sqlite3.connect(path)
+    connection.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+    return connection
+
+
+def encode_articles(articles: list[dict]) -> bytes:
+    """把文章列表编码为紧凑的二进制（写入共享缓存用）
+
+    字段名按字段组合只保存一次，每篇文章只保存取值，整体再 zlib 压缩。
+    """
+    shapes: dict[tuple, int] = {}
+    rows = []
+    for data in articles:
+        keys = tuple(data)
+        shape = shapes.setdefault(keys, len(shapes))
+        rows.append([shape, *data.values()])
+    raw = json.dumps(
+        {"keys": list(shapes), "rows": rows}, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+    return ARTICLES_MAGIC + zlib.compress(raw)
+
+
+def decode_articles(data: bytes) -> list[dict]:
+    """encode_articles 的逆操作，格式不符时抛出 ValueError"""
+    if not data.startswith(ARTICLES_MAGIC):
+        raise ValueError("Unknown articles encoding")
+    try:
+        payload = json.loads(zlib.decompress(data[len(ARTICLES_MAGIC):]))
+    except zlib.error as e:
+        raise ValueError("Corrupted articles encoding") from e
+    keys = payload["keys"]
+    return [dict(zip(keys[row[0]], row[1:])) for row in payload["rows"]]
+
+
+def encode_changes(base: str, upserted: list[dict], deleted: list[str]) -> bytes:
+    """把相对 base 版本的局部变更编码为二进制（写入共享缓存用）"""
+    raw = json.dumps(
+        {"base": base, "upserted": upserted, "deleted": deleted}, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+    return CHANGES_MAGIC + zlib.compress(raw)
+
+
+def decode_changes(data: bytes) -> tuple[str, list[dict], list[str]]:
+    """encode_changes 的逆操作，返回 (base, upserted, deleted)，格式不符时抛出 ValueError"""
+    if not data.startswith(CHANGES_MAGIC):
+        raise ValueError("Unknown changes encoding")
+    try:
+        payload = json.loads(zlib.decompress(data[len(CHANGES_MAGIC):]))
+    except zlib.error as e:
+        raise ValueError("Corrupted changes encoding") from e
+    return payload["base"], payload["upserted"], payload["deleted"]
+
+
+def save_snapshot(snapshot: dict, path: str | None = None):
+    """把文章快照（含分析结果，以及可选的统计 "stats"）写入 SQLite 文件
+
+    先写临时文件再原子替换，读取方不会看到写了一半的文件。
+    """
+    path = path or Config.SNAPSHOT_PATH
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        connection = sqlite3.connect(tmp_path)
+        with connection:
+            connection.execute("PRAGMA journal_mode=OFF")
+            connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            connection.execute(
+                "CREATE TABLE articles (position INTEGER PRIMARY KEY, id TEXT NOT NULL, data TEXT NOT NULL)"
+            )
+            connection.execute("CREATE INDEX articles_id ON articles (id)")
+            connection.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("format_version", str(FORMAT_VERSION)),
+                    ("version", snapshot["version"]),
+                    ("cursor", str(snapshot["cursor"])),
+                    ("synced_at", repr(snapshot["synced_at"])),
+                    ("updated_at", repr(snapshot.get("updated_at", snapshot["synced_at"]))),
+                ],
+            )
+            connection.executemany(
+                "INSERT INTO articles (position, id, data) VALUES (?, ?, ?)",
+                (
+                    (position, data["id"], json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+                    for position, data in enumerate(snapshot["articles"])
+                ),
+            )
+            if snapshot.get("stats"):
+                # 同一版本的仪表盘统计（DashboardStats.encode），冷启动时不必重新计算
+                connection.execute("CREATE TABLE stats (data BLOB NOT NULL)")
+                connection.execute("INSERT INTO stats (data) VALUES (?)", (snapshot["stats"],))
+        connection.close()
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def touch_snapshot(snapshot: dict, path: str | None = None):
+    """数据集版本未变时只更新同步游标和时间"""
+    path = path or Config.SNAPSHOT_PATH
+    connection = _connect(path)
+    try:
+        with connection:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if not row or row[0] != snapshot["version"]:
+                raise ValueError("Snapshot version mismatch")
+            connection.executemany(
+                "UPDATE meta SET value = ? WHERE key = ?",
+                [(str(snapshot["cursor"]), "cursor"), (repr(snapshot["synced_at"]), "synced_at")],
+            )
+    finally:
+        connection.close()
+
+
+def patch_snapshot(snapshot: dict, base: str, upserted: list[dict], deleted: list[str], path: str | None = None):
+    """把局部变更写入快照文件：只改动变更的文章行和元数据
+
+    文件中的版本不是 base 时抛出 ValueError，由调用方改为整体写入。修改的文章保留原位置，
+    新增的追加在末尾，与 Dataset.patched 的文章顺序一致。原有统计不再对应新版本，一并删除，
+    由 save_snapshot_stats 补写。
+    """
+    path = path or Config.SNAPSHOT_PATH
+    connection = _connect(path)
+    try:
+        with connection:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if not row or row[0] != base:
+                raise ValueError("Snapshot version mismatch")
+            connection.execute("CREATE INDEX IF NOT EXISTS articles_id ON articles (id)")
+            (position,) = connection.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM articles").fetchone()
+            for data in upserted:
+                encoded = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+                if not connection.execute("UPDATE articles SET data = ? WHERE id = ?", (encoded, data["id"])).rowcount:
+                    connection.execute(
+                        "INSERT INTO articles (position, id, data) VALUES (?, ?, ?)", (position, data["id"], encoded)
+                    )
+                    position += 1
+            connection.executemany("DELETE FROM articles WHERE id = ?", [(record_id,) for record_id in deleted])
+            connection.executemany(
+                "UPDATE meta SET value = ? WHERE key = ?",
+                [
+                    (snapshot["version"], "version"),
+                    (str(snapshot["cursor"]), "cursor"),
+                    (repr(snapshot["synced_at"]), "synced_at"),
+                    (repr(snapshot.get("updated_at", snapshot["synced_at"])), "updated_at"),
+                ],
+            )
+            connection.execute("DROP TABLE IF EXISTS stats")
+    finally:
+        connection.close()
+
+
+def save_snapshot_stats(version: str, stats: bytes, path: str | None = None) -> bool:
+    """为快照文件补写统计；文件已是其他版本时不写入，返回是否写入"""
+    path = path or Config.SNAPSHOT_PATH
+    connection = _connect(path)
+    try:
+        with connection:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if not row or row[0] != version:
+                return False
+            connection.execute("DROP TABLE IF EXISTS stats")
+            connection.execute("CREATE TABLE stats (data BLOB NOT NULL)")
+            connection.execute("INSERT INTO stats (data) VALUES (?)", (stats,))
+        return True
+    finally:
+        connection.close()
+
+
+def load_snapshot(path: str | None = None) -> dict | None:
+    """读取快照文件，文件不存在或格式不符时返回 None"""
+    paths = [path] if path else [Config.SNAPSHOT_PATH, Config.SNAPSHOT_SEED_PATH]
+    for candidate in paths:
+        if not candidate or not os.path.exists(candidate):
+            continue
+        try:
+            connection = _connect(candidate, readonly=True)
+        except sqlite3.Error:
+            continue
+        try:
+            meta = dict(connection.execute("SELECT key, value FROM meta"))
+            if meta.get("format_version") != str(FORMAT_VERSION):
+                continue
+            articles = [
+                json.loads(data)
+                for (data,) in connection.execute("SELECT data FROM articles ORDER BY position")
+            ]
+            snapshot = {
+                "version": meta["version"],
+                "cursor": int(meta["cursor"]),
+                "synced_at": float(meta["synced_at"]),
+                "updated_at": float(meta.get("updated_at", meta["synced_at"])),
+                "articles": articles,
+            }
+            has_stats = connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stats'"
+            ).fetchone()
+            if has_stats:
+                row = connection.execute("SELECT data FROM stats").fetchone()
+                if row:
+                    snapshot["stats"] = bytes(row[0])
+            return snapshot
+        except (sqlite3.Error, KeyError, ValueError):
+            continue
+        finally:
+            connection.close()
+    return None
@@ -0,0 +1,42 @@
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """记录冷启动各阶段耗时（毫秒），用于定位启动慢在哪里"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.phases: list[tuple[str, float]] = []
+        self.total_ms: float | None = None  # finish() 后固定
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (time.perf_counter() - start) * 1000))
+
+    def report(self) -> dict:
+        """各阶段耗时及总耗时"""
+        total_ms = self.total_ms
+        if total_ms is None:
+            total_ms = (time.perf_counter() - self.started_at) * 1000
+        return {
+            "phases": {name: round(ms, 1) for name, ms in self.phases},
+            "total_ms": round(total_ms, 1),
+        }
+
+    def finish(self) -> dict:
+        """启动完成，固定总耗时"""
+        self.total_ms = (time.perf_counter() - self.started_at) * 1000
+        return self.report()
+
+    def format(self) -> str:
+        report = self.report()
+        phases = ", ".join(f"{name}={ms}ms" for name, ms in report["phases"].items())
+        return f"Startup {report['total_ms']}ms ({phases})"
+
+
+startup_timer = StartupTimer()
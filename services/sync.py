@@ -0,0 +1,282 @@
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable
+from flask import current_app
+from models.article import Article
+from config import Config
+
+if TYPE_CHECKING:
+    from services.feishu_client import FeishuClient
+
+
+# 按记录自带的修改时间增量同步时，从上次同步时间再往前多看的窗口（容忍本机与飞书的时钟偏差）
+SCAN_CLOCK_SKEW_MS = 5 * 60 * 1000
+
+
+def _content(data: dict) -> dict:
+    """去掉缓存时间，只保留参与比较的文章内容"""
+    return {key: value for key, value in data.items() if key != "created_at"}
+
+
+def _digest(*parts) -> str:
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(json.dumps(part, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def dataset_version(articles: list[dict]) -> str:
+    """根据文章内容计算数据集版本（不包含缓存时间）"""
+    return _digest(*[_content(data) for data in articles])
+
+
+def _next_version(version: str, upserted: list[dict], deleted: list[str]) -> str:
+    """增量变更后的版本号：由旧版本和本次变更内容计算"""
+    if not upserted and not deleted:
+        return version
+    return _digest(version, *[_content(data) for data in upserted], deleted)
+
+
+@dataclass
+class SyncResult:
+    """一次同步的结果"""
+    version: str
+    cursor: int  # 下次增量同步的起点（毫秒时间戳）
+    articles: list[dict]  # 同步后的完整文章列表（to_cache_dict 格式，含分析结果）
+    upserted: list[str] = field(default_factory=list)  # 新增或修改的记录 ID
+    deleted: list[str] = field(default_factory=list)  # 删除的记录 ID
+    full: bool = False  # 是否为全量同步
+
+    @property
+    def changed(self) -> bool:
+        return self.full or bool(self.upserted or self.deleted)
+
+    def to_snapshot(self, previous: dict | None = None) -> dict:
+        """转换为缓存快照；版本未变时沿用上一个快照的 updated_at"""
+        synced_at = time.time()
+        updated_at = synced_at
+        if previous and previous.get("version") == self.version:
+            updated_at = previous.get("updated_at", previous.get("synced_at", synced_at))
+        return {
+            "version": self.version,
+            "cursor": self.cursor,
+            "synced_at": synced_at,
+            "updated_at": updated_at,
+            "articles": self.articles,
+        }
+
+
+@dataclass
+class RecordChanges:
+    """事件推送的局部变更，只包含变更的记录"""
+    version: str
+    upserted: list[dict] = field(default_factory=list)  # 新增或修改的文章（to_cache_dict 格式）
+    deleted: list[str] = field(default_factory=list)  # 删除的记录 ID
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.upserted or self.deleted)
+
+
+class SyncEngine:
+    """飞书多维表格同步引擎
+
+    保留上一次的文章快照，之后只按"最后更新时间"字段拉取变更过的记录，
+    合并到快照中。删除无法通过修改时间筛选出来，因此每次额外查询一次表格总数，
+    与合并后的记录数不一致时再拉取一遍记录 ID（只带一个短字段）找出被删除的记录。
+    没有配置该字段时按记录自带的修改时间增量同步（见 scan_sync）。
+    所有请求都只拉取 FIELD_MAPPING 中用到的字段。
+    """
+
+    def __init__(
+        self,
+        client: "FeishuClient | None" = None,
+        field_mapping: dict | None = None,
+        modified_field: str | None = None,
+    ):
+        if client is None:
+            # 按需导入：requests 及连接池只在真正同步时加载，不占用冷启动时间
+            from services.feishu_client import FeishuClient
+            client = FeishuClient()
+        self.client = client
+        self.field_mapping = field_mapping or Config.FIELD_MAPPING
+        self.modified_field = Config.FEISHU_MODIFIED_FIELD if modified_field is None else modified_field
+
+    @property
+    def field_names(self) -> list[str]:
+        """需要从飞书拉取的字段"""
+        return list(dict.fromkeys(self.field_mapping.values()))
+
+    def _to_dict(self, record: dict) -> dict:
+        return Article.from_feishu_record(record, self.field_mapping).to_cache_dict()
+
+    def full_sync(self) -> SyncResult:
+        """全量拉取所有记录"""
+        started_at = int(time.time() * 1000)
+        # 逐页转换，原始分页处理完即可释放
+        articles = [
+            self._to_dict(record)
+            for record in self.client.iter_records(field_names=self.field_names)
+        ]
+
+        return SyncResult(
+            version=dataset_version(articles),
+            cursor=started_at,
+            articles=articles,
+            upserted=[data["id"] for data in articles],
+            full=True,
+        )
+
+    def delta_sync(self, snapshot: dict) -> SyncResult:
+        """增量同步：只拉取快照之后修改过的记录"""
+        started_at = int(time.time() * 1000)
+        records = self.client.get_records_modified_since(
+            self.modified_field, snapshot["cursor"], field_names=self.field_names
+        )
+
+        merged = {data["id"]: data for data in snapshot["articles"]}
+        upserted = []
+        for record in records:
+            data = self._to_dict(record)
+            previous = merged.get(data["id"])
+            if previous is not None and _content(previous) == _content(data):
+                continue
+            merged[data["id"]] = data
+            upserted.append(data["id"])
+
+        # 记录数对不上说明有删除：只拉取记录 ID 做对账
+        deleted = []
+        total = self.client.get_total()
+        if total != len(merged):
+            remote_ids = set(self.client.iter_record_ids())
+            deleted = [record_id for record_id in merged if record_id not in remote_ids]
+            for record_id in deleted:
+                del merged[record_id]
+
+            # 远端有未同步到的记录，增量游标不可靠，退回全量同步
+            if remote_ids - merged.keys():
+                current_app.logger.info("Records missing from delta sync, running full sync")
+                return self._full_diff(snapshot)
+
+        return SyncResult(
+            version=_next_version(snapshot["version"], [merged[record_id] for record_id in upserted], deleted),
+            cursor=started_at,
+            articles=list(merged.values()),
+            upserted=upserted,
+            deleted=deleted,
+        )
+
+    def scan_sync(self, snapshot: dict) -> SyncResult:
+        """没有"最后更新时间"字段时的增量同步
+
+        只拉取全部记录的 ID 和记录自带的 last_modified_time（一个短字段），修改时间晚于上次同步的记录
+        再逐条拉取；删除由 ID 对账直接得出。需要逐条拉取的记录比分页拉取全表的请求还多时改为全量同步。
+        """
+        started_at = int(time.time() * 1000)
+        since = snapshot["cursor"] - SCAN_CLOCK_SKEW_MS
+        merged = {data["id"]: data for data in snapshot["articles"]}
+        remote = dict(self.client.iter_record_versions())
+
+        changed = [
+            record_id for record_id, modified in remote.items()
+            if record_id not in merged or not modified or modified > since
+        ]
+        pages = -(-len(remote) // Config.FEISHU_PAGE_SIZE)
+        if len(changed) >= pages:
+            return self._full_diff(snapshot)
+
+        deleted = [record_id for record_id in merged if record_id not in remote]
+        for record_id in deleted:
+            del merged[record_id]
+
+        upserted = []
+        for record_id in changed:
+            record = (self.client.get_record(record_id) or {}).get("record")
+            if not record:
+                current_app.logger.info(f"Failed to fetch changed record {record_id}, running full sync")
+                return self._full_diff(snapshot)
+            record.setdefault("record_id", record_id)
+            data = self._to_dict(record)
+            previous = merged.get(data["id"])
+            if previous is not None and _content(previous) == _content(data):
+                continue
+            merged[data["id"]] = data
+            upserted.append(data["id"])
+
+        return SyncResult(
+            version=_next_version(snapshot["version"], [merged[record_id] for record_id in upserted], deleted),
+            cursor=started_at,
+            articles=list(merged.values()),
+            upserted=upserted,
+            deleted=deleted,
+        )
+
+    def fetch_record_changes(
+        self,
+        version: str,
+        existing: Callable[[str], dict | None],
+        changed: list[str],
+        deleted: list[str],
+    ) -> RecordChanges:
+        """按事件推送的记录 ID 取得局部变更：变更的记录逐条拉取，删除的向飞书确认记录已不存在
+
+        existing(记录 ID) 返回当前版本中该文章的缓存字典（不存在时为 None），只查询涉及的记录，
+        不需要完整的文章列表。同步游标不变，下次增量同步仍会覆盖这段时间，作为事件丢失时的兜底。
+        """
+        upserted = []
+        for record_id in dict.fromkeys(changed):
+            record = (self.client.get_record(record_id) or {}).get("record")
+            if not record:
+                # 拉取失败或记录已被删除，交给下次增量同步对账
+                current_app.logger.warning(f"Failed to fetch changed record {record_id}")
+                continue
+            record.setdefault("record_id", record_id)
+            data = self._to_dict(record)
+            previous = existing(data["id"])
+            if previous is not None and _content(previous) == _content(data):
+                continue
+            upserted.append(data)
+
+        removed = []
+        for record_id in dict.fromkeys(deleted):
+            if existing(record_id) is None:
+                continue
+            if not self.client.record_deleted(record_id):
+                # 记录仍存在或无法确认，不按事件删除，交给下次增量同步对账
+                current_app.logger.warning(f"Deleted record {record_id} not confirmed, skipping")
+                continue
+            removed.append(record_id)
+
+        return RecordChanges(
+            version=_next_version(version, upserted, removed),
+            upserted=upserted,
+            deleted=removed,
+        )
+
+    def _full_diff(self, snapshot: dict) -> SyncResult:
+        """全量同步，并计算与快照之间的差异"""
+        result = self.full_sync()
+        previous = {data["id"]: _content(data) for data in snapshot["articles"]}
+        current = {data["id"] for data in result.articles}
+
+        result.upserted = [
+            data["id"] for data in result.articles
+            if previous.get(data["id"]) != _content(data)
+        ]
+        result.deleted = [record_id for record_id in previous if record_id not in current]
+        return result
+
+    def sync(self, snapshot: dict | None = None) -> SyncResult:
+        """有快照时增量同步，否则全量同步"""
+        if not snapshot:
+            return self.full_sync()
+
+        try:
+            if not self.modified_field:
+                return self.scan_sync(snapshot)
+            return self.delta_sync(snapshot)
+        except Exception as e:
+            current_app.logger.warning(f"Delta sync failed, running full sync: {str(e)}")
+            return self._full_diff(snapshot)
@@ -0,0 +1,114 @@
+import threading
+import time
+from typing import Callable, Optional
+from flask import current_app, has_app_context
+from config import Config
+
+
+class TokenManager:
+    """进程内共享的 tenant_access_token 管理器
+
+    - 同一应用的所有 FeishuClient 共用一个 token，不再每次新建客户端都重新鉴权；
+    - 在过期前 FEISHU_TOKEN_REFRESH_MARGIN 秒主动刷新，并发刷新合并为一次请求，
+      刷新期间其他线程继续使用尚未过期的旧 token；
+    - token 同时写入缓存后端，新的 Vercel 实例在 token 有效期内可以跳过鉴权请求。
+    """
+
+    def __init__(self, app_id: str, refresh_margin: int | None = None):
+        self.app_id = app_id
+        self.refresh_margin = Config.FEISHU_TOKEN_REFRESH_MARGIN if refresh_margin is None else refresh_margin
+        self._token: Optional[str] = None
+        self._expires_at: float = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cache_key(self) -> str:
+        return f"feishu_tenant_access_token:{self.app_id}"
+
+    def _is_fresh(self, expires_at: float) -> bool:
+        return time.time() < expires_at - self.refresh_margin
+
+    def _load_shared(self) -> bool:
+        """从缓存后端读取其他实例获取的 token"""
+        if not has_app_context():
+            return False
+        try:
+            shared = current_app.cache.get(self.cache_key)
+        except Exception:
+            return False
+        if shared and self._is_fresh(shared["expires_at"]):
+            self._token, self._expires_at = shared["token"], shared["expires_at"]
+            return True
+        return False
+
+    def _store_shared(self):
+        if not has_app_context() or not self._token:
+            return
+        try:
+            current_app.cache.set(
+                self.cache_key,
+                {"token": self._token, "expires_at": self._expires_at},
+                timeout=max(int(self._expires_at - time.time()), 1),
+            )
+        except Exception as e:
+            current_app.logger.warning(f"Failed to persist tenant access token: {str(e)}")
+
+    def _refresh(self, fetch: Callable[[], tuple[str, int]]):
+        token, expire = fetch()
+        self._token, self._expires_at = token, time.time() + expire
+        self._store_shared()
+
+    def get_token(self, fetch: Callable[[], tuple[str, int]]) -> tuple[Optional[str], float]:
+        """获取有效 token，返回 (token, 过期时间戳)
+
+        `fetch` 负责请求飞书接口，返回 (token, 有效秒数)。
+        """
+        if self._token and self._is_fresh(self._expires_at):
+            return self._token, self._expires_at
+
+        # 旧 token 仍未过期：只让一个线程刷新，其他线程继续使用旧 token
+        if self._token and time.time() < self._expires_at:
+            if not self._lock.acquire(blocking=False):
+                return self._token, self._expires_at
+            try:
+                if not self._load_shared():
+                    self._refresh(fetch)
+            except Exception as e:
+                if has_app_context():
+                    current_app.logger.warning(f"Proactive token refresh failed: {str(e)}")
+            finally:
+                self._lock.release()
+            return self._token, self._expires_at
+
+        # 没有可用 token：等待刷新完成
+        with self._lock:
+            if not (self._token and self._is_fresh(self._expires_at)) and not self._load_shared():
+                self._refresh(fetch)
+            return self._token, self._expires_at
+
+    def invalidate(self, token: Optional[str] = None):
+        """丢弃当前 token（例如接口返回 token 失效时）
+
+        传入被拒绝的 token 时，只有它仍是当前 token 才丢弃，避免并发请求把别的线程刚换上的新 token 也作废。
+        """
+        with self._lock:
+            if token is not None and token != self._token:
+                return
+            self._token, self._expires_at = None, 0
+            if has_app_context():
+                shared = current_app.cache.get(self.cache_key)
+                if token is None or not shared or shared["token"] == token:
+                    current_app.cache.delete(self.cache_key)
+
+
+_managers: dict[str, TokenManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_token_manager(app_id: str) -> TokenManager:
+    """获取应用对应的进程级 token 管理器"""
+    manager = _managers.get(app_id)
+    if manager is None:
+        with _managers_lock:
+            manager = _managers.setdefault(app_id, TokenManager(app_id))
+    return manager
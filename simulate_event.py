@@ -0,0 +1,20 @@
+import sys
+import requests
+from config import Config
+from services.feishu_events import EventSimulator
+
+# 用法：python simulate_event.py <记录ID> [record_added|record_edited|record_deleted] [回调地址]
+# 按飞书格式（含加密与签名）向本地服务发送一条记录变更事件
+record_id = sys.argv[1]
+action = sys.argv[2] if len(sys.argv) > 2 else "record_edited"
+url = sys.argv[3] if len(sys.argv) > 3 else "http://127.0.0.1:5000/api/feishu/events"
+
+simulator = EventSimulator(
+    Config.BASE_ID,
+    Config.TABLE_ID,
+    verification_token=Config.FEISHU_VERIFICATION_TOKEN,
+    encrypt_key=Config.FEISHU_ENCRYPT_KEY,
+)
+body, headers = simulator.record_changed([(record_id, action)])
+response = requests.post(url, data=body, headers=headers, timeout=10)
+print(response.status_code, response.text)
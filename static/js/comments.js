@@ -5,19 +5,32 @@ const commentsList = document.getElementById('commentsList');
 const commentAuthor = document.getElementById('commentAuthor');
 const commentContent = document.getElementById('commentContent');
 
-// 加载评论
-async function loadComments() {
-    if (!ARTICLE_ID) return;
-
+// 评论分页状态
+let commentsCursor = null;
+let commentsLoading = false;
+const commentsSentinel = document.createElement('div');
+commentsSentinel.className = 'comments-sentinel';
+commentsList.after(commentsSentinel);
+
+// 加载评论（reset 为 true 时重新从第一页开始）
+async function loadComments(reset = true) {
+    if (!ARTICLE_ID || commentsLoading) return;
+    if (!reset && !commentsCursor) return;
+
+    commentsLoading = true;
     try {
-        const response = await fetch(`/api/articles/${ARTICLE_ID}/comments`);
+        const params = new URLSearchParams();
+        if (!reset) params.set('cursor', commentsCursor);
+
+        const response = await fetch(`/api/articles/${ARTICLE_ID}/comments?${params}`);
         const data = await response.json();
 
         if (data.error) {
             throw new Error(data.error);
         }
 
-        displayComments(data.comments);
+        commentsCursor = data.next_cursor;
+        displayComments(data.comments, !reset);
 
     } catch (error) {
         commentsList.innerHTML = `
@@ -25,11 +38,30 @@ async function loadComments() {
                 <p>加载评论失败: ${error.message}</p>
             </div>
         `;
+    } finally {
+        commentsLoading = false;
     }
 }
 
-// 显示评论列表
-function displayComments(comments) {
+function renderComment(comment) {
+    return `
+        <div class="comment-item">
+            <div class="comment-header">
+                <span class="comment-author">${escapeHtml(comment.author)}</span>
+                <span class="comment-date">${formatCommentDate(comment.created_at)}</span>
+            </div>
+            <div class="comment-content">${escapeHtml(comment.content)}</div>
+        </div>
+    `;
+}
+
+// 显示评论列表（append 为 true 时追加到已有评论之后）
+function displayComments(comments, append = false) {
+    if (append) {
+        commentsList.insertAdjacentHTML('beforeend', comments.map(renderComment).join(''));
+        return;
+    }
+
     if (comments.length === 0) {
         commentsList.innerHTML = `
             <div class="empty-state">
@@ -39,17 +71,16 @@ function displayComments(comments) {
         return;
     }
 
-    const html = comments.map(comment => `
-        <div class="comment-item">
-            <div class="comment-header">
-                <span class="comment-author">${escapeHtml(comment.author)}</span>
-                <span class="comment-date">${formatCommentDate(comment.created_at)}</span>
-            </div>
-            <div class="comment-content">${escapeHtml(comment.content)}</div>
-        </div>
-    `).join('');
+    commentsList.innerHTML = comments.map(renderComment).join('');
+}
 
-    commentsList.innerHTML = html;
+// 滚动到评论列表底部时加载下一页
+if ('IntersectionObserver' in window) {
+    new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) {
+            loadComments(false);
+        }
+    }, { rootMargin: '200px' }).observe(commentsSentinel);
 }
 
 // 提交评论
@@ -0,0 +1,99 @@
+// 首页滚动加载脚本
+
+const articlesGrid = document.getElementById('articlesGrid');
+const loadMore = document.getElementById('loadMore');
+const loadMoreButton = document.getElementById('loadMoreButton');
+
+let nextCursor = loadMoreButton ? loadMoreButton.dataset.nextCursor : null;
+let loading = false;
+
+// 加载下一页
+async function loadNextPage() {
+    if (!nextCursor || loading) return;
+
+    loading = true;
+    loadMoreButton.textContent = '加载中...';
+
+    try {
+        const response = await fetch(`/api/articles?cursor=${encodeURIComponent(nextCursor)}`);
+        const data = await response.json();
+
+        if (data.error) {
+            throw new Error(data.error);
+        }
+
+        articlesGrid.insertAdjacentHTML('beforeend', data.articles.map(renderArticleCard).join(''));
+
+        nextCursor = data.next_cursor;
+        if (nextCursor) {
+            loadMoreButton.href = `/?cursor=${encodeURIComponent(nextCursor)}`;
+            loadMoreButton.textContent = '加载更多';
+        } else {
+            observer.disconnect();
+            loadMore.remove();
+        }
+
+    } catch (error) {
+        loadMoreButton.textContent = `加载失败，点击重试`;
+    } finally {
+        loading = false;
+    }
+}
+
+// 渲染文章卡片（与 index.html 中的卡片结构保持一致）
+function renderArticleCard(article) {
+    const sections = [];
+    if (article.scam_type) {
+        sections.push(infoSection('scam-type', '诈骗类型', article.scam_type));
+    }
+    sections.push(infoSection('source', '信息来源', article.source));
+    if (article.location) {
+        sections.push(infoSection('location', '案件地点', article.location));
+    }
+
+    return `
+        <article class="article-card" onclick="window.open('/article/${encodeURIComponent(article.id)}', '_blank')">
+            <div class="article-card-header">
+                <h2 class="article-title">${escapeHtml(article.title)}</h2>
+                <span class="article-date">${escapeHtml(article.display_date)}</span>
+            </div>
+            <div class="article-info-sections">${sections.join('')}</div>
+            <p class="article-preview">${escapeHtml(article.preview)}</p>
+            <div class="article-footer">
+                ${article.comment_count !== undefined ? `<span class="comment-count">${article.comment_count} 条评论</span>` : ''}
+                <span class="read-more">阅读全文 &rarr;</span>
+            </div>
+        </article>
+    `;
+}
+
+function infoSection(className, label, value) {
+    return `
+        <div class="info-section ${className}">
+            <span class="section-label">${label}</span>
+            <span class="section-value">${escapeHtml(value)}</span>
+        </div>
+    `;
+}
+
+// HTML 转义
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text || '';
+    return div.innerHTML;
+}
+
+// 滚动到底部附近时自动加载
+const observer = new IntersectionObserver(entries => {
+    if (entries.some(entry => entry.isIntersecting)) {
+        loadNextPage();
+    }
+}, { rootMargin: '400px' });
+
+if (loadMore) {
+    observer.observe(loadMore);
+    loadMoreButton.addEventListener('click', function(e) {
+        e.preventDefault();
+        loadNextPage();
+    });
+}
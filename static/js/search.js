@@ -63,7 +63,7 @@ function displaySearchResults(articles, query) {
                 <div class="article-source">
                     <span class="source-icon">@</span>
                     <span>${escapeHtml(article.source || '未知来源')}</span>
-                    <span class="article-date">${escapeHtml(article.date || '')}</span>
+                    <span class="article-date">${escapeHtml(article.display_date || '')}</span>
                 </div>
                 <div class="search-result-preview">${preview}</div>
             </div>
@@ -0,0 +1,45 @@
+import pytest
+from models.article import Article
+from services.analyzer import ArticleAnalyzer, KeywordMatcher, get_analyzer
+
+
+class TestKeywordMatcher:
+    def test_finds_overlapping_terms(self):
+        matcher = KeywordMatcher(["he", "she", "his", "hers"])
+        assert matcher.find_all("ushers") == {"she", "he", "hers"}
+
+    def test_no_match(self):
+        matcher = KeywordMatcher(["刷单", "杀猪盘"])
+        assert matcher.find_all("正常的新闻内容") == set()
+
+
+class TestArticleAnalyzer:
+    @pytest.fixture
+    def analyzer(self):
+        return get_analyzer()
+
+    def test_scam_type_follows_dictionary_order(self, analyzer):
+        # "客服诈骗" 在词典中排在 "冒充客服" 之前
+        analysis = analyzer.analyze("近期冒充客服诈骗案件频发")
+        assert analysis.scam_type == "客服诈骗"
+
+    def test_extracts_location_and_tech(self, analyzer):
+        analysis = analyzer.analyze("在杭州市发生一起刷单案件，民警及时劝阻并冻结资金。")
+        assert analysis.scam_type == "刷单"
+        assert analysis.location == "杭州"
+        assert analysis.anti_fraud_tech == ["劝阻", "冻结"]
+
+    def test_extended_dictionary(self):
+        analyzer = ArticleAnalyzer(["刷单", "虚拟货币"], ["预警", "断卡"])
+        analysis = analyzer.analyze("警方开展断卡行动，打击虚拟货币骗局")
+        assert analysis.scam_type == "虚拟货币"
+        assert analysis.anti_fraud_tech == ["断卡"]
+
+    def test_analyze_many_matches_article(self, analyzer):
+        articles = [
+            Article(id=str(i), title="", date="", summary=summary)
+            for i, summary in enumerate(["刷单返利", "民警预警拦截", ""])
+        ]
+        analyses = analyzer.analyze_many(articles)
+        assert [analysis.scam_type for analysis in analyses] == [a.scam_type for a in articles]
+        assert [analysis.anti_fraud_tech for analysis in analyses] == [a.anti_fraud_tech for a in articles]
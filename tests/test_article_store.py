@@ -0,0 +1,65 @@
+import pytest
+from datetime import datetime
+from models.article import Article, normalize_date
+from services.article_store import ArticleStore
+from services.dataset import Dataset
+
+
+class TestArticleStore:
+    @pytest.fixture
+    def articles(self):
+        return [
+            Article(id="rec1", title="警惕刷单诈骗", date="2024年1月5日",
+                    summary="杭州市发生刷单诈骗，特点：先小额返利再诱导大额投入。民警预警劝阻",
+                    source="平安杭州", address="https://example.com/1",
+                    created_at=datetime(2024, 1, 5, 8, 30, 0, 123456)),
+            Article(id="rec2", title="通知", date="", summary="", content="正文", source="平安北京"),
+            Article(id="rec3", title="客服退款", date="2024-01-02", summary="北京市冒充客服诈骗", source="平安杭州"),
+        ]
+
+    def test_views_match_articles(self, articles):
+        store = ArticleStore(articles)
+
+        assert len(store) == 3
+        for view, article in zip(store, articles):
+            assert view.to_cache_dict() == article.to_cache_dict()
+            assert view.preview == article.preview
+            assert view.scam_type == article.scam_type
+            assert view.location == article.location
+            assert view.key_features == article.key_features
+            assert view.anti_fraud_tech == article.anti_fraud_tech
+
+    def test_content_none_and_empty(self, articles):
+        store = ArticleStore(articles)
+        assert store[0].content is None
+        assert store[1].content == "正文"
+        assert store[1].summary == ""
+
+    def test_timestamp_date(self, monkeypatch):
+        # 飞书日期字段返回毫秒时间戳
+        timestamp = 1704412800000
+        article = Article(id="rec4", title="标题", date=timestamp, summary="摘要", source="平安北京")
+        store = ArticleStore([article])
+        assert store[0].date == timestamp
+        assert store[0].display_date == normalize_date(timestamp)
+        assert store[0].to_cache_dict() == article.to_cache_dict()
+
+        monkeypatch.setattr("services.dataset.Config.COLUMNAR_STORE", True)
+        dataset = Dataset.from_snapshot({"version": "v1", "articles": [article.to_cache_dict()]})
+        assert [item.id for item in dataset.by_date(normalize_date(timestamp))] == ["rec4"]
+
+    def test_views_have_no_dict(self, articles):
+        view = ArticleStore(articles)[0]
+        assert not hasattr(view, "__dict__")
+        with pytest.raises(AttributeError):
+            view.title = "改"
+
+    def test_dataset_from_snapshot(self, articles, monkeypatch):
+        monkeypatch.setattr("services.dataset.Config.COLUMNAR_STORE", True)
+        snapshot = {"version": "v1", "articles": [article.to_cache_dict() for article in articles]}
+
+        dataset = Dataset.from_snapshot(snapshot)
+
+        assert dataset.get("rec3").title == "客服退款"
+        assert [article.id for article in dataset.by_source("平安杭州")] == ["rec1", "rec3"]
+        assert [article.id for article in dataset.search_index.search("刷单")] == ["rec1"]
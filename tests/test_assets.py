@@ -0,0 +1,57 @@
+import gzip
+import pytest
+from flask import Flask
+from services import assets
+from services.assets import AssetManifest, build_assets
+
+
+class TestAssets:
+    @pytest.fixture
+    def static_dir(self, tmp_path):
+        (tmp_path / "css").mkdir()
+        (tmp_path / "css" / "style.css").write_text("body { color: red; }")
+        (tmp_path / "logo.png").write_bytes(b"png")
+        return tmp_path
+
+    @pytest.fixture
+    def app(self, static_dir, monkeypatch):
+        app = Flask(__name__, static_folder=str(static_dir), static_url_path="/static")
+        app.add_url_rule("/static/dist/<path:filename>", "asset", assets.serve_asset)
+        monkeypatch.setattr(assets, "manifest", AssetManifest(str(static_dir)))
+        with app.test_request_context():
+            yield app
+
+    def test_build_assets(self, static_dir):
+        manifest = build_assets(str(static_dir))
+
+        hashed = manifest["css/style.css"]
+        assert list(manifest) == ["css/style.css"]
+        assert hashed.startswith("css/style.") and hashed.endswith(".css")
+        compressed = (static_dir / "dist" / (hashed + ".gz")).read_bytes()
+        assert gzip.decompress(compressed) == b"body { color: red; }"
+
+    def test_asset_url_falls_back_when_stale(self, app, static_dir):
+        assert assets.asset_url("css/style.css") == "/static/css/style.css"
+
+        hashed = build_assets(str(static_dir))["css/style.css"]
+        assets.manifest.reload()
+        assert assets.asset_url("css/style.css") == f"/static/dist/{hashed}"
+
+        (static_dir / "css" / "style.css").write_text("body { color: blue; }")
+        assets.manifest.reload()
+        assert assets.asset_url("css/style.css") == "/static/css/style.css"
+
+    def test_serve_precompressed(self, app, static_dir):
+        hashed = build_assets(str(static_dir))["css/style.css"]
+        client = app.test_client()
+
+        response = client.get(f"/static/dist/{hashed}", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Cache-Control"] == assets.IMMUTABLE_CACHE_CONTROL
+        assert response.mimetype == "text/css"
+        assert gzip.decompress(response.data) == b"body { color: red; }"
+
+        response = client.get(f"/static/dist/{hashed}")
+        assert "Content-Encoding" not in response.headers
+        assert response.data == b"body { color: red; }"
+        response.close()
@@ -0,0 +1,60 @@
+import pytest
+from unittest.mock import patch
+from flask import Flask
+from flask_caching import Cache
+from benchmarks.compare import compare
+from benchmarks.fake_feishu import FakeBitable
+from services import feishu_client
+from services.sync import SyncEngine
+
+
+class TestFakeBitable:
+    @pytest.fixture
+    def server(self):
+        with FakeBitable(records=120, text_size=50, error_rate=0.3, max_page_size=20, seed=1) as server:
+            yield server
+
+    @pytest.fixture
+    def engine(self, server):
+        app = Flask(__name__)
+        app.config["CACHE_TYPE"] = "SimpleCache"
+        app.cache = Cache(app)
+        with app.app_context(), \
+                patch.object(feishu_client.Config, "FEISHU_BASE_URL", server.url), \
+                patch.object(feishu_client.Config, "FEISHU_APP_ID", "bench_app"), \
+                patch.object(feishu_client.Config, "BASE_ID", server.base_id), \
+                patch.object(feishu_client.Config, "TABLE_ID", server.table_id), \
+                patch.object(feishu_client.Config, "FEISHU_MAX_RETRIES", 10):
+            client = feishu_client.FeishuClient()
+            yield SyncEngine(client=client, modified_field=server.modified_field)
+
+    def test_full_and_delta_sync(self, server, engine):
+        # 全量同步分页拉取，遇到模拟的 500 会重试
+        result = engine.sync(None)
+        assert len(result.articles) == 120
+        assert server.errors > 0
+
+        changed = server.touch(3)
+        delta = engine.sync(result.to_snapshot())
+        assert sorted(delta.upserted) == sorted(changed)
+        assert len(delta.articles) == 120
+
+
+class TestCompare:
+    def make_report(self, **medians):
+        return {"results": {
+            name: {"unit": "ms", "better": "higher" if name.endswith("per_sec") else "lower", "median": value}
+            for name, value in medians.items()
+        }}
+
+    def test_regressions(self):
+        base = self.make_report(render=10.0, search=2.0, analyze_per_sec=1000.0)
+        current = self.make_report(render=13.0, search=2.1, analyze_per_sec=500.0)
+
+        rows = {row["name"]: row for row in compare(base, current, threshold=0.15)}
+
+        assert rows["render"]["regression"]
+        assert not rows["search"]["regression"]
+        # 吞吐量减半相当于慢了一倍
+        assert rows["analyze_per_sec"]["change"] == pytest.approx(1.0)
+        assert rows["analyze_per_sec"]["regression"]
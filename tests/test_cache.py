@@ -0,0 +1,105 @@
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from flask import Flask
+from flask_caching import Cache
+from services import cache as cache_service
+from services.sync import SyncResult
+
+
+def make_result(version="v1", title="标题"):
+    return SyncResult(
+        version=version,
+        cursor=0,
+        articles=[{"id": "rec1", "title": title, "date": "2024-01-01", "summary": "摘要", "source": "来源"}],
+        full=True,
+    )
+
+
+class SlowEngine:
+    calls = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def sync(self, snapshot=None):
+        SlowEngine.calls += 1
+        time.sleep(0.2)
+        return make_result(version=f"v{SlowEngine.calls}")
+
+
+class TestArticleCache:
+    @pytest.fixture
+    def app(self):
+        app = Flask(__name__)
+        app.config["CACHE_TYPE"] = "SimpleCache"
+        app.cache = Cache(app)
+        SlowEngine.calls = 0
+        cache_service._dataset = None
+        with app.app_context(), patch.object(cache_service.Config, "SNAPSHOT_ENABLED", False):
+            yield app
+
+    def _run_concurrently(self, app, count=8):
+        results = []
+
+        def worker():
+            with app.app_context():
+                results.append(cache_service.get_all_articles())
+
+        threads = [threading.Thread(target=worker) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    @patch("services.cache.SyncEngine", SlowEngine)
+    def test_cold_cache_single_flight(self, app):
+        results = self._run_concurrently(app)
+
+        assert SlowEngine.calls == 1
+        assert all(len(articles) == 1 for articles in results)
+
+    @patch("services.cache.SyncEngine", SlowEngine)
+    def test_stale_snapshot_served_while_refreshing(self, app):
+        snapshot = make_result(version="v0", title="旧标题").to_snapshot()
+        snapshot["synced_at"] -= cache_service.Config.CACHE_DEFAULT_TIMEOUT + 1
+        app.cache.set("all_articles", snapshot, timeout=0)
+
+        with patch.object(cache_service.Config, "CACHE_REFRESH_MODE", "background"):
+            results = self._run_concurrently(app)
+
+        assert all(articles[0].title == "旧标题" for articles in results)
+        time.sleep(0.4)
+        assert SlowEngine.calls == 1
+        assert app.cache.get("all_articles")["version"] == "v1"
+
+    def test_release_keeps_lock_taken_over_by_another_worker(self, app):
+        cache = app.cache
+        assert cache_service._acquire_refresh(cache)
+        # 锁键过期后被其他 worker 重新获取
+        cache.set(cache_service.REFRESH_LOCK_KEY, "other-worker")
+
+        cache_service._release_refresh(cache)
+
+        assert cache.get(cache_service.REFRESH_LOCK_KEY) == "other-worker"
+        assert cache_service._acquire_refresh(cache) is False
+
+        cache.delete(cache_service.REFRESH_LOCK_KEY)
+        assert cache_service._acquire_refresh(cache)
+        cache_service._release_refresh(cache)
+        assert cache.get(cache_service.REFRESH_LOCK_KEY) is None
+
+    def test_warm_start_runs_once_per_process(self, app):
+        cache_service._warm_pid = None
+        with patch.object(cache_service.Config, "SNAPSHOT_ENABLED", True), \
+                patch.object(cache_service, "_restore_snapshot", return_value=None) as restore:
+            cache_service.warm_start()
+            cache_service.warm_start()
+            assert restore.call_count == 1
+
+            # fork 出的子进程 pid 不同，需要重新加载
+            with patch.object(cache_service.os, "getpid", return_value=-1):
+                cache_service.warm_start()
+            assert restore.call_count == 2
@@ -0,0 +1,104 @@
+import pytest
+from flask import Flask
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from models.comment import Comment, db, enable_sqlite_pragmas, init_schema
+from services.comment_counts import CommentCountCache
+
+
+class TestComments:
+    @pytest.fixture
+    def app(self):
+        app = Flask(__name__)
+        app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+        db.init_app(app)
+        with app.app_context():
+            db.create_all()
+            yield app
+            db.session.remove()
+            db.drop_all()
+
+    def add_comments(self, article_id, count, status="approved"):
+        for i in range(count):
+            db.session.add(Comment(article_id=article_id, author="用户", content=f"评论{i}", status=status))
+        db.session.commit()
+
+    def test_count_by_articles(self, app):
+        self.add_comments("rec1", 3)
+        self.add_comments("rec2", 1)
+        self.add_comments("rec2", 2, status="pending")
+
+        counts = Comment.count_by_articles(["rec1", "rec2", "rec3"])
+
+        assert counts == {"rec1": 3, "rec2": 1, "rec3": 0}
+        assert counts["rec1"] == Comment.count_by_article("rec1")
+
+    def test_count_cache_invalidation(self, app):
+        cache = CommentCountCache(ttl=60)
+        self.add_comments("rec1", 1)
+        assert cache.get_many(["rec1"]) == {"rec1": 1}
+
+        self.add_comments("rec1", 1)
+        assert cache.get_many(["rec1"]) == {"rec1": 1}
+
+        cache.invalidate("rec1")
+        assert cache.get_many(["rec1"]) == {"rec1": 2}
+
+    def test_count_cache_is_bounded(self, app):
+        cache = CommentCountCache(ttl=60, maxsize=2)
+        cache.get_many(["rec1", "rec2"])
+        cache.get_many(["rec1"])
+        cache.get_many(["rec3"])
+
+        # rec2 最久未访问，被淘汰
+        assert list(cache._counts) == ["rec1", "rec3"]
+
+    def test_approved_page_keyset(self, app):
+        created_at = datetime(2024, 1, 1, 12, 0, 0)
+        for i in range(5):
+            # 前三条时间相同，按 id 倒序区分
+            db.session.add(Comment(
+                article_id="rec1", author="用户", content=f"评论{i}",
+                created_at=created_at if i < 3 else created_at + timedelta(minutes=i),
+            ))
+        self.add_comments("rec1", 2, status="pending")
+        db.session.commit()
+
+        seen = []
+        before = None
+        while True:
+            comments, before = Comment.get_approved_page("rec1", before=before, limit=2)
+            seen.extend(comment.content for comment in comments)
+            if before is None:
+                break
+
+        assert seen == ["评论4", "评论3", "评论2", "评论1", "评论0"]
+
+    def test_approved_page_uses_index_range_seek(self, app):
+        query = Comment.approved_page_query("rec1", before=(datetime(2024, 1, 1), 10), limit=20)
+        sql = query.statement.compile(db.engine, compile_kwargs={"literal_binds": True})
+
+        plan = db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}")).all()
+
+        detail = " ".join(row[-1] for row in plan)
+        assert "ix_comments_article_status_created" in detail
+        assert "created_at<?" in detail
+        assert "TEMP B-TREE" not in detail
+
+    def test_init_schema_adds_index(self, app):
+        index = next(i for i in Comment.__table__.indexes if i.name == "ix_comments_article_status_created")
+        index.drop(bind=db.engine)
+
+        init_schema()
+
+        names = {i["name"] for i in db.inspect(db.engine).get_indexes("comments")}
+        assert "ix_comments_article_status_created" in names
+
+    def test_sqlite_pragmas(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'comments.db'}")
+        enable_sqlite_pragmas(engine, busy_timeout=3000)
+
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 3000
+            assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
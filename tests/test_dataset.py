@@ -0,0 +1,101 @@
+import pytest
+from models.article import Article
+from services.dataset import Dataset, decode_cursor, encode_cursor
+
+
+class TestDataset:
+    @pytest.fixture
+    def dataset(self):
+        return Dataset("v1", [
+            Article(id="rec1", title="一", date="2024-01-01", summary="", source="平安北京"),
+            Article(id="rec2", title="二", date="2024/1/1 08:00", summary="", source="平安上海"),
+            Article(id="rec3", title="三", date="2024-01-02", summary="", source="平安北京"),
+        ])
+
+    def test_get_by_id(self, dataset):
+        assert dataset.get("rec2").title == "二"
+        assert dataset.get("missing") is None
+
+    def test_by_source(self, dataset):
+        assert [article.id for article in dataset.by_source("平安北京")] == ["rec1", "rec3"]
+        assert dataset.by_source("不存在") == ()
+
+    def test_by_normalized_date(self, dataset):
+        assert [article.id for article in dataset.by_date("2024-01-01")] == ["rec1", "rec2"]
+        assert dataset.dates == ["2024-01-02", "2024-01-01"]
+
+    def test_page_walks_by_date_desc(self):
+        articles = [
+            Article(id=f"rec{i:02d}", title=str(i), date=f"2024-01-{i % 5 + 1:02d}",
+                    summary="", source="平安北京" if i % 2 else "平安上海")
+            for i in range(23)
+        ]
+        dataset = Dataset("v1", articles)
+        expected = sorted(articles, key=lambda a: (a.date, a.id), reverse=True)
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = dataset.page(cursor=cursor, limit=5)
+            seen.extend(page)
+            if cursor is None:
+                break
+
+        assert seen == expected
+
+    def test_page_filters(self, dataset):
+        page, cursor = dataset.page(source="平安北京", limit=1)
+        assert [article.id for article in page] == ["rec3"]
+        page, cursor = dataset.page(cursor=cursor, source="平安北京", limit=1)
+        assert [article.id for article in page] == ["rec1"]
+        assert cursor is None
+
+        page, _ = dataset.page(date_from="2024-01-01", date_to="2024/1/1")
+        assert [article.id for article in page] == ["rec2", "rec1"]
+
+    def test_cursor_round_trip(self):
+        key = ("2024-01-01", "rec1")
+        assert decode_cursor(encode_cursor(key)) == key
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_patched_matches_rebuild(self, dataset):
+        dataset.search_index, dataset.facet_index, dataset.stats
+        edited = Article(id="rec1", title="一改", date="2024-01-03", summary="", source="平安上海")
+        added = Article(id="rec4", title="四", date="2023-12-31", summary="", source="平安广州")
+
+        patched = dataset.patched("v2", [edited, added], ["rec2"])
+        rebuilt = Dataset("v2", [edited, dataset.get("rec3"), added])
+
+        ids = lambda articles: [article.id for article in articles]
+        assert ids(patched.articles) == ["rec1", "rec3", "rec4"]
+        assert patched.get("rec1") is edited and patched.get("rec2") is None
+        assert sorted(patched.sources) == sorted(rebuilt.sources)
+        assert patched.dates == rebuilt.dates
+        for source in ["平安北京", "平安上海", "平安广州"]:
+            assert ids(patched.by_source(source)) == ids(rebuilt.by_source(source))
+            assert ids(patched.page(source=source)[0]) == ids(rebuilt.page(source=source)[0])
+        for date in ["2023-12-31", "2024-01-01", "2024-01-02", "2024-01-03"]:
+            assert ids(patched.by_date(date)) == ids(rebuilt.by_date(date))
+        assert ids(patched.page()[0]) == ids(rebuilt.page()[0])
+        for query in ["一改", "改", "四", "二", "平安"]:
+            assert ids(patched.search_index.search(query)) == ids(rebuilt.search_index.search(query))
+        facets = patched.facet_index
+        assert ids(facets.articles(facets.filter(source=["平安上海"]))) == ["rec1"]
+        assert facets.counts(facets.all) == rebuilt.facet_index.counts(rebuilt.facet_index.all)
+        assert patched.stats._tables == rebuilt.stats._tables
+
+        # 原数据集不受影响
+        assert dataset.get("rec1").title == "一"
+        assert ids(dataset.search_index.search("二")) == ["rec2"]
+        assert ids(dataset.by_source("平安上海")) == ["rec2"]
+
+    def test_patched_compacts_deleted_slots(self):
+        articles = [Article(id=f"rec{i}", title=str(i), date="2024-01-01", summary="", source="平安北京") for i in range(8)]
+        dataset = Dataset("v1", articles)
+
+        patched = dataset.patched("v2", [], ["rec0"])
+        assert patched._slots == (None, *articles[1:])
+
+        # 空位超过 COMPACT_RATIO 时整体重建
+        compacted = patched.patched("v3", [], ["rec1", "rec2"])
+        assert compacted._slots == compacted.articles == tuple(articles[3:])
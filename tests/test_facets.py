@@ -0,0 +1,97 @@
+import pytest
+from unittest.mock import patch
+from flask import Flask
+from models.article import Article
+from routes import api_bp
+from services.dataset import Dataset
+from services.facets import FacetIndex, bitmap_from_positions
+from services.search_index import SearchIndex
+
+
+class TestFacetIndex:
+    @pytest.fixture
+    def articles(self):
+        return [
+            Article(id="1", title="刷单", date="2024-01-01", summary="杭州市发生刷单诈骗", source="平安杭州"),
+            Article(id="2", title="客服", date="2024年1月5日", summary="北京市冒充客服诈骗", source="平安北京"),
+            Article(id="3", title="刷单", date="2024-02-01", summary="北京市刷单诈骗", source="平安北京"),
+            Article(id="4", title="通知", date="", summary="无关内容", source="平安北京"),
+        ]
+
+    @pytest.fixture
+    def index(self, articles):
+        return FacetIndex(articles, version="v1")
+
+    def ids(self, index, bitmap):
+        return [article.id for article in index.articles(bitmap)]
+
+    def test_filters_match_linear_scan(self, articles, index):
+        for scam_type in ["刷单", "客服诈骗"]:
+            for source in ["平安北京", "平安杭州"]:
+                expected = [
+                    article.id for article in articles
+                    if article.scam_type == scam_type and article.source == source
+                ]
+                bitmap = index.filter(scam_type=[scam_type], source=[source])
+                assert self.ids(index, bitmap) == expected
+
+    def test_multiple_values_are_or(self, index):
+        bitmap = index.filter(scam_type=["刷单", "客服诈骗"])
+        assert self.ids(index, bitmap) == ["1", "2", "3"]
+
+    def test_date_range(self, index):
+        assert self.ids(index, index.date_range("2024-01-02", "2024-01-31")) == ["2"]
+        assert self.ids(index, index.date_range(date_from="2024-01-05")) == ["2", "3"]
+        assert self.ids(index, index.date_range(date_to="2023-12-31")) == []
+
+    def test_counts(self, index):
+        counts = index.counts(index.filter(source=["平安北京"]))
+        assert counts["scam_type"] == {"刷单": 1, "客服诈骗": 1}
+        assert counts["source"] == {"平安北京": 3}
+
+    def test_combined_with_search(self, articles, index):
+        search = SearchIndex(articles)
+        bitmap = bitmap_from_positions(search.positions("北京"))
+        assert self.ids(index, index.filter(bitmap, scam_type=["刷单"])) == ["3"]
+
+    def test_unknown_facet(self, index):
+        with pytest.raises(ValueError):
+            index.filter(title=["刷单"])
+
+    def test_patched_matches_rebuild(self, articles, index):
+        edited = Article(id="1", title="客服", date="2024-03-01", summary="杭州市冒充客服诈骗", source="平安杭州")
+        added = Article(id="5", title="刷单", date="2023-12-01", summary="北京市刷单诈骗", source="平安上海")
+        slots = [edited, articles[1], None, articles[3], added]
+
+        patched = index.patched(slots, [(0, articles[0], edited), (2, articles[2], None), (4, None, added)], "v2")
+        rebuilt = FacetIndex(slots, "v2")
+
+        assert patched.all == rebuilt.all
+        assert patched.counts(patched.all) == rebuilt.counts(rebuilt.all)
+        for date_from, date_to in [(None, "2023-12-31"), ("2024-01-01", "2024-02-28"), ("2024-02-01", None)]:
+            assert patched.date_range(date_from, date_to) == rebuilt.date_range(date_from, date_to)
+        assert self.ids(patched, patched.filter(scam_type=["刷单"])) == ["5"]
+        # 原索引不变
+        assert self.ids(index, index.filter(scam_type=["刷单"])) == ["1", "3"]
+
+
+class TestSearchApi:
+    @pytest.fixture
+    def client(self):
+        app = Flask(__name__)
+        app.register_blueprint(api_bp)
+        dataset = Dataset("v1", [
+            Article(id="1", title="刷单", date="2024-01-01", summary="杭州市发生刷单诈骗", source="平安杭州"),
+            Article(id="2", title="客服", date="2024-01-05", summary="北京市冒充客服诈骗", source="平安北京"),
+        ])
+        with patch("routes.api.get_dataset", return_value=dataset):
+            yield app.test_client()
+
+    def test_facet_counts_are_opt_in(self, client):
+        # 普通的关键词搜索不计算分面
+        plain = client.get("/api/search?q=诈骗").json
+        assert plain["total"] == 2
+        assert "facets" not in plain
+
+        counted = client.get("/api/search?q=诈骗&facets=1").json
+        assert counted["facets"]["source"] == {"平安杭州": 1, "平安北京": 1}
@@ -1,5 +1,7 @@
 import pytest
+import requests
 from unittest.mock import Mock, patch
+from services import token_manager
 from services.feishu_client import FeishuClient
 
 
@@ -14,9 +16,9 @@ class TestFeishuClient:
         assert client.base_id is not None
         assert client.table_id is not None
 
-    @patch('services.feishu_client.requests.post')
+    @patch('services.feishu_client.requests.Session.request')
     def test_get_tenant_access_token(self, mock_post, client):
-        mock_response = Mock()
+        mock_response = Mock(status_code=200)
         mock_response.json.return_value = {
             "code": 0,
             "tenant_access_token": "test_token",
@@ -29,9 +31,9 @@ class TestFeishuClient:
         assert token == "test_token"
         assert client._tenant_access_token == "test_token"
 
-    @patch('services.feishu_client.requests.get')
+    @patch('services.feishu_client.requests.Session.request')
     def test_get_records(self, mock_get, client):
-        mock_response = Mock()
+        mock_response = Mock(status_code=200)
         mock_response.json.return_value = {
             "code": 0,
             "data": {
@@ -46,3 +48,100 @@ class TestFeishuClient:
 
         assert "items" in records
         assert len(records["items"]) == 1
+
+    @patch('services.feishu_client.time.sleep')
+    @patch('services.feishu_client.requests.Session.request')
+    def test_retries_server_errors(self, mock_request, mock_sleep, client):
+        failed = Mock(status_code=503, headers={})
+        ok = Mock(status_code=200)
+        ok.json.return_value = {"code": 0, "data": {"items": []}}
+        mock_request.side_effect = [failed, ok]
+
+        response = client._request("GET", "https://example.com")
+
+        assert response is ok
+        assert mock_request.call_count == 2
+        mock_sleep.assert_called_once()
+
+    @patch('services.feishu_client.time.sleep')
+    @patch('services.feishu_client.requests.Session.request')
+    def test_honours_retry_after(self, mock_request, mock_sleep, client):
+        limited = Mock(status_code=429, headers={"Retry-After": "2"})
+        ok = Mock(status_code=200)
+        mock_request.side_effect = [limited, ok]
+
+        client._request("GET", "https://example.com")
+
+        mock_sleep.assert_called_once_with(2.0)
+
+    @patch('services.feishu_client.time.sleep')
+    @patch('services.feishu_client.requests.Session.request')
+    def test_gives_up_after_max_retries(self, mock_request, mock_sleep, client):
+        mock_request.return_value = Mock(status_code=500, headers={})
+
+        response = client._request("GET", "https://example.com")
+
+        assert response.status_code == 500
+        assert mock_request.call_count == client.max_retries + 1
+
+    def test_clients_share_session(self):
+        assert FeishuClient().session is FeishuClient().session
+
+    @patch('services.feishu_client.requests.Session.request')
+    def test_rejected_token_is_refreshed_once(self, mock_request, client):
+        def token(value):
+            response = Mock(status_code=200)
+            response.json.return_value = {"code": 0, "tenant_access_token": value, "expire": 7200}
+            return response
+
+        rejected = Mock(status_code=200)
+        rejected.json.return_value = {"code": 99991663, "msg": "Invalid access token for authorization."}
+        ok = Mock(status_code=200)
+        ok.json.return_value = {"code": 0, "data": {"items": []}}
+        mock_request.side_effect = [token("revoked"), rejected, token("fresh"), ok]
+
+        with patch.dict(token_manager._managers, clear=True):
+            assert client.get_records() == {"items": []}
+
+        assert mock_request.call_args.kwargs["headers"]["Authorization"] == "Bearer fresh"
+        assert mock_request.call_count == 4
+
+    @patch('services.feishu_client.requests.Session.request')
+    def test_repeated_rejection_is_not_retried_again(self, mock_request, client):
+        unauthorized = Mock(status_code=401)
+        unauthorized.raise_for_status.side_effect = requests.HTTPError("401")
+        token = Mock(status_code=200)
+        token.json.return_value = {"code": 0, "tenant_access_token": "t", "expire": 7200}
+        mock_request.side_effect = [token, unauthorized, token, unauthorized]
+
+        with patch.dict(token_manager._managers, clear=True), pytest.raises(Exception):
+            client.get_records()
+
+        assert mock_request.call_count == 4
+
+    def test_record_deleted_only_on_not_found(self, client):
+        def response(body):
+            mock = Mock(status_code=200)
+            mock.json.return_value = body
+            return mock
+
+        with patch.object(client, "_authorized_request") as mock_request:
+            mock_request.return_value = response({"code": 1254043, "msg": "RecordIdNotFound"})
+            assert client.record_deleted("rec1")
+
+            # 记录仍存在、其他错误或请求失败都不能确认删除
+            mock_request.return_value = response({"code": 0, "data": {"record": {"record_id": "rec1"}}})
+            assert not client.record_deleted("rec1")
+            mock_request.return_value = response({"code": 99991400, "msg": "rate limited"})
+            assert not client.record_deleted("rec1")
+            mock_request.side_effect = requests.ConnectionError()
+            assert not client.record_deleted("rec1")
+
+    def test_record_versions_request_automatic_fields(self, client):
+        page = {"items": [{"record_id": "rec1", "last_modified_time": 1700000000000, "fields": {}}], "has_more": False}
+
+        with patch.object(client, "get_records", return_value=page) as mock_get:
+            assert list(client.iter_record_versions()) == [("rec1", 1700000000000)]
+
+        assert mock_get.call_args.kwargs["automatic_fields"] is True
+        assert mock_get.call_args.kwargs["field_names"] == client._id_only_fields()
@@ -0,0 +1,203 @@
+import time
+import pytest
+from unittest.mock import Mock, patch
+from flask import Flask
+from flask_caching import Cache
+from routes import api_bp
+from services import cache as cache_service
+from services.feishu_events import (
+    EventError, EventSimulator, parse_event, record_changes, signature,
+)
+from services.snapshot import load_snapshot, save_snapshot
+from services.sync import SyncEngine
+
+
+FIELD_MAPPING = {"title": "标题", "date": "日期", "summary": "摘要", "source": "账号", "address": "地址"}
+
+
+def feishu_record(record_id, title):
+    return {"record_id": record_id, "fields": {"标题": title, "日期": "2024-01-01", "摘要": "刷单诈骗", "账号": "平安北京"}}
+
+
+class TestFeishuEvents:
+    def test_verification_token(self):
+        simulator = EventSimulator("base", "table", verification_token="secret")
+        body, headers = simulator.record_changed([("rec1", "record_edited")])
+
+        payload = parse_event(body, headers, verification_token="secret")
+        assert record_changes(payload["event"], "base", "table") == (["rec1"], [])
+
+        with pytest.raises(EventError):
+            parse_event(body, headers, verification_token="other")
+
+    def test_not_configured(self):
+        body, headers = EventSimulator("base", "table").record_changed([("rec1", "record_edited")])
+
+        with pytest.raises(EventError):
+            parse_event(body, headers)
+
+    def test_signature(self):
+        body = b'{"encrypt": "payload"}'
+        timestamp = str(int(time.time()))
+        headers = {
+            "X-Lark-Request-Timestamp": timestamp,
+            "X-Lark-Request-Nonce": "nonce",
+            "X-Lark-Signature": signature(timestamp, "nonce", "key", body),
+        }
+
+        with pytest.raises(EventError, match="signature"):
+            parse_event(body + b" ", headers, encrypt_key="key")
+        expired = {**headers, "X-Lark-Request-Timestamp": "1"}
+        expired["X-Lark-Signature"] = signature("1", "nonce", "key", body)
+        with pytest.raises(EventError, match="expired"):
+            parse_event(body, expired, encrypt_key="key")
+
+    def test_encrypt_key_requires_encrypted_body(self):
+        # 配置了 Encrypt Key 时，明文事件体即使签名正确、不带签名也都拒绝
+        body, headers = EventSimulator("base", "table", verification_token="secret").record_changed(
+            [("rec1", "record_deleted")]
+        )
+        with pytest.raises(EventError, match="not encrypted"):
+            parse_event(body, headers, verification_token="secret", encrypt_key="key")
+
+        timestamp = str(int(time.time()))
+        signed = {
+            **headers,
+            "X-Lark-Request-Timestamp": timestamp,
+            "X-Lark-Request-Nonce": "nonce",
+            "X-Lark-Signature": signature(timestamp, "nonce", "key", body),
+        }
+        with pytest.raises(EventError, match="not encrypted"):
+            parse_event(body, signed, verification_token="secret", encrypt_key="key")
+
+    def test_encrypted_round_trip(self):
+        pytest.importorskip("cryptography")
+        simulator = EventSimulator("base", "table", encrypt_key="key")
+        body, headers = simulator.record_changed([("rec1", "record_deleted")])
+
+        payload = parse_event(body, headers, encrypt_key="key")
+        assert record_changes(payload["event"]) == ([], ["rec1"])
+
+        # 加密的事件也必须带签名，只有 url_verification 例外
+        unsigned = {"Content-Type": "application/json"}
+        with pytest.raises(EventError, match="Missing signature"):
+            parse_event(body, unsigned, encrypt_key="key")
+        body, _ = simulator.url_verification("c")
+        assert parse_event(body, unsigned, encrypt_key="key")["challenge"] == "c"
+
+    def test_other_table_ignored(self):
+        event = {"file_token": "base", "table_id": "other", "action_list": [{"record_id": "rec1", "action": "record_added"}]}
+        assert record_changes(event, "base", "table") == ([], [])
+
+
+class TestEventWebhook:
+    @pytest.fixture
+    def client(self):
+        records = {"rec1": feishu_record("rec1", "旧标题"), "rec2": feishu_record("rec2", "第二篇")}
+        feishu = Mock()
+        feishu.get_record.side_effect = lambda record_id: {"record": records[record_id]} if record_id in records else None
+        feishu.record_deleted.side_effect = lambda record_id: record_id not in records
+        self.records = records
+
+        app = Flask(__name__)
+        app.config["CACHE_TYPE"] = "SimpleCache"
+        app.cache = Cache(app)
+        app.register_blueprint(api_bp)
+        cache_service._dataset = None
+
+        engine = lambda: SyncEngine(client=feishu, field_mapping=FIELD_MAPPING)
+        with app.app_context(), \
+                patch("services.cache.SyncEngine", engine), \
+                patch.object(cache_service.Config, "SNAPSHOT_ENABLED", False), \
+                patch.object(cache_service.Config, "FEISHU_VERIFICATION_TOKEN", "secret"), \
+                patch.object(cache_service.Config, "BASE_ID", "base"), \
+                patch.object(cache_service.Config, "TABLE_ID", "table"):
+            articles = [engine()._to_dict(record) for record in records.values()]
+            app.cache.set("all_articles", {
+                "version": "v1", "cursor": 0, "synced_at": time.time(), "articles": articles,
+            }, timeout=0)
+            self.simulator = EventSimulator("base", "table", verification_token="secret")
+            yield app.test_client()
+
+    def test_url_verification(self, client):
+        body, headers = self.simulator.url_verification("abc")
+        response = client.post("/api/feishu/events", data=body, headers=headers)
+        assert response.json == {"challenge": "abc"}
+
+    def test_record_edited(self, client):
+        self.records["rec1"] = feishu_record("rec1", "新标题")
+        body, headers = self.simulator.record_changed([("rec1", "record_edited")], event_id="e1")
+
+        response = client.post("/api/feishu/events", data=body, headers=headers)
+
+        assert response.json["applied"] is True
+        dataset = cache_service.get_dataset()
+        assert dataset.version != "v1"
+        assert dataset.get("rec1").title == "新标题"
+        assert [article.id for article in dataset.search_index.search("新标题")] == ["rec1"]
+
+        # 重推的同一事件不再处理
+        response = client.post("/api/feishu/events", data=body, headers=headers)
+        assert response.json["duplicate"] is True
+
+    def test_record_added_and_deleted(self, client):
+        self.records["rec3"] = feishu_record("rec3", "第三篇")
+        del self.records["rec2"]
+        body, headers = self.simulator.record_changed(
+            [("rec3", "record_added"), ("rec2", "record_deleted")]
+        )
+
+        client.post("/api/feishu/events", data=body, headers=headers)
+
+        dataset = cache_service.get_dataset()
+        assert [article.id for article in dataset.articles] == ["rec1", "rec3"]
+        assert dataset.stats.total == 2
+
+    def test_event_patches_dataset_and_disk_snapshot(self, client, tmp_path):
+        path = str(tmp_path / "snapshot.db")
+        save_snapshot(client.application.cache.get("all_articles"), path)
+        before = cache_service.get_dataset()
+        before.search_index, before.stats
+        self.records["rec1"] = feishu_record("rec1", "新标题")
+        body, headers = self.simulator.record_changed([("rec1", "record_edited")])
+
+        # 只更新变更的记录：不重建搜索索引、不重新计算统计
+        with patch.object(cache_service.Config, "SNAPSHOT_ENABLED", True), \
+                patch.object(cache_service.Config, "SNAPSHOT_PATH", path), \
+                patch("services.dataset.SearchIndex", side_effect=AssertionError), \
+                patch("services.dataset.DashboardStats", side_effect=AssertionError):
+            assert client.post("/api/feishu/events", data=body, headers=headers).json["applied"] is True
+            dataset = cache_service.get_dataset()
+
+        assert [article.id for article in dataset.search_index.search("新标题")] == ["rec1"]
+        assert dataset.stats.total == 2
+        snapshot = load_snapshot(path)
+        assert snapshot["version"] == dataset.version
+        assert [data["title"] for data in snapshot["articles"]] == ["新标题", "第二篇"]
+        # 统计不随事件写入，下次定时同步（版本未变）时补写
+        assert "stats" not in snapshot
+        cache_service._publish_derived(dataset, path)
+        assert load_snapshot(path)["stats"]
+
+    def test_unconfirmed_delete_is_ignored(self, client):
+        # rec2 在飞书中仍然存在：伪造或乱序的删除事件不会移除文章
+        body, headers = self.simulator.record_changed([("rec2", "record_deleted")])
+
+        response = client.post("/api/feishu/events", data=body, headers=headers)
+
+        assert response.json["applied"] is True
+        assert cache_service.get_dataset().get("rec2") is not None
+
+    def test_forged_event_rejected(self, client):
+        body, headers = EventSimulator("base", "table", verification_token="guess").record_changed(
+            [("rec2", "record_deleted")]
+        )
+        response = client.post("/api/feishu/events", data=body, headers=headers)
+        assert response.status_code == 401
+
+    def test_disabled_without_credentials(self, client):
+        body, headers = EventSimulator("base", "table").record_changed([("rec2", "record_deleted")])
+        with patch.object(cache_service.Config, "FEISHU_VERIFICATION_TOKEN", ""):
+            response = client.post("/api/feishu/events", data=body, headers=headers)
+        assert response.status_code == 404
+        assert cache_service.get_dataset().get("rec2") is not None
@@ -0,0 +1,49 @@
+from services.formatter import FormatterCache, format_article_text
+
+
+class TestFormatArticleText:
+    def test_sections_and_links(self):
+        html = format_article_text("通报[原文](http://a.com)案情回顾：某男子被骗，防范建议：不要转账")
+        assert html == (
+            "<p>通报原文</p>\n"
+            "<p><strong>案情回顾</strong>： 某男子被骗，</p>\n"
+            "<p><strong>防范建议</strong>： 不要转账</p>"
+        )
+
+    def test_repeated_keyword_matches_legacy_behaviour(self):
+        assert format_article_text("x防范建议防范建议") == "<p>x</p>\n<p><strong>防范建议</strong>防范建议</p>"
+
+    def test_empty(self):
+        assert format_article_text("") == ""
+        assert format_article_text(None) == ""
+
+
+class TestFormatterCache:
+    def test_hits_and_misses(self):
+        cache = FormatterCache(maxsize=8)
+        first = cache.format("案情回顾内容", "rec1")
+        second = cache.format("案情回顾内容", "rec1")
+
+        assert first == second
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction(self):
+        cache = FormatterCache(maxsize=2)
+        cache.format("一", "rec1")
+        cache.format("二", "rec2")
+        cache.format("一", "rec1")
+        cache.format("三", "rec3")
+
+        assert cache.stats()["size"] == 2
+        cache.format("二", "rec2")
+        assert cache.stats()["misses"] == 4
+
+    def test_edited_text_misses_and_keys_hold_no_text(self):
+        cache = FormatterCache(maxsize=8)
+        cache.format("案情回顾：旧内容", "rec1")
+        html = cache.format("案情回顾：新内容", "rec1")
+
+        assert "新内容" in html
+        assert cache.stats()["misses"] == 2
+        assert all(isinstance(digest, bytes) and len(digest) == 16 for _, digest in cache._entries)
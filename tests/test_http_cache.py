@@ -0,0 +1,41 @@
+import pytest
+from flask import Flask
+from services.http_cache import cacheable, make_etag, not_modified
+
+
+class TestHttpCache:
+    @pytest.fixture
+    def app(self):
+        return Flask(__name__)
+
+    def test_etag_changes_with_version(self):
+        assert make_etag("v1", "rec1") == make_etag("v1", "rec1")
+        assert make_etag("v1", "rec1") != make_etag("v2", "rec1")
+
+    def test_if_none_match(self, app):
+        etag = make_etag("v1")
+        with app.test_request_context(headers={"If-None-Match": f'"{etag}"'}):
+            response = not_modified(etag, 1700000000, shared_max_age=60)
+            assert response.status_code == 304
+            assert response.get_etag() == (etag, False)
+            assert "s-maxage=60" in response.headers["Cache-Control"]
+
+        with app.test_request_context(headers={"If-None-Match": '"other"'}):
+            # ETag 不匹配时忽略 If-Modified-Since
+            assert not_modified(etag, 1700000000) is None
+
+    def test_if_modified_since(self, app):
+        with app.test_request_context(headers={"If-Modified-Since": "Tue, 14 Nov 2023 22:13:20 GMT"}):
+            assert not_modified("x", 1700000000.9).status_code == 304
+            assert not_modified("x", 1700000001) is None
+            assert not_modified("x") is None
+
+    def test_cacheable_headers(self, app):
+        with app.test_request_context():
+            response = cacheable("body", "abc", 1700000000)
+            assert response.get_etag() == ("abc", False)
+            assert response.last_modified.timestamp() == 1700000000
+            assert response.headers["Cache-Control"] == "public, no-cache"
+
+            error = cacheable(("error", 500), "abc")
+            assert error.get_etag() == (None, None)
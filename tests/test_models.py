@@ -1,4 +1,5 @@
 import pytest
+from unittest.mock import patch
 from models.article import Article
 from datetime import datetime
 
@@ -33,6 +34,13 @@ class TestArticle:
         assert len(preview) == 103  # 100 + "..."
         assert preview.endswith("...")
 
+    def test_display_date(self):
+        assert Article(id="1", title="", date="2024-01-01 08:00", summary="").display_date == "2024-01-01"
+        assert Article(id="1", title="", date="", summary="").display_date == ""
+        # 飞书日期字段返回毫秒时间戳
+        timestamp = int(datetime(2024, 1, 5).timestamp() * 1000)
+        assert Article(id="1", title="", date=timestamp, summary="").display_date == "2024-01-05"
+
     def test_to_dict(self):
         article = Article(
             id="1",
@@ -73,3 +81,21 @@ class TestArticle:
         assert article.date == "2024-01-01"
         assert article.summary == "飞书摘要"
         assert article.source == "飞书账号"
+
+    def test_cache_dict_round_trip_skips_analysis(self):
+        article = Article(
+            id="1",
+            title="测试",
+            date="2024-01-01",
+            summary="近期刷单诈骗高发，民警及时预警劝阻",
+            source="来源"
+        )
+
+        data = article.to_cache_dict()
+        with patch.object(Article, "_analyze_content") as analyze:
+            restored = Article.from_cache_dict(data)
+
+        analyze.assert_not_called()
+        assert restored.scam_type == "刷单"
+        assert restored.anti_fraud_tech == article.anti_fraud_tech
+        assert restored.created_at == article.created_at
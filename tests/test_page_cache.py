@@ -0,0 +1,65 @@
+import pytest
+from flask import Flask
+from flask_caching import Cache
+from services.page_cache import PageCache
+
+
+class TestPageCache:
+    @pytest.fixture
+    def app(self):
+        app = Flask(__name__)
+        app.cache = Cache(app, config={"CACHE_TYPE": "SimpleCache"})
+        with app.app_context():
+            yield app
+
+    def test_renders_once_per_version(self, app):
+        cache = PageCache()
+        calls = []
+
+        def render():
+            calls.append(1)
+            return "<html>v1</html>"
+
+        assert cache.get_or_render("v1", ("detail", "rec1"), render) == "<html>v1</html>"
+        assert cache.get_or_render("v1", ("detail", "rec1"), render) == "<html>v1</html>"
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+
+        cache.get_or_render("v2", ("detail", "rec1"), render)
+        assert len(calls) == 2
+
+    def test_new_version_evicts_old_entries(self, app):
+        cache = PageCache()
+        cache.get_or_render("v1", ("detail", "rec1"), lambda: "old")
+        old_key = cache._key("v1", ("detail", "rec1"))
+
+        cache.get_or_render("v2", ("detail", "rec1"), lambda: "new")
+
+        assert old_key not in cache._entries
+        assert cache.stats()["size"] == 1
+
+    def test_size_bounds(self, app):
+        cache = PageCache(max_entries=2, max_bytes=10)
+        for i in range(3):
+            cache.get_or_render("v1", ("page", i), lambda: "12345")
+
+        assert cache.stats()["size"] == 2
+        assert cache.stats()["bytes"] == 10
+        assert cache._key("v1", ("page", 0)) not in cache._entries
+
+        # 超过字节上限的页面不缓存
+        cache.get_or_render("v1", ("page", "big"), lambda: "x" * 11)
+        assert cache._key("v1", ("page", "big")) not in cache._entries
+
+    def test_no_version_not_cached(self, app):
+        cache = PageCache()
+        cache.get_or_render(None, ("index",), lambda: "empty")
+        assert cache.stats()["size"] == 0
+
+    def test_does_not_use_cache_backend(self, app):
+        cache = PageCache()
+        for i in range(20):
+            cache.get_or_render("v1", ("page", i), lambda: "html")
+
+        # 页面不写入缓存后端，不会把文章快照等键挤出 SimpleCache
+        assert not app.cache.cache._cache
@@ -0,0 +1,60 @@
+import pytest
+from models.article import Article
+from services.search_index import SearchIndex
+
+
+class TestSearchIndex:
+    @pytest.fixture
+    def articles(self):
+        return [
+            Article(id="1", title="警惕刷单诈骗", date="2024-01-01",
+                    summary="某市发生一起刷单返利案件", source="平安北京"),
+            Article(id="2", title="冒充客服退款", date="2024-01-02",
+                    summary="骗子冒充电商客服", source="Ping An Shanghai"),
+            Article(id="3", title="虚假投资理财", date="2024-01-03",
+                    summary="杀猪盘新套路", source="平安北京"),
+        ]
+
+    @pytest.fixture
+    def index(self, articles):
+        return SearchIndex(articles, version="v1")
+
+    def test_bigram_query(self, index):
+        results = index.search("刷单")
+        assert [article.id for article in results] == ["1"]
+
+    def test_single_char_query(self, index):
+        results = index.search("骗")
+        assert [article.id for article in results] == ["1", "2"]
+
+    def test_case_insensitive_source(self, index):
+        results = index.search("ping an")
+        assert [article.id for article in results] == ["2"]
+
+    def test_matches_linear_scan(self, articles, index):
+        for query in ["平安", "北京", "客服", "杀猪盘新", "刷单诈", "不存在", "an s"]:
+            expected = [
+                article.id for article in articles
+                if query in article.title.lower()
+                or query in article.summary.lower()
+                or query in article.source.lower()
+            ]
+            assert [article.id for article in index.search(query)] == expected
+
+    def test_no_cross_field_match(self, index):
+        # 标题结尾与摘要开头拼接出的字符串不应命中
+        assert index.search("骗某") == []
+
+    def test_patched_matches_rebuild(self, articles, index):
+        edited = Article(id="1", title="警惕兼职诈骗", date="2024-01-01", summary="网络兼职", source="平安北京")
+        added = Article(id="4", title="刷单返利", date="2024-01-04", summary="", source="平安上海")
+        slots = [edited, None, articles[2], added]
+
+        patched = index.patched(slots, [(0, articles[0], edited), (1, articles[1], None), (3, None, added)], "v2")
+        rebuilt = SearchIndex(slots, "v2")
+
+        for query in ["刷单", "兼职", "骗", "客服", "平安", "ping an", "警惕兼职诈", "杀猪盘新"]:
+            assert patched.positions(query) == rebuilt.positions(query)
+        # 原索引不变
+        assert [article.id for article in index.search("刷单")] == ["1"]
+        assert [article.id for article in index.search("客服")] == ["2"]
@@ -0,0 +1,236 @@
+import time
+import pytest
+from unittest.mock import patch
+from flask import Flask
+from flask_caching import Cache
+from services import cache as cache_service
+from services.shared_cache import PinnedSimpleCache, SQLiteCache
+from services.snapshot import CHANGES_MAGIC, decode_articles, encode_articles
+from services.sync import RecordChanges, SyncResult
+
+
+ARTICLES = [
+    {"id": "rec1", "title": "警惕刷单诈骗", "date": "2024-01-01", "summary": "摘要", "content": None,
+     "source": "平安北京", "address": "", "created_at": None,
+     "analysis": {"scam_type": "刷单诈骗", "location": "北京", "key_features": [], "anti_fraud_tech": []}},
+    {"id": "rec2", "title": "冒充客服", "date": "2024-01-02", "summary": "摘要二", "source": "来源"},
+]
+
+
+class CountingEngine:
+    calls = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def sync(self, snapshot=None):
+        CountingEngine.calls += 1
+        return SyncResult(version="v1", cursor=0, articles=ARTICLES, full=True)
+
+    def fetch_record_changes(self, version, existing, changed, deleted):
+        # 把变更的记录标题改为 "<旧版本> 更新"，新版本号为 "<旧版本>+"
+        upserted = [{**existing(record_id), "title": f"{version} 更新"} for record_id in changed]
+        return RecordChanges(version=version + "+", upserted=upserted, deleted=deleted)
+
+
+class TestSQLiteCache:
+    @pytest.fixture
+    def path(self, tmp_path):
+        return str(tmp_path / "cache.db")
+
+    def test_set_get_delete(self, path):
+        cache = SQLiteCache(path)
+        cache.set("a", {"x": [1, 2]})
+        cache.set("html", "页面" * 1000)
+        cache.set("raw", b"\x00bytes")
+
+        assert cache.get("a") == {"x": [1, 2]}
+        assert cache.get("html") == "页面" * 1000
+        assert cache.get("raw") == b"\x00bytes"
+        assert cache.delete("a") is True
+        assert cache.get("a") is None
+        assert cache.delete_many("html", "missing") == ["html"]
+
+    def test_shared_between_instances(self, path):
+        # 两个实例相当于两个 worker
+        first, second = SQLiteCache(path), SQLiteCache(path)
+        first.set("key", "value")
+        assert second.get("key") == "value"
+
+        assert first.add("lock", 1, timeout=60) is True
+        assert second.add("lock", 2, timeout=60) is False
+        first.delete("lock")
+        assert second.add("lock", 2, timeout=60) is True
+
+    def test_expired_entries(self, path):
+        cache = SQLiteCache(path)
+        cache.set("key", "value", timeout=1)
+        with patch("services.shared_cache.time.time", return_value=time.time() + 2):
+            assert cache.get("key") is None
+            assert cache.has("key") is False
+            assert cache.add("key", "new", timeout=60) is True
+        assert cache.get("key") == "new"
+
+    def test_prune_keeps_permanent_entries(self, path):
+        cache = SQLiteCache(path, threshold=3)
+        cache.set("snapshot", "keep", timeout=0)
+        for i in range(5):
+            cache.set(f"page{i}", i, timeout=60 + i)
+
+        assert cache.get("snapshot") == "keep"
+        assert cache.get("page0") is None
+        assert cache.get("page4") == 4
+
+
+
+class TestPinnedSimpleCache:
+    def test_prune_keeps_permanent_entries(self):
+        cache = PinnedSimpleCache(threshold=3)
+        cache.set("snapshot", "keep", timeout=0)
+        for i in range(5):
+            cache.set(f"event{i}", i, timeout=60 + i)
+
+        assert cache.get("snapshot") == "keep"
+        assert cache.get("event0") is None
+        assert cache.get("event4") == 4
+
+    def test_is_default_backend(self):
+        app = Flask(__name__)
+        app.config.from_object("config.Config")
+        assert isinstance(Cache(app).cache, PinnedSimpleCache)
+
+
+class TestArticlesEncoding:
+    def test_round_trip(self):
+        assert decode_articles(encode_articles(ARTICLES)) == ARTICLES
+
+    def test_rejects_unknown_format(self):
+        with pytest.raises(ValueError):
+            decode_articles(b"not an encoding")
+
+
+class TestSharedArticleCache:
+    def make_app(self, path):
+        app = Flask(__name__)
+        app.config["CACHE_TYPE"] = "services.shared_cache.SQLiteCache"
+        app.config["CACHE_SQLITE_PATH"] = path
+        app.cache = Cache(app)
+        return app
+
+    @patch("services.cache.SyncEngine", CountingEngine)
+    def test_single_fetch_across_workers(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        CountingEngine.calls = 0
+        with patch.object(cache_service.Config, "SNAPSHOT_ENABLED", False):
+            for _ in range(2):
+                # 每个 app 模拟一个 worker 进程：进程内数据集为空
+                cache_service._dataset = None
+                app = self.make_app(path)
+                with app.app_context():
+                    dataset = cache_service.get_dataset()
+                    assert dataset.version == "v1"
+                    assert [article.id for article in dataset.articles] == ["rec1", "rec2"]
+
+        assert CountingEngine.calls == 1
+        # 快照键只保存元数据，文章按版本单独存放
+        cache = SQLiteCache(path)
+        assert "articles" not in cache.get("all_articles")
+        assert decode_articles(cache.get("all_articles:v1")) == ARTICLES
+
+    @patch("services.cache.SyncEngine", CountingEngine)
+    def test_other_workers_load_published_stats(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        with patch.object(cache_service.Config, "SNAPSHOT_ENABLED", False):
+            cache_service._dataset = None
+            with self.make_app(path).app_context():
+                published = cache_service.get_dataset().stats
+                cache_service._derive_thread.join()
+
+            # 另一个 worker：统计随版本发布，直接加载而不是重新扫描文章
+            cache_service._dataset = None
+            with self.make_app(path).app_context(), \
+                    patch("services.stats.DashboardStats.add", side_effect=AssertionError):
+                dataset = cache_service.get_dataset()
+                assert dataset.stats._tables == published._tables
+
+    @patch("services.cache.SyncEngine", CountingEngine)
+    def test_stats_and_indexes_built_in_background(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        cache_service._dataset = None
+        with self.make_app(path).app_context() as context, \
+                patch.object(cache_service.Config, "SNAPSHOT_ENABLED", False), \
+                patch("services.cache.threading.Thread") as thread:
+            dataset = cache_service.get_dataset()
+            # 首个请求不等待统计和搜索索引
+            assert dataset._stats is None and dataset._search_index is None
+            assert context.app.cache.get("dashboard_stats:v1") is None
+
+            thread.call_args.kwargs["target"](*thread.call_args.kwargs["args"])
+            assert context.app.cache.get("dashboard_stats:v1")
+            assert dataset._search_index is not None and dataset._facet_index is not None
+
+    @patch("services.cache.SyncEngine", CountingEngine)
+    def test_clear_articles_cache(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        cache_service._dataset = None
+        app = self.make_app(path)
+        with app.app_context(), patch.object(cache_service.Config, "SNAPSHOT_ENABLED", False):
+            cache_service.get_dataset()
+            cache_service.clear_articles_cache()
+            assert app.cache.get("all_articles") is None
+            assert app.cache.get("all_articles:v1") is None
+            assert app.cache.get("dashboard_stats:v1") is None
+
+    @patch("services.cache.SyncEngine", CountingEngine)
+    def test_event_changes_shared_as_deltas(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        with patch.object(cache_service.Config, "SNAPSHOT_ENABLED", False):
+            cache_service._dataset = None
+            with self.make_app(path).app_context():
+                other = cache_service.get_dataset()
+                other.search_index, other.stats
+            cache_service._dataset = None
+            with self.make_app(path).app_context() as context:
+                assert cache_service.apply_record_changes(["rec1"], [])
+                cache = context.app.cache
+                # 新版本只保存变更的记录，追加到版本链上
+                assert cache.get("all_articles")["chain"] == ["v1", "v1+"]
+                assert cache.get("all_articles:v1+").startswith(CHANGES_MAGIC)
+                published = cache_service.get_dataset()
+
+            # 已有 v1 的 worker 只应用变更：不重建搜索索引，统计增量更新
+            cache_service._dataset = other
+            with self.make_app(path).app_context(), \
+                    patch("services.dataset.SearchIndex", side_effect=AssertionError):
+                dataset = cache_service.get_dataset()
+                assert [article.title for article in dataset.articles] == ["v1 更新", "冒充客服"]
+                assert [article.id for article in dataset.search_index.search("更新")] == ["rec1"]
+                assert dataset.stats._tables == published.stats._tables
+
+            # 新 worker 从链首的完整版本开始
+            cache_service._dataset = None
+            with self.make_app(path).app_context():
+                dataset = cache_service.get_dataset()
+                assert dataset.version == "v1+"
+                assert [article.title for article in dataset.articles] == ["v1 更新", "冒充客服"]
+
+    @patch("services.cache.SyncEngine", CountingEngine)
+    def test_long_chain_is_compacted(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        cache_service._dataset = None
+        with self.make_app(path).app_context() as context, \
+                patch.object(cache_service.Config, "SNAPSHOT_ENABLED", False), \
+                patch.object(cache_service.Config, "CACHE_CHANGES_CHAIN_MAX", 2):
+            cache_service.get_dataset()
+            cache_service.apply_record_changes(["rec1"], [])
+            cache_service.apply_record_changes(["rec2"], [])
+            cache_service._derive_thread.join()
+
+            cache = context.app.cache
+            snapshot = cache.get("all_articles")
+            assert snapshot["version"] == "v1++"
+            assert "chain" not in snapshot
+            articles = decode_articles(cache.get("all_articles:v1++"))
+            assert [data["title"] for data in articles] == ["v1 更新", "v1+ 更新"]
+            assert cache.get("dashboard_stats:v1++")
+            assert cache.get("all_articles:v1") is None and cache.get("all_articles:v1+") is None
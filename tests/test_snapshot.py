@@ -0,0 +1,93 @@
+import sqlite3
+import pytest
+from models.article import Article
+from services.dataset import Dataset
+from services.snapshot import (
+    decode_changes, encode_changes, load_snapshot, patch_snapshot, save_snapshot, save_snapshot_stats, touch_snapshot,
+)
+
+
+class TestSnapshot:
+    @pytest.fixture
+    def snapshot(self):
+        article = Article(id="rec1", title="标题", date="2024-01-01", summary="刷单诈骗，民警劝阻", source="来源")
+        return {
+            "version": "v1",
+            "cursor": 1700000000000,
+            "synced_at": 1700000000.5,
+            "updated_at": 1700000000.5,
+            "articles": [article.to_cache_dict()],
+        }
+
+    def test_round_trip(self, tmp_path, snapshot):
+        path = str(tmp_path / "snapshot.db")
+        save_snapshot(snapshot, path)
+
+        loaded = load_snapshot(path)
+
+        assert loaded == snapshot
+        dataset = Dataset.from_snapshot(loaded)
+        assert dataset.get("rec1").scam_type == "刷单"
+
+    def test_stats_saved_with_snapshot(self, tmp_path, snapshot):
+        path = str(tmp_path / "snapshot.db")
+        stats = Dataset.from_snapshot(snapshot).stats
+        save_snapshot({**snapshot, "stats": stats.encode()}, path)
+
+        dataset = Dataset.from_snapshot(load_snapshot(path))
+
+        # 统计直接从快照加载，不需要重新计算
+        assert dataset._stats is not None
+        assert dataset.stats._tables == stats._tables
+
+    def test_touch_updates_cursor(self, tmp_path, snapshot):
+        path = str(tmp_path / "snapshot.db")
+        save_snapshot(snapshot, path)
+
+        touch_snapshot({**snapshot, "cursor": 1800000000000, "synced_at": 1800000000.0}, path)
+
+        loaded = load_snapshot(path)
+        assert loaded["cursor"] == 1800000000000
+        assert loaded["synced_at"] == 1800000000.0
+        assert loaded["updated_at"] == 1700000000.5
+        with pytest.raises(ValueError):
+            touch_snapshot({**snapshot, "version": "v2"}, path)
+
+    def test_missing_or_incompatible_file(self, tmp_path, snapshot):
+        path = str(tmp_path / "snapshot.db")
+        assert load_snapshot(path) is None
+
+        save_snapshot(snapshot, path)
+        with sqlite3.connect(path) as connection:
+            connection.execute("UPDATE meta SET value = '0' WHERE key = 'format_version'")
+        assert load_snapshot(path) is None
+
+    def test_patch_updates_changed_rows(self, tmp_path, snapshot):
+        path = str(tmp_path / "snapshot.db")
+        first = snapshot["articles"][0]
+        second = Article(id="rec2", title="第二篇", date="2024-01-02", summary="", source="来源").to_cache_dict()
+        stats = Dataset.from_snapshot(snapshot).stats.encode()
+        save_snapshot({**snapshot, "articles": [first, second], "stats": stats}, path)
+
+        edited = {**first, "title": "新标题"}
+        added = Article(id="rec3", title="第三篇", date="2024-01-03", summary="", source="来源").to_cache_dict()
+        patch_snapshot({**snapshot, "version": "v2", "updated_at": 1700000100.0}, "v1", [edited, added], ["rec2"], path)
+
+        loaded = load_snapshot(path)
+        assert loaded["version"] == "v2"
+        assert loaded["updated_at"] == 1700000100.0
+        assert loaded["articles"] == [edited, added]
+        # 旧版本的统计不再对应，补写后才会加载
+        assert "stats" not in loaded
+        assert not save_snapshot_stats("v1", stats, path)
+        assert save_snapshot_stats("v2", stats, path)
+        assert load_snapshot(path)["stats"] == stats
+
+        with pytest.raises(ValueError):
+            patch_snapshot({**snapshot, "version": "v3"}, "v1", [], ["rec1"], path)
+
+    def test_changes_encoding(self, snapshot):
+        data = encode_changes("v1", snapshot["articles"], ["rec2"])
+        assert decode_changes(data) == ("v1", snapshot["articles"], ["rec2"])
+        with pytest.raises(ValueError):
+            decode_changes(b"FZA1 not a change set")
@@ -0,0 +1,23 @@
+from unittest.mock import patch
+import models.comment as comment_module
+from services.startup import StartupTimer
+
+
+class TestStartup:
+    def test_timer_report(self):
+        timer = StartupTimer()
+        with timer.phase("config"):
+            pass
+        report = timer.finish()
+
+        assert list(report["phases"]) == ["config"]
+        assert report["total_ms"] >= report["phases"]["config"]
+        assert timer.report()["total_ms"] == report["total_ms"]
+
+    def test_ensure_schema_runs_once(self):
+        with patch.object(comment_module, "_schema_ready", False), \
+                patch.object(comment_module, "init_schema") as init_schema:
+            comment_module.ensure_schema()
+            comment_module.ensure_schema()
+
+        assert init_schema.call_count == 1
@@ -0,0 +1,82 @@
+import pytest
+from models.article import Article
+from services.dataset import Dataset
+from services.stats import DashboardStats
+
+
+def make_article(record_id, summary, date="2024-01-01", source="平安北京"):
+    return Article(id=record_id, title="标题", date=date, summary=summary, source=source)
+
+
+class TestDashboardStats:
+    @pytest.fixture
+    def articles(self):
+        return [
+            make_article("1", "杭州市发生刷单诈骗，民警预警劝阻", "2024-01-01", "平安杭州"),
+            make_article("2", "北京市刷单诈骗", "2024-01-02"),
+            make_article("3", "北京市冒充客服诈骗", "2024-01-09"),
+        ]
+
+    def test_totals(self, articles):
+        stats = DashboardStats(articles)
+
+        assert stats.total == 3
+        assert stats.query(group="scam_type") == {"刷单": 2, "客服诈骗": 1}
+        assert stats.query(group="source") == {"平安北京": 2, "平安杭州": 1}
+        assert stats.query() == {"count": 3}
+
+    def test_series(self, articles):
+        stats = DashboardStats(articles)
+
+        assert stats.query(interval="week") == {"2024-W01": 2, "2024-W02": 1}
+        assert stats.query(group="location", interval="day", filter_name="scam_type", filter_value="刷单") == {
+            articles[0].location: {"2024-01-01": 1},
+            articles[1].location: {"2024-01-02": 1},
+        }
+
+    def test_incremental_matches_rebuild(self, articles):
+        old = Dataset("v1", articles)
+        old.stats
+        changed = make_article("2", "北京市冒充客服诈骗", "2024-01-03")
+        added = make_article("4", "上海市刷单诈骗", "2024-01-10", "平安上海")
+        new = Dataset("v2", [articles[0], changed, added])
+
+        new.derive_stats(old, upserted=["2", "4"], deleted=["3"])
+
+        rebuilt = DashboardStats(new.articles)
+        assert new.stats is not rebuilt
+        assert new.stats._tables == rebuilt._tables
+        assert new.stats.total == 3
+        # 旧版本的统计不受影响
+        assert old.stats.query(group="scam_type") == {"刷单": 2, "客服诈骗": 1}
+
+    def test_incremental_copies_only_touched_tables(self, articles):
+        old = Dataset("v1", articles)
+        old.stats
+        changed = make_article("2", "北京市冒充客服诈骗", "2024-01-02")
+        new = Dataset("v2", [articles[0], changed, articles[2]])
+
+        new.derive_stats(old, upserted=["2"], deleted=[])
+
+        # 与变更的文章无关的计数表直接共用，不随数据集大小复制
+        shared = [key for key, table in new.stats._tables.items() if table is old.stats._tables.get(key)]
+        assert shared and len(shared) < len(old.stats._tables)
+        assert new.stats._tables == DashboardStats(new.articles)._tables
+        assert old.stats._tables == DashboardStats(articles)._tables
+
+    def test_encode_round_trip(self, articles):
+        stats = DashboardStats(articles)
+
+        decoded = DashboardStats.decode(stats.encode())
+
+        assert decoded.total == 3
+        assert decoded._tables == stats._tables
+        with pytest.raises(ValueError):
+            DashboardStats.decode(b"garbage")
+
+    def test_invalid_query(self, articles):
+        stats = DashboardStats(articles)
+        with pytest.raises(ValueError):
+            stats.query(group="title")
+        with pytest.raises(ValueError):
+            stats.query(group="scam_type", filter_name="scam_type", filter_value="刷单")
@@ -0,0 +1,129 @@
+import pytest
+from unittest.mock import Mock
+from flask import Flask
+from services.sync import SyncEngine
+
+
+def make_record(record_id, title, summary="摘要"):
+    return {
+        "record_id": record_id,
+        "fields": {"标题": title, "日期": "2024-01-01", "摘要": summary, "账号": "来源"},
+    }
+
+
+class TestSyncEngine:
+    @pytest.fixture(autouse=True)
+    def app_context(self):
+        with Flask(__name__).app_context():
+            yield
+
+    @pytest.fixture
+    def client(self):
+        client = Mock()
+        client.iter_records.side_effect = lambda **kwargs: iter(client.records)
+        client.records = [
+            make_record("rec1", "标题一"),
+            make_record("rec2", "标题二"),
+        ]
+        return client
+
+    @pytest.fixture
+    def engine(self, client):
+        return SyncEngine(client=client, modified_field="最后更新时间")
+
+    def test_full_sync_without_snapshot(self, engine, client):
+        result = engine.sync(None)
+
+        assert result.full
+        assert [data["id"] for data in result.articles] == ["rec1", "rec2"]
+        client.get_records_modified_since.assert_not_called()
+        assert client.iter_records.call_args.kwargs["field_names"] == ["标题", "日期", "摘要", "账号", "地址"]
+
+    def test_delta_sync_merges_upserts(self, engine, client):
+        snapshot = engine.sync(None).to_snapshot()
+        client.iter_records.reset_mock()
+        client.get_records_modified_since.return_value = [
+            make_record("rec2", "标题二（更新）"),
+            make_record("rec3", "标题三"),
+        ]
+        client.get_total.return_value = 3
+
+        result = engine.sync(snapshot)
+
+        assert not result.full
+        assert result.upserted == ["rec2", "rec3"]
+        assert [data["title"] for data in result.articles] == ["标题一", "标题二（更新）", "标题三"]
+        assert result.version != snapshot["version"]
+        client.iter_records.assert_not_called()
+
+    def test_unchanged_records_keep_version(self, engine, client):
+        snapshot = engine.sync(None).to_snapshot()
+        client.get_records_modified_since.return_value = [make_record("rec1", "标题一")]
+        client.get_total.return_value = 2
+
+        result = engine.sync(snapshot)
+
+        assert result.upserted == []
+        assert result.version == snapshot["version"]
+
+    def test_deletion_reconciled_by_record_ids(self, engine, client):
+        snapshot = engine.sync(None).to_snapshot()
+        client.iter_records.reset_mock()
+        client.get_records_modified_since.return_value = []
+        client.get_total.return_value = 1
+        client.iter_record_ids.return_value = iter(["rec1"])
+
+        result = engine.sync(snapshot)
+
+        assert not result.full
+        assert result.deleted == ["rec2"]
+        assert [data["id"] for data in result.articles] == ["rec1"]
+        assert result.version != snapshot["version"]
+        client.iter_records.assert_not_called()
+
+    def test_unknown_remote_records_fall_back_to_full_sync(self, engine, client):
+        snapshot = engine.sync(None).to_snapshot()
+        client.get_records_modified_since.return_value = []
+        client.get_total.return_value = 3
+        client.iter_record_ids.return_value = iter(["rec1", "rec2", "rec3"])
+        client.records = client.records + [make_record("rec3", "标题三")]
+
+        result = engine.sync(snapshot)
+
+        assert result.full
+        assert result.upserted == ["rec3"]
+        assert result.deleted == []
+
+    def test_without_modified_field_scans_record_times(self, client, monkeypatch):
+        monkeypatch.setattr("services.sync.Config.FEISHU_PAGE_SIZE", 1)
+        engine = SyncEngine(client=client, modified_field="")
+        snapshot = engine.sync(None).to_snapshot()
+        client.iter_records.reset_mock()
+        # rec1 在上次同步之前修改，rec2 已删除，rec3 是新记录
+        old = snapshot["cursor"] - 3600 * 1000
+        client.iter_record_versions.return_value = iter([("rec1", old), ("rec3", snapshot["cursor"]), ("rec4", old)])
+        remote = {"rec3": make_record("rec3", "标题三"), "rec4": make_record("rec4", "标题四")}
+        client.get_record.side_effect = lambda record_id: {"record": remote[record_id]}
+        snapshot["articles"].append(engine._to_dict(remote["rec4"]))
+
+        result = engine.sync(snapshot)
+
+        assert not result.full
+        assert result.upserted == ["rec3"]
+        assert result.deleted == ["rec2"]
+        assert [data["id"] for data in result.articles] == ["rec1", "rec4", "rec3"]
+        assert [call.args[0] for call in client.get_record.call_args_list] == ["rec3"]
+        client.iter_records.assert_not_called()
+        client.get_records_modified_since.assert_not_called()
+
+    def test_record_scan_falls_back_to_full_sync_for_many_changes(self, client):
+        engine = SyncEngine(client=client, modified_field="")
+        snapshot = engine.sync(None).to_snapshot()
+        client.iter_record_versions.return_value = iter([("rec1", None), ("rec2", None), ("rec3", None)])
+        client.records = client.records + [make_record("rec3", "标题三")]
+
+        result = engine.sync(snapshot)
+
+        assert result.full
+        assert result.upserted == ["rec3"]
+        client.get_record.assert_not_called()
@@ -0,0 +1,88 @@
+import threading
+import time
+import pytest
+from flask import Flask
+from flask_caching import Cache
+from services.token_manager import TokenManager
+
+
+class CountingFetch:
+    def __init__(self, expire=7200, delay=0):
+        self.calls = 0
+        self.expire = expire
+        self.delay = delay
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return f"token-{self.calls}", self.expire
+
+
+class TestTokenManager:
+    @pytest.fixture
+    def app(self):
+        app = Flask(__name__)
+        app.config["CACHE_TYPE"] = "SimpleCache"
+        app.cache = Cache(app)
+        with app.app_context():
+            yield app
+
+    def test_reuses_token(self, app):
+        manager = TokenManager("app", refresh_margin=60)
+        fetch = CountingFetch()
+
+        assert manager.get_token(fetch)[0] == "token-1"
+        assert manager.get_token(fetch)[0] == "token-1"
+        assert fetch.calls == 1
+
+    def test_concurrent_refresh_is_deduplicated(self, app):
+        manager = TokenManager("app", refresh_margin=60)
+        fetch = CountingFetch(delay=0.1)
+        tokens = []
+
+        def worker():
+            with app.app_context():
+                tokens.append(manager.get_token(fetch)[0])
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert fetch.calls == 1
+        assert set(tokens) == {"token-1"}
+
+    def test_refreshes_before_expiry(self, app):
+        manager = TokenManager("app", refresh_margin=60)
+        fetch = CountingFetch(expire=30)  # 有效期短于提前量，每次都视为需要刷新
+
+        manager.get_token(fetch)
+        app.cache.clear()
+        token, _ = manager.get_token(fetch)
+
+        assert fetch.calls == 2
+        assert token == "token-2"
+
+    def test_new_instance_uses_shared_token(self, app):
+        fetch = CountingFetch()
+        TokenManager("app", refresh_margin=60).get_token(fetch)
+
+        # 模拟新的实例：进程内没有 token，但缓存后端中有
+        token, _ = TokenManager("app", refresh_margin=60).get_token(fetch)
+
+        assert token == "token-1"
+        assert fetch.calls == 1
+
+    def test_invalidate_only_drops_the_rejected_token(self, app):
+        manager = TokenManager("app", refresh_margin=60)
+        fetch = CountingFetch()
+        manager.get_token(fetch)
+
+        manager.invalidate("token-1")
+        assert manager.get_token(fetch)[0] == "token-2"
+
+        # 另一个线程拿着旧 token 被拒绝，不应作废已经换上的新 token
+        manager.invalidate("token-1")
+        assert manager.get_token(fetch)[0] == "token-2"
+        assert fetch.calls == 2